@@ -0,0 +1,175 @@
+import sys
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Description:
+# Compares cubes.py's original per-cube, per-vertex rotation (a new list
+# of points every frame) against the batched MeshRenderer in
+# lib/mesh3d.py, for a few numbers of cubes. Only the transform is timed,
+# not the line drawing.
+#
+# Then flies cubes towards the viewer the way cubes.py does and times
+# drawing their edges straight with display.line() against the renderer's
+# culled and clipped draw(), with its counts of drawn, clipped and culled
+# lines.
+#
+# Runs on the board (copy lib/mesh3d.py to /lib) or on desktop:
+#   PYTHONPATH=Python/lib:Python/emulator python3 Python/benchmarks/bench_mesh.py
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# Define a global flag
+IS_MICROPYTHON = sys.implementation.name == 'micropython'
+
+import math
+import random
+
+from mesh3d import CUBE, MeshRenderer, intArray
+from picographics import PicoGraphics, DISPLAY_INTERSTATE75_128X128
+
+if IS_MICROPYTHON:
+    import utime as time
+
+    def ticks_us() -> int:
+        return time.ticks_us()
+
+    def ticks_diff(a: int, b: int) -> int:
+        return time.ticks_diff(a, b)
+else:
+    import time
+
+    def ticks_us() -> int:
+        return int(time.perf_counter() * 1000000)
+
+    def ticks_diff(a: int, b: int) -> int:
+        return a - b
+
+FRAMES = 50
+CUBE_COUNTS = (4, 16, 48)
+WIDTH = 128
+HEIGHT = 128
+
+# ------------------------------------------------------------------------
+# The rotation from the original cubes.py
+class ScalarCube:
+    vertices = [[-1, -1, 1], [1, -1, 1], [1, -1, -1], [-1, -1, -1],
+                [-1, 1, 1], [1, 1, 1], [1, 1, -1], [-1, 1, -1]]
+
+    def __init__(self, fov, distance, x, y, speed):
+        self.fov = fov
+        self.distance = distance
+        self.pos_x = x
+        self.pos_y = y
+        self.speed = speed
+        self.cube_points = []
+
+    def rotate(self, ticks):
+        self.cube_points = []
+        tick = ticks / (self.speed * 1000)
+        cos = math.cos(tick)
+        sin = math.sin(tick)
+        for v in self.vertices:
+            start_x, start_y, start_z = v
+            y = start_y * cos - start_z * sin
+            z = start_y * sin + start_z * cos
+            x = start_x * cos - z * sin
+            z = start_x * sin + z * cos
+            n_y = x * sin + y * cos
+            n_x = x * cos - y * sin
+            factor = self.fov / (self.distance + z)
+            self.cube_points.append((int(n_x * factor + self.pos_x), int(-n_y * factor + self.pos_y)))
+
+def randomCube():
+    return (random.randint(8, 300), 8, random.randint(10, WIDTH), random.randint(10, HEIGHT), random.randrange(4, 9) / 10)
+
+def bench(label: str, frame) -> float:
+    start = ticks_us()
+    for f in range(FRAMES):
+        frame(f * 17)
+    perFrame = ticks_diff(ticks_us(), start) / FRAMES
+    print(f"{label:>16}: {perFrame / 1000:8.3f} ms/frame")
+    return perFrame
+
+def benchTransform(count: int):
+    params = [randomCube() for i in range(count)]
+    scalar = [ScalarCube(*p) for p in params]
+    renderer = MeshRenderer(count)
+    speeds = []
+    for (slot, (fov, distance, x, y, speed)) in enumerate(params):
+        renderer.place(slot, CUBE, x, y, fov, distance)
+        speeds.append(speed)
+
+    def scalarFrame(ticks: int):
+        for cube in scalar:
+            cube.rotate(ticks)
+
+    def batchedFrame(ticks: int):
+        for slot in range(count):
+            renderer.angle[slot] = ticks / (speeds[slot] * 1000)
+        renderer.transform()
+
+    print(f"{count} cubes")
+    before = bench("scalar", scalarFrame)
+    after = bench("batched", batchedFrame)
+    print(f"{'speedup':>16}: {before / after:.2f}x, {renderer.matrixCount} matrices")
+
+def benchDraw(count: int):
+    display = PicoGraphics(display=DISPLAY_INTERSTATE75_128X128)
+    black = display.create_pen(0, 0, 0)
+    white = display.create_pen(255, 255, 255)
+    renderer = MeshRenderer(count)
+    speeds = []
+    for slot in range(count):
+        (fov, distance, x, y, speed) = randomCube()
+        renderer.place(slot, CUBE, x, y, fov, distance)
+        speeds.append(speed)
+
+    # The same frames for both runs: cubes zooming in from far away
+    frames = []
+    for f in range(FRAMES):
+        for slot in range(count):
+            renderer.fov[slot] = 8 + (slot * 37 + f * 11) % 600
+            renderer.angle[slot] = f * 17 / (speeds[slot] * 1000)
+        renderer.transform()
+        projected = intArray(len(renderer.projected))
+        projected[:] = renderer.projected
+        frames.append(projected)
+
+    def unclipped(f: int):
+        display.set_pen(black)
+        display.clear()
+        display.set_pen(white)
+        projected = frames[f // 17]
+        edges = CUBE.edges
+        for slot in range(count):
+            base = slot * renderer.slotVertices * 2
+            for e in range(0, CUBE.edgeCount * 2, 2):
+                a = base + edges[e] * 2
+                b = base + edges[e + 1] * 2
+                display.line(int(projected[a]), int(projected[a + 1]), int(projected[b]), int(projected[b + 1]))
+
+    totals = [0, 0, 0, 0]
+
+    def clipped(f: int):
+        display.set_pen(black)
+        display.clear()
+        display.set_pen(white)
+        renderer.projected[:] = frames[f // 17]
+        renderer.draw(display)
+        totals[0] += renderer.linesDrawn
+        totals[1] += renderer.linesClipped
+        totals[2] += renderer.linesCulled
+        totals[3] += renderer.meshesCulled
+
+    print(f"{count} cubes drawn")
+    before = bench("unclipped", unclipped)
+    after = bench("culled", clipped)
+    print(f"{'speedup':>16}: {before / after:.2f}x")
+    print(f"{'lines':>16}: {totals[0]} drawn ({totals[1]} clipped), {totals[2]} culled, {totals[3]} meshes culled")
+
+def main():
+    print(f"{FRAMES} frames")
+    for count in CUBE_COUNTS:
+        benchTransform(count)
+    for count in CUBE_COUNTS:
+        benchDraw(count)
+
+main()
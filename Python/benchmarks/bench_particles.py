@@ -0,0 +1,199 @@
+import sys
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Description:
+# Compares the per-object particle classes used by the fireworks demos
+# against the structure-of-arrays ParticlePool in lib/particle_pool.py,
+# and its Q16.16 integer twin in lib/particle_pool_fixed.py, then the cost
+# of triggering every pool with random directions against copying
+# precomputed bursts (lib/burst_templates.py).
+#
+# On desktop the fixed point pool is plain Python and slower than NumPy;
+# it is meant for viper on the board.
+#
+# Runs on the board (copy lib/particle_pool.py to /lib) or on desktop:
+#   PYTHONPATH=Python/lib python3 Python/benchmarks/bench_particles.py
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# Define a global flag
+IS_MICROPYTHON = sys.implementation.name == 'micropython'
+
+import gc
+import math
+import random
+
+from particle_pool import ParticlePool
+from burst_templates import BurstTemplates
+from particle_pool_fixed import FixedParticlePool
+
+if IS_MICROPYTHON:
+    import utime as time
+
+    def ticks_us() -> int:
+        return time.ticks_us()
+
+    def ticks_diff(a: int, b: int) -> int:
+        return time.ticks_diff(a, b)
+
+    def heapUsed() -> int:
+        return gc.mem_alloc()
+else:
+    import time
+
+    def ticks_us() -> int:
+        return int(time.perf_counter() * 1000000)
+
+    def ticks_diff(a: int, b: int) -> int:
+        return a - b
+
+    # CPython doesn't expose a comparable heap counter.
+    def heapUsed() -> int:
+        return None
+
+NUMBER_OF_SYSTEMS = 10
+PARTICLES_PER_SYSTEM = 200
+FRAMES = 60
+DT = 16.7
+MAX_PARTICLE_LIFETIME = 2.5
+MAX_PARTICLE_SPEED = 2.0
+
+# ------------------------------------------------------------------------
+# Baseline: the object graph from fireworks_simple.py, trimmed down to what
+# ExplosiveParticleSystem.update() touches every frame.
+class Vector:
+    def __init__(self, x: float, y: float):
+        self.x = x
+        self.y = y
+
+    def setByAngle(self, angleRadians: float):
+        self.x = math.cos(angleRadians)
+        self.y = math.sin(angleRadians)
+
+def Add(v1: Vector, v2: Vector, v3: Vector):
+    v3.x = v1.x + v2.x
+    v3.y = v1.y + v2.y
+
+class Point:
+    def __init__(self, x: float, y: float):
+        self.x = x
+        self.y = y
+
+class Velocity:
+    def __init__(self, magnitude: float, direction: Vector):
+        self.magnitude = magnitude
+        self.direction = direction
+
+    def applyToPoint(self, point: Point):
+        v1.x = self.direction.x * self.magnitude
+        v1.y = self.direction.y * self.magnitude
+        v2.x = point.x
+        v2.y = point.y
+        Add(v1, v2, v3)
+        point.x = v3.x
+        point.y = v3.y
+
+v1 = Vector(0.0, 0.0)
+v2 = Vector(0.0, 0.0)
+v3 = Vector(0.0, 0.0)
+
+class Particle:
+    def __init__(self, lifespan: float, position: Point, velocity: Velocity):
+        self.elapsed = 0.0
+        self.lifespan = lifespan
+        self.active = True
+        self.died = False
+        self.position = position
+        self.velocity = velocity
+
+    def evaluate(self, dt: float) -> bool:
+        self.elapsed += dt
+        self.active = self.elapsed < self.lifespan
+        if (self.active):
+            self.velocity.applyToPoint(self.position)
+        return self.active
+
+class ObjectSystem:
+    def __init__(self, numberOfParticles: int):
+        self.particles = []
+        self.particleCount = 0
+        for i in range(numberOfParticles):
+            direction = Vector(1.0, 0.0)
+            direction.setByAngle(random.uniform(0.0, 1.0) * math.pi * 2.0)
+            self.particles.append(
+                Particle(
+                    random.uniform(0.1, MAX_PARTICLE_LIFETIME) * 1000.0,
+                    Point(64.0, 64.0),
+                    Velocity(0.05 + random.uniform(0.0, MAX_PARTICLE_SPEED), direction)))
+            self.particleCount += 1
+
+    def update(self, dt: float) -> bool:
+        for p in self.particles:
+            active = p.evaluate(dt)
+            if (not active and not p.died):
+                self.particleCount -= 1
+                p.died = True
+        return self.particleCount > 0
+
+# ------------------------------------------------------------------------
+def bench(label: str, systems):
+    gc.collect()
+    heapBefore = heapUsed()
+    start = ticks_us()
+    for f in range(FRAMES):
+        for s in systems:
+            s.update(DT)
+    elapsed = ticks_diff(ticks_us(), start)
+    heapAfter = heapUsed()
+    perFrame = elapsed / FRAMES
+    if heapBefore is None:
+        print(f"{label:>8}: {perFrame / 1000:8.3f} ms/frame")
+    else:
+        print(f"{label:>8}: {perFrame / 1000:8.3f} ms/frame, heap +{heapAfter - heapBefore} bytes")
+    return perFrame
+
+# Time triggering every pool at once, like every system exploding in the
+# same frame.
+def benchTrigger(label: str, pools, trigger):
+    gc.collect()
+    start = ticks_us()
+    for f in range(FRAMES):
+        for pool in pools:
+            trigger(pool)
+    perFrame = ticks_diff(ticks_us(), start) / FRAMES
+    print(f"{label:>8}: {perFrame / 1000:8.3f} ms/trigger of all pools")
+    return perFrame
+
+def main():
+    print(f"{NUMBER_OF_SYSTEMS} systems x {PARTICLES_PER_SYSTEM} particles, {FRAMES} frames")
+
+    random.seed(1)
+    objects = [ObjectSystem(PARTICLES_PER_SYSTEM) for s in range(NUMBER_OF_SYSTEMS)]
+
+    random.seed(1)
+    pools = []
+    for s in range(NUMBER_OF_SYSTEMS):
+        pool = ParticlePool(PARTICLES_PER_SYSTEM)
+        pool.trigger360(64.0, 64.0, MAX_PARTICLE_SPEED, MAX_PARTICLE_LIFETIME)
+        pools.append(pool)
+
+    random.seed(1)
+    fixedPools = []
+    for s in range(NUMBER_OF_SYSTEMS):
+        pool = FixedParticlePool(PARTICLES_PER_SYSTEM)
+        pool.trigger360(64.0, 64.0, MAX_PARTICLE_SPEED, MAX_PARTICLE_LIFETIME)
+        fixedPools.append(pool)
+
+    baseline = bench("objects", objects)
+    packed = bench("pool", pools)
+    print(f" speedup: {baseline / packed:.2f}x")
+    fixed = bench("fixed", fixedPools)
+    print(f" speedup: {baseline / fixed:.2f}x")
+
+    bursts = BurstTemplates(8, PARTICLES_PER_SYSTEM, MAX_PARTICLE_SPEED, MAX_PARTICLE_LIFETIME)
+    randomTrigger = benchTrigger("random", pools,
+        lambda pool: pool.trigger360(64.0, 64.0, MAX_PARTICLE_SPEED, MAX_PARTICLE_LIFETIME))
+    templateTrigger = benchTrigger("template", pools,
+        lambda pool: bursts.trigger(pool, 64.0, 64.0))
+    print(f" speedup: {randomTrigger / templateTrigger:.2f}x")
+
+main()
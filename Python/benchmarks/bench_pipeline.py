@@ -0,0 +1,119 @@
+import sys
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Description:
+# Runs the same simulate/render loop serially and through the two stage
+# Pipeline in lib/pipeline.py and compares the frame times.
+#
+#   "wait"  simulate and render are waits of SIM_MS and RENDER_MS. This is
+#           the ideal case: the pipelined frame should take about
+#           max(SIM_MS, RENDER_MS) instead of SIM_MS + RENDER_MS.
+#   "fire"  the glorious_fire simulation (FireEngine) against a palette
+#           blit of it. On desktop CPython only runs one thread of Python
+#           code at a time, so expect much less overlap here than on the
+#           board's two cores.
+#
+# On the board copy lib to /lib. On desktop:
+#   PYTHONPATH=Python/lib:Python/emulator python3 Python/benchmarks/bench_pipeline.py
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# Define a global flag
+IS_MICROPYTHON = sys.implementation.name == 'micropython'
+
+if IS_MICROPYTHON:
+    import utime as time
+
+    def ticks_us() -> int:
+        return time.ticks_us()
+
+    def ticks_diff(a: int, b: int) -> int:
+        return time.ticks_diff(a, b)
+
+    def wait_ms(ms: int):
+        time.sleep_ms(ms)
+else:
+    import time
+
+    def ticks_us() -> int:
+        return int(time.perf_counter() * 1000000)
+
+    def ticks_diff(a: int, b: int) -> int:
+        return a - b
+
+    def wait_ms(ms: int):
+        time.sleep(ms / 1000)
+
+from pipeline import Pipeline
+
+FRAMES = 60
+SIM_MS = 8
+RENDER_MS = 10
+
+# Fire size in cells and how much each cell is scaled up
+FIRE_WIDTH = 32
+FIRE_HEIGHT = 32
+FIRE_SCALE = 4
+
+# ------------------------------------------------------------------------
+def bench(label: str, step, publish, buffers, render, threaded: bool) -> float:
+    pipeline = Pipeline(step, publish, buffers, threaded)
+    pipeline.start()
+    # Fill the pipeline before timing
+    render(pipeline.frame())
+    start = ticks_us()
+    for f in range(FRAMES):
+        render(pipeline.frame())
+    elapsed = ticks_diff(ticks_us(), start)
+    pipeline.stop()
+    perFrame = elapsed / FRAMES
+    print(f"{label:>16}: {perFrame / 1000:8.3f} ms/frame")
+    return perFrame
+
+def compare(name: str, step, publish, buffers, render):
+    serial = bench(name + " serial", step, publish, buffers, render, False)
+    piped = bench(name + " pipelined", step, publish, buffers, render, True)
+    print(f"{'speedup':>16}: {serial / piped:.2f}x")
+
+def benchWait():
+    def step():
+        wait_ms(SIM_MS)
+
+    def publish(buffer):
+        pass
+
+    def render(buffer):
+        wait_ms(RENDER_MS)
+
+    print(f"wait: simulate {SIM_MS}ms, render {RENDER_MS}ms")
+    compare("wait", step, publish, (None, None), render)
+
+def benchFire():
+    try:
+        from ulab import numpy
+    except ImportError:
+        import numpy
+    from picographics import PicoGraphics, PEN_P8, DISPLAY_INTERSTATE75_128X128
+    from fire_engine import FireEngine
+    from palette_blit import PaletteBlitter
+
+    fire = FireEngine(FIRE_WIDTH, FIRE_HEIGHT, 4)
+    graphics = PicoGraphics(display=DISPLAY_INTERSTATE75_128X128, pen_type=PEN_P8)
+    palette = [(0, 0, 0), (5, 5, 5), (20, 20, 20), (180, 30, 0), (220, 160, 0), (255, 255, 180)]
+    blitter = PaletteBlitter(graphics, palette, FIRE_WIDTH, FIRE_HEIGHT, FIRE_SCALE)
+
+    def publish(cells):
+        cells[:] = numpy.ndarray(numpy.clip(fire.visible(), 0, 1) * (len(palette) - 1), dtype=numpy.uint8).tobytes()
+
+    def render(cells):
+        blitter.blit(cells)
+
+    size = FIRE_WIDTH * FIRE_HEIGHT
+    print(f"fire: {FIRE_WIDTH}x{FIRE_HEIGHT} cells, scale {FIRE_SCALE}")
+    compare("fire", fire.update, publish, (bytearray(size), bytearray(size)), render)
+
+def main():
+    print(f"{FRAMES} frames")
+    benchWait()
+    benchFire()
+
+main()
@@ -0,0 +1,99 @@
+import sys
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Description:
+# Draws the same captions every frame straight through PicoGraphics /
+# PicoVector and through the TextCache in lib/text_cache.py, and compares
+# the time per frame. The cached runs include the first, rasterizing,
+# frame.
+#
+# On the board the vector run needs the font from vector_text.py in
+# /basic. On desktop:
+#   PYTHONPATH=Python/lib:Python/emulator python3 Python/benchmarks/bench_text_cache.py
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# Define a global flag
+IS_MICROPYTHON = sys.implementation.name == 'micropython'
+
+if IS_MICROPYTHON:
+    import utime as time
+
+    def ticks_us() -> int:
+        return time.ticks_us()
+
+    def ticks_diff(a: int, b: int) -> int:
+        return time.ticks_diff(a, b)
+else:
+    import time
+
+    def ticks_us() -> int:
+        return int(time.perf_counter() * 1000000)
+
+    def ticks_diff(a: int, b: int) -> int:
+        return a - b
+
+from picographics import PicoGraphics, DISPLAY_INTERSTATE75_128X128
+from picovector import ANTIALIAS_BEST, PicoVector
+from text_cache import TextCache, CachedVectorText
+
+FRAMES = 60
+FONT = "/basic/cherry-hq.af"
+
+display = PicoGraphics(display=DISPLAY_INTERSTATE75_128X128)
+BLACK = display.create_pen(0, 0, 0)
+PINK = display.create_pen(250, 125, 180)
+WHITE = display.create_pen(255, 255, 255)
+
+# ------------------------------------------------------------------------
+def bench(label: str, drawText) -> float:
+    start = ticks_us()
+    for f in range(FRAMES):
+        display.set_pen(BLACK)
+        display.clear()
+        drawText()
+    perFrame = ticks_diff(ticks_us(), start) / FRAMES
+    print(f"{label:>16}: {perFrame / 1000:8.3f} ms/frame")
+    return perFrame
+
+def compare(name: str, direct, cached):
+    plain = bench(name, direct)
+    fast = bench(name + " cached", cached)
+    print(f"{'speedup':>16}: {plain / fast:.2f}x")
+
+def benchBitmap():
+    cache = TextCache(display)
+
+    def direct():
+        display.set_pen(WHITE)
+        display.text("Flying Cubes!", 33, 55, 128, 1)
+        display.text("This is\nfine!", 10, 10)
+
+    def cached():
+        cache.text("Flying Cubes!", 33, 55, WHITE, 128, 1)
+        cache.text("This is\nfine!", 10, 10, WHITE)
+
+    compare("bitmap", direct, cached)
+
+def benchVector():
+    vector = PicoVector(display)
+    vector.set_antialiasing(ANTIALIAS_BEST)
+    vector.set_font(FONT, 55)
+    cachedVector = CachedVectorText(PicoVector(display), TextCache(display))
+    cachedVector.set_antialiasing(ANTIALIAS_BEST)
+    cachedVector.set_font(FONT, 55)
+
+    def direct():
+        display.set_pen(PINK)
+        vector.text("Hello!", 10, 75)
+
+    def cached():
+        cachedVector.text("Hello!", 10, 75, PINK)
+
+    compare("vector", direct, cached)
+
+def main():
+    print(f"{FRAMES} frames")
+    benchBitmap()
+    benchVector()
+
+main()
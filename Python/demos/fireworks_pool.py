@@ -0,0 +1,201 @@
+import sys
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Description:
+# Multiple systems exploding in random locations, like
+# fireworks_simple_multi_sys.py, but each system keeps its particles in a
+# structure-of-arrays ParticlePool (see lib/particle_pool.py) instead of
+# Particle/Point/Velocity objects.
+#
+# With USE_BURST_TEMPLATES the explosions are copied from a few bursts
+# generated at startup (see lib/burst_templates.py), so a frame where many
+# systems trigger costs about the same as any other.
+#
+# USE_FIXED_POINT switches to the integer pool in lib/particle_pool_fixed.py,
+# which keeps floats out of the per-frame update on the board.
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# Define a global flag
+IS_MICROPYTHON = sys.implementation.name == 'micropython'
+
+if IS_MICROPYTHON:
+    import utime as time # Use utime for time functions
+else:
+    import time # Use standard time module
+
+import random
+
+from particle_pool import ParticlePool
+from burst_templates import BurstTemplates
+from particle_pool_fixed import FixedParticlePool
+from frame_profiler import FrameProfiler
+from timing import createClock, FixedTimestep, FRAME_MS_60HZ
+from dirty_rects import DirtyRectDisplay
+
+try:
+    # On desktop this resolves to the emulator in Python/emulator when
+    # it is on the path.
+    from interstate75 import Interstate75, DISPLAY_INTERSTATE75_128X128
+except ImportError:
+    Interstate75 = None
+
+if Interstate75:
+    i75 = Interstate75(display=DISPLAY_INTERSTATE75_128X128)
+    display = i75.display
+
+    WIDTH, HEIGHT = display.get_bounds()
+
+    BLACK = display.create_pen(0, 0, 0)
+else:
+    i75 = None
+    display = None
+    WIDTH, HEIGHT = 128, 128
+
+    BLACK = None
+
+# Prints update/draw/push timings every 120 frames
+profiler = FrameProfiler()
+if i75:
+    i75.update = profiler.wrap("push", i75.update)
+
+if IS_MICROPYTHON:
+    # Universal Time Abstraction
+    def universal_sleep_ms(milliseconds: int):
+        time.sleep_ms(milliseconds)
+else:
+    # Universal Time Abstraction
+    def universal_sleep_ms(milliseconds: int):
+        time.sleep(int(milliseconds) / 1000)
+
+# Real ticks_ms() on the board, a deterministic 60Hz clock on desktop
+clock = createClock()
+
+# The simulation always advances in fixed steps, however long a frame takes
+SIM_STEP_MS = FRAME_MS_60HZ
+MAX_SUBSTEPS = 4
+stepper = FixedTimestep(SIM_STEP_MS, MAX_SUBSTEPS)
+MAX_PARTICLE_LIFETIME = 1.5
+MAX_PARTICLE_SPEED = 1.5
+MAX_EXPLOSIVE_PARTICLES = 20
+MAX_NUMBER_OF_SYSTEMS = 10
+
+# Q16.16 integer particles instead of floats
+USE_FIXED_POINT = False
+
+# Trigger from precomputed bursts instead of random directions per particle.
+# The templates are float and only work with the float pool.
+USE_BURST_TEMPLATES = not USE_FIXED_POINT
+NUMBER_OF_BURST_TEMPLATES = 8
+
+# Erase only the pixels drawn last frame. Past the default cap of shapes a
+# frame falls back to one full clear, which is cheaper on busy frames.
+if display:
+    screen = DirtyRectDisplay(display, BLACK)
+
+if display:
+    COLORS = [
+        display.create_pen(255, 0, 0), # red
+        display.create_pen(0, 255, 0), # green
+        display.create_pen(0, 0, 255), # blue
+        display.create_pen(255, 255, 0), # yellow
+        display.create_pen(255, 0, 255), # magenta
+        display.create_pen(0, 255, 255), # cyan
+        display.create_pen(255, 255, 255), # white
+        display.create_pen(255, 128, 0), # orange
+    ]
+else:
+    COLORS = None
+
+if USE_BURST_TEMPLATES:
+    bursts = BurstTemplates(
+        NUMBER_OF_BURST_TEMPLATES, MAX_EXPLOSIVE_PARTICLES,
+        MAX_PARTICLE_SPEED, MAX_PARTICLE_LIFETIME, COLORS)
+
+# ------------------------------------------------------------------------
+class ExplosiveParticleSystem:
+    def __init__(self, numberOfParticles: int):
+        if USE_FIXED_POINT:
+            self.pool = FixedParticlePool(numberOfParticles)
+        else:
+            self.pool = ParticlePool(numberOfParticles)
+        self.epiCenterX = 0.0
+        self.epiCenterY = 0.0
+        self.active = False
+
+    def trigger(self):
+        if USE_BURST_TEMPLATES:
+            bursts.trigger(self.pool, self.epiCenterX, self.epiCenterY)
+        else:
+            self.pool.trigger360(
+                self.epiCenterX, self.epiCenterY,
+                MAX_PARTICLE_SPEED, MAX_PARTICLE_LIFETIME, COLORS)
+        self.active = True
+
+    def update(self, dt: float) -> bool:
+        self.active = self.pool.update(dt) > 0
+        return self.active
+
+    def draw(self):
+        self.pool.draw(screen)
+
+# ------------------------------------------------------------------------
+class Demo:
+    prevTicks = clock.ticksMs()
+
+    def __init__(self):
+        self.particleSystems = []
+        self.generate()
+
+    def generate(self):
+        for i in range(0, MAX_NUMBER_OF_SYSTEMS):
+            ps = ExplosiveParticleSystem(MAX_EXPLOSIVE_PARTICLES)
+            self.relocate(ps)
+            self.particleSystems.append(ps)
+
+    def relocate(self, ps: ExplosiveParticleSystem):
+        ps.epiCenterX = random.randint(10, WIDTH-1-10)
+        ps.epiCenterY = random.randint(10, HEIGHT-1-10)
+        ps.trigger()
+
+    def run(self):
+        while True:
+            profiler.beginFrame()
+
+            # Calc dt
+            currentTicks = clock.ticksMs()
+
+            dt = clock.diff(currentTicks, self.prevTicks)
+
+            for step in range(stepper.advance(dt)):
+                self.update(SIM_STEP_MS)
+            profiler.mark("update")
+            self.draw()
+            profiler.mark("draw")
+
+            self.prevTicks = currentTicks
+            profiler.endFrame()
+
+            if not IS_MICROPYTHON:
+                universal_sleep_ms(17)
+
+    def update(self, dt: float) -> bool:
+        for ps in self.particleSystems:
+            if (not ps.update(dt)):
+                self.relocate(ps)
+
+        return True # Keep running
+
+    # Draw the particles
+    def draw(self):
+        if display:
+            screen.beginFrame()
+
+            for ps in self.particleSystems:
+                ps.draw()
+
+            i75.update()
+
+demo = Demo()
+demo.run()
+
+print("==== Done ======")
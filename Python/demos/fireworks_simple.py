@@ -12,9 +12,18 @@ else:
 import random
 import math
 
-if IS_MICROPYTHON:
+from frame_profiler import FrameProfiler
+from timing import createClock, FixedTimestep, FRAME_MS_60HZ
+from trig_table import trig
+
+try:
+    # On desktop this resolves to the emulator in Python/emulator when
+    # it is on the path.
     from interstate75 import Interstate75, DISPLAY_INTERSTATE75_128X128
+except ImportError:
+    Interstate75 = None
 
+if Interstate75:
     i75 = Interstate75(display=DISPLAY_INTERSTATE75_128X128)
     display = i75.display
 
@@ -23,39 +32,42 @@ if IS_MICROPYTHON:
     # Couple of colors for use later
     ORANGE = display.create_pen(255, 128, 0)
     BLACK = display.create_pen(0, 0, 0)
+else:
+    i75 = None
+    display = None
+    WIDTH, HEIGHT = 128, 128
+
+    ORANGE = None
+    BLACK = None
+
+# Prints update/draw/push timings every 120 frames
+profiler = FrameProfiler()
+if i75:
+    i75.update = profiler.wrap("push", i75.update)
 
+if IS_MICROPYTHON:
     # Universal Time Abstraction
-    def get_monotonic_ms() -> any:
-        # MicroPython uses ticks_ms() for its monotonic clock
-        return time.ticks_ms()
-    
     def universal_sleep_s(seconds):
         time.sleep_ms(int(seconds * 1000))
 
     def universal_sleep_ms(milliseconds: int):
         time.sleep_ms(milliseconds)
 else:
-    display = None
-    WIDTH, HEIGHT = 128, 128
-
-    ORANGE = None
-    BLACK = None
-    simFrameCount: int = 0
-
     # Universal Time Abstraction
-    def get_monotonic_ms() -> int:
-        global simFrameCount
-        # Desktop Python uses time.monotonic() and converts to milliseconds
-        sfc = simFrameCount 
-        simFrameCount += 16.7
-        return sfc #time.monotonic() * 1000
-    
     def universal_sleep_s(seconds):
         time.sleep(seconds)
 
     def universal_sleep_ms(milliseconds: int):
         time.sleep(int(milliseconds) / 1000)
 
+# Real ticks_ms() on the board, a deterministic 60Hz clock on desktop
+clock = createClock()
+
+# The simulation always advances in fixed steps, however long a frame takes
+SIM_STEP_MS = FRAME_MS_60HZ
+MAX_SUBSTEPS = 4
+stepper = FixedTimestep(SIM_STEP_MS, MAX_SUBSTEPS)
+
 # Define the duration you want the loop to run (in seconds)
 RUN_DURATION_MS = 10000  # Run for N seconds
 
@@ -76,6 +88,11 @@ class Vector:
         self.x = math.cos(angleRadians)
         self.y = math.sin(angleRadians)
 
+    # index is a step of the shared trig table
+    def setByIndex(self, index: int):
+        self.x = trig.cosIndex(index)
+        self.y = trig.sinIndex(index)
+
 def Add(v1: Vector, v2: Vector, v3: Vector):
     v3.x = v1.x + v2.x
     v3.y = v1.y + v2.y
@@ -104,6 +121,9 @@ class Velocity:
     def setDirectionByAngle(self, angleRadians: float):
         self.direction.setByAngle(angleRadians)
 
+    def setDirectionByIndex(self, index: int):
+        self.direction.setByIndex(index)
+
     def constrainMagnitude(self, constrain: bool):
         self.limitMag = constrain
 
@@ -168,7 +188,9 @@ class Emitter360(Emitter):
         self.maxSpeed = maxSpeed
 
     def activate(self, particle: Particle, epiCenter: Point):
-        self.direction =  random.uniform(0.0, 1.0) * math.pi * 2.0
+        # A random step of the trig table instead of a random angle, so a
+        # burst doesn't call math.cos()/math.sin() for every particle.
+        index = trig.randomIndex()
         self.speed  =  0.05 + random.uniform(0.0, self.maxSpeed)
 
         particle.lifespan = (random.uniform(0.1, self.maxLifespan)) * 1000.0
@@ -176,7 +198,7 @@ class Emitter360(Emitter):
         particle.position.x = epiCenter.x
         particle.position.y = epiCenter.y
         particle.active = True
-        particle.velocity.setDirectionByAngle(self.direction)
+        particle.velocity.setDirectionByIndex(index)
         particle.velocity.magnitude = self.speed
 
 
@@ -205,7 +227,8 @@ class ParticleSystem:
         self.autoTrigger = autoTrigger
         self.emitter = emitter
         self.particles: Particle = []
-        # This counts how many particles are active
+        # This counts how many particles are active. The active particles
+        # are kept at the front: particles[0:particleCount].
         self.particleCount = 0
         self.epiCenter: Point = Point(0.0, 0.0)
         self.active = False
@@ -232,11 +255,12 @@ class ParticleSystem:
             p.reset()
 
     def draw(self):
-        if IS_MICROPYTHON:
-            for p in self.particles:
-                if (p.active):
-                    display.set_pen(ORANGE)
-                    display.pixel(int(p.position.x), int(p.position.y))
+        if display:
+            particles = self.particles
+            for i in range(self.particleCount):
+                p = particles[i]
+                display.set_pen(ORANGE)
+                display.pixel(int(p.position.x), int(p.position.y))
         else:
             print("DRAW ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~")
             for p in self.particles:
@@ -270,24 +294,35 @@ class ExplosiveParticleSystem(ParticleSystem):
             self.initialTrigger = False
             self.trigger()
         else:
-            # The system is active. Evaluate current particles
-            for p in self.particles:
-                active = p.evaluate(dt)
-                if (not active and not p.died): # Did it just die AND not died already
-                    self.particleCount -= 1
-                    # We have recognized its death. Now it can officially die!
-                    p.died = True
-                self.active = self.isActive()
-                if (not self.active):
-                    # The system has become in-active.
-                    if (self.autoTrigger):
-                        self.trigger()                
+            # The system is active. Evaluate the active particles only.
+            particles = self.particles
+            i = 0
+            while i < self.particleCount:
+                p = particles[i]
+                if p.evaluate(dt):
+                    i += 1
+                    continue
+                # It died: swap the last active particle into its slot and
+                # shrink the active range. Slot i is evaluated again.
+                last = self.particleCount - 1
+                particles[i] = particles[last]
+                particles[last] = p
+                self.particleCount = last
+                # We have recognized its death. Now it can officially die!
+                p.died = True
+
+            self.active = self.isActive()
+            if (not self.active):
+                # The system has become in-active.
+                if (self.autoTrigger):
+                    self.trigger()
 
         return self.active
 
     def trigger(self):
         self.reset()
         self.active = True
+        self.particleCount = 0
 
         for p in self.particles:
             self.emitter.activate(p, self.epiCenter)
@@ -348,7 +383,7 @@ class OneshotParticleSystem(ParticleSystem):
 # ------------------------------------------------------------------------
 
 class Demo:
-    prevTicks = get_monotonic_ms()
+    prevTicks = clock.ticksMs()
     particleSystem: ParticleSystem = None
 
     def __init__(self):
@@ -361,20 +396,27 @@ class Demo:
 
     def reset(self):
         # Get the starting time
-        self.prevTicks = 0
+        self.prevTicks = clock.ticksMs()
+        stepper.reset()
 
     def run(self):
         active = True
         while active:
+            profiler.beginFrame()
+
             # Calc dt
-            currentTicks = get_monotonic_ms()
+            currentTicks = clock.ticksMs()
 
-            dt = currentTicks - self.prevTicks
+            dt = clock.diff(currentTicks, self.prevTicks)
 
-            active = self.update(dt)
+            for step in range(stepper.advance(dt)):
+                active = self.update(SIM_STEP_MS)
+            profiler.mark("update")
             self.draw()
+            profiler.mark("draw")
 
             self.prevTicks = currentTicks
+            profiler.endFrame()
 
             if not IS_MICROPYTHON:
                 universal_sleep_ms(17)
@@ -385,13 +427,13 @@ class Demo:
 
     # Draw the particles
     def draw(self):
-        if IS_MICROPYTHON:
+        if display:
             display.set_pen(BLACK)
             display.clear()
 
         self.particleSystem.draw()
 
-        if IS_MICROPYTHON:
+        if display:
             i75.update()
 
 demo = Demo()
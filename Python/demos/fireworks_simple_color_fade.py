@@ -18,9 +18,18 @@ else:
 import random
 import math
 
-if IS_MICROPYTHON:
+from frame_profiler import FrameProfiler
+from timing import createClock, FixedTimestep, FRAME_MS_60HZ
+from trig_table import trig
+
+try:
+    # On desktop this resolves to the emulator in Python/emulator when
+    # it is on the path.
     from interstate75 import Interstate75, DISPLAY_INTERSTATE75_128X128
+except ImportError:
+    Interstate75 = None
 
+if Interstate75:
     i75 = Interstate75(display=DISPLAY_INTERSTATE75_128X128)
     display = i75.display
 
@@ -29,39 +38,42 @@ if IS_MICROPYTHON:
     # Couple of colors for use later
     ORANGE = display.create_pen(255, 128, 0)
     BLACK = display.create_pen(0, 0, 0)
+else:
+    i75 = None
+    display = None
+    WIDTH, HEIGHT = 128, 128
 
+    ORANGE = None
+    BLACK = None
+
+# Prints update/draw/push timings every 120 frames
+profiler = FrameProfiler()
+if i75:
+    i75.update = profiler.wrap("push", i75.update)
+
+if IS_MICROPYTHON:
     # Universal Time Abstraction
-    def get_monotonic_ms() -> any:
-        # MicroPython uses ticks_ms() for its monotonic clock
-        return time.ticks_ms()
-    
     def universal_sleep_s(seconds):
         time.sleep_ms(int(seconds * 1000))
 
     def universal_sleep_ms(milliseconds: int):
         time.sleep_ms(milliseconds)
 else:
-    display = None
-    WIDTH, HEIGHT = 128, 128
-
-    ORANGE = None
-    BLACK = None
-    simFrameCount: int = 0
-
     # Universal Time Abstraction
-    def get_monotonic_ms() -> int:
-        global simFrameCount
-        # Desktop Python uses time.monotonic() and converts to milliseconds
-        sfc = simFrameCount 
-        simFrameCount += 16.7
-        return sfc #time.monotonic() * 1000
-    
     def universal_sleep_s(seconds):
         time.sleep(seconds)
 
     def universal_sleep_ms(milliseconds: int):
         time.sleep(int(milliseconds) / 1000)
 
+# Real ticks_ms() on the board, a deterministic 60Hz clock on desktop
+clock = createClock()
+
+# The simulation always advances in fixed steps, however long a frame takes
+SIM_STEP_MS = FRAME_MS_60HZ
+MAX_SUBSTEPS = 4
+stepper = FixedTimestep(SIM_STEP_MS, MAX_SUBSTEPS)
+
 # Define the duration you want the loop to run (in seconds)
 RUN_DURATION_MS = 10000  # Run for N seconds
 
@@ -69,7 +81,7 @@ MAX_PARTICLE_LIFETIME = 2.5
 MAX_PARTICLE_SPEED = 5.0
 MAX_EXPLOSIVE_PARTICLES = 200
 
-if IS_MICROPYTHON:
+if display:
     # Store colors as RGB tuples, not pre-created pens
     COLORS = [
         (255, 0, 0), # red
@@ -95,6 +107,10 @@ if IS_MICROPYTHON:
         (0, 128, 128), # aqua
     ]
 
+# Number of quantized steps a color takes to fade to black. Each step is a
+# pre-created pen so the hot loop never calls create_pen.
+FADE_STEPS = 32
+
 def lerp(min: float, max: float, t: float) -> float:
     # Another way to write below equation is: min*(1.0-t) + max*t
     # refactoring as:
@@ -113,6 +129,11 @@ class Vector:
         self.x = math.cos(angleRadians)
         self.y = math.sin(angleRadians)
 
+    # index is a step of the shared trig table
+    def setByIndex(self, index: int):
+        self.x = trig.cosIndex(index)
+        self.y = trig.sinIndex(index)
+
 v1 = Vector(0.0, 0.0)
 v2 = Vector(0.0, 0.0)
 v3 = Vector(0.0, 0.0)
@@ -145,6 +166,9 @@ class Velocity:
     def setDirectionByAngle(self, angleRadians: float):
         self.direction.setByAngle(angleRadians)
 
+    def setDirectionByIndex(self, index: int):
+        self.direction.setByIndex(index)
+
     def constrainMagnitude(self, constrain: bool):
         self.limitMag = constrain
 
@@ -163,6 +187,7 @@ class Particle:
     died: bool = False
     original_color: tuple = (0,0,0) # Store the initial color as (R,G,B)
     current_pen: any = None # This will hold the pen handle for the current frame
+    fade_ramp: list = None # Pens from original_color to black, see FadeRampCache
 
     def __init__(self, elapsed: float, lifespan: float, active: bool, position: Point, velocity: Point):
         self.elapsed = elapsed
@@ -175,10 +200,12 @@ class Particle:
     def update(self, dt: float):
         self.elapsed += dt
         self.active = self.elapsed < self.lifespan
-        # Use lifespan to lerp from start color to Black
+        # Use lifespan to pick a pen on the way from start color to Black
         t = self.calculate_lifespan_factor(self.elapsed, self.lifespan)
-        (r, g, b) = self.lerp_to_black(self.original_color, t)
-        self.current_pen = display.create_pen(r, g, b)
+        step = int(t * FADE_STEPS)
+        if step >= FADE_STEPS:
+            step = FADE_STEPS - 1
+        self.current_pen = self.fade_ramp[step]
 
     @staticmethod
     def calculate_lifespan_factor(current_age_ms: int, total_lifespan_ms: int) -> float:
@@ -247,6 +274,34 @@ class Particle:
 
         return self.active
 
+# ------------------------------------------------------------------------
+class FadeRampCache:
+    """
+    Caches FADE_STEPS pens per color, fading from the color to black.
+
+    The ramps are built once, on the first generate(), and shared by every
+    system afterwards. A particle keeps a reference to its color's ramp and
+    picks a pen by index instead of creating one each frame.
+    """
+    ramps: dict = {}
+
+    @classmethod
+    def get(cls, color_rgb: tuple) -> list:
+        ramp = cls.ramps.get(color_rgb)
+        if ramp is None:
+            ramp = []
+            for step in range(FADE_STEPS):
+                t = step / (FADE_STEPS - 1)
+                (r, g, b) = Particle.lerp_to_black(color_rgb, t)
+                ramp.append(display.create_pen(r, g, b))
+            cls.ramps[color_rgb] = ramp
+        return ramp
+
+    @classmethod
+    def build(cls, colors: list):
+        for color_rgb in colors:
+            cls.get(color_rgb)
+
 # ------------------------------------------------------------------------
 # Activator
 class Emitter:
@@ -262,7 +317,9 @@ class Emitter360(Emitter):
         self.maxSpeed = maxSpeed
 
     def activate(self, particle: Particle, epiCenter: Point):
-        self.direction =  random.uniform(0.0, 1.0) * math.pi * 2.0
+        # A random step of the trig table instead of a random angle, so a
+        # burst doesn't call math.cos()/math.sin() for every particle.
+        index = trig.randomIndex()
         self.speed  =  0.05 + random.uniform(0.0, self.maxSpeed)
 
         particle.lifespan = (random.uniform(0.1, self.maxLifespan)) * 1000.0
@@ -270,7 +327,7 @@ class Emitter360(Emitter):
         particle.position.x = epiCenter.x
         particle.position.y = epiCenter.y
         particle.active = True
-        particle.velocity.setDirectionByAngle(self.direction)
+        particle.velocity.setDirectionByIndex(index)
         particle.velocity.magnitude = self.speed
 
 
@@ -299,7 +356,8 @@ class ParticleSystem:
         self.autoTrigger = autoTrigger
         self.emitter = emitter
         self.particles: Particle = []
-        # This counts how many particles are active
+        # This counts how many particles are active. The active particles
+        # are kept at the front: particles[0:particleCount].
         self.particleCount = 0
         self.epiCenter: Point = Point(0.0, 0.0)
         self.active = False
@@ -326,11 +384,12 @@ class ParticleSystem:
             p.reset()
 
     def draw(self):
-        if IS_MICROPYTHON:
-            for p in self.particles:
-                if (p.active):
-                    display.set_pen(p.current_pen)
-                    display.pixel(int(p.position.x), int(p.position.y))
+        if display:
+            particles = self.particles
+            for i in range(self.particleCount):
+                p = particles[i]
+                display.set_pen(p.current_pen)
+                display.pixel(int(p.position.x), int(p.position.y))
         else:
             print("DRAW ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~")
             for p in self.particles:
@@ -349,6 +408,7 @@ class ExplosiveParticleSystem(ParticleSystem):
 
     def generate(self):
         super().generate()
+        FadeRampCache.build(COLORS)
         for i in range(0, self.numberOfParticles):
             particle = Particle(
                     0.0, MAX_PARTICLE_LIFETIME, False, 
@@ -357,6 +417,7 @@ class ExplosiveParticleSystem(ParticleSystem):
                 )
             # Assign the original color tuple to the particle
             particle.original_color = COLORS[random.randint(0, len(COLORS)-1)]
+            particle.fade_ramp = FadeRampCache.get(particle.original_color)
             self.addParticle(particle)
 
     def update(self, dt: float) -> bool:
@@ -365,24 +426,35 @@ class ExplosiveParticleSystem(ParticleSystem):
             self.initialTrigger = False
             self.trigger()
         else:
-            # The system is active. Evaluate current particles
-            for p in self.particles:
-                active = p.evaluate(dt)
-                if (not active and not p.died): # Did it die AND not died already
-                    self.particleCount -= 1
-                    # We have recognized its death. Now it can officially die!
-                    p.died = True
-                self.active = self.isActive()
-                if (not self.active):
-                    # The system has become in-active.
-                    if (self.autoTrigger):
-                        self.trigger()                
+            # The system is active. Evaluate the active particles only.
+            particles = self.particles
+            i = 0
+            while i < self.particleCount:
+                p = particles[i]
+                if p.evaluate(dt):
+                    i += 1
+                    continue
+                # It died: swap the last active particle into its slot and
+                # shrink the active range. Slot i is evaluated again.
+                last = self.particleCount - 1
+                particles[i] = particles[last]
+                particles[last] = p
+                self.particleCount = last
+                # We have recognized its death. Now it can officially die!
+                p.died = True
+
+            self.active = self.isActive()
+            if (not self.active):
+                # The system has become in-active.
+                if (self.autoTrigger):
+                    self.trigger()
 
         return self.active
 
     def trigger(self):
         self.reset()
         self.active = True
+        self.particleCount = 0
 
         for p in self.particles:
             self.emitter.activate(p, self.epiCenter)
@@ -443,7 +515,7 @@ class OneshotParticleSystem(ParticleSystem):
 # ------------------------------------------------------------------------
 
 class Demo:
-    prevTicks = get_monotonic_ms()
+    prevTicks = clock.ticksMs()
     particleSystem: ParticleSystem = None
 
     def __init__(self):
@@ -456,20 +528,27 @@ class Demo:
 
     def reset(self):
         # Get the starting time
-        self.prevTicks = 0
+        self.prevTicks = clock.ticksMs()
+        stepper.reset()
 
     def run(self):
         active = True
         while active:
+            profiler.beginFrame()
+
             # Calc dt
-            currentTicks = get_monotonic_ms()
+            currentTicks = clock.ticksMs()
 
-            dt = currentTicks - self.prevTicks
+            dt = clock.diff(currentTicks, self.prevTicks)
 
-            active = self.update(dt)
+            for step in range(stepper.advance(dt)):
+                active = self.update(SIM_STEP_MS)
+            profiler.mark("update")
             self.draw()
+            profiler.mark("draw")
 
             self.prevTicks = currentTicks
+            profiler.endFrame()
 
             if not IS_MICROPYTHON:
                 universal_sleep_ms(17)
@@ -480,13 +559,13 @@ class Demo:
 
     # Draw the particles
     def draw(self):
-        if IS_MICROPYTHON:
+        if display:
             display.set_pen(BLACK)
             display.clear()
 
         self.particleSystem.draw()
 
-        if IS_MICROPYTHON:
+        if display:
             i75.update()
 
 demo = Demo()
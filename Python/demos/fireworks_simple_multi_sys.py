@@ -4,6 +4,11 @@ import sys
 # Description:
 # Multiple systems exploding in random locations.
 # When a system complete its explosion it is reset to a new location.
+#
+# Particles come from a pool created at startup. A system borrows
+# particles when it triggers and hands each one back as soon as it dies.
+# The systems are created once and reset in place when they finish, so
+# nothing is allocated while the show runs.
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
 
@@ -19,9 +24,19 @@ else:
 import random
 import math
 
-if IS_MICROPYTHON:
+from frame_profiler import FrameProfiler
+from timing import createClock, FixedTimestep, FRAME_MS_60HZ
+from trig_table import trig
+from object_pool import ObjectPool
+
+try:
+    # On desktop this resolves to the emulator in Python/emulator when
+    # it is on the path.
     from interstate75 import Interstate75, DISPLAY_INTERSTATE75_128X128
+except ImportError:
+    Interstate75 = None
 
+if Interstate75:
     i75 = Interstate75(display=DISPLAY_INTERSTATE75_128X128)
     display = i75.display
 
@@ -30,39 +45,42 @@ if IS_MICROPYTHON:
     # Couple of colors for use later
     ORANGE = display.create_pen(255, 128, 0)
     BLACK = display.create_pen(0, 0, 0)
+else:
+    i75 = None
+    display = None
+    WIDTH, HEIGHT = 128, 128
+
+    ORANGE = None
+    BLACK = None
+
+# Prints update/draw/push timings every 120 frames
+profiler = FrameProfiler()
+if i75:
+    i75.update = profiler.wrap("push", i75.update)
 
+if IS_MICROPYTHON:
     # Universal Time Abstraction
-    def get_monotonic_ms() -> any:
-        # MicroPython uses ticks_ms() for its monotonic clock
-        return time.ticks_ms()
-    
     def universal_sleep_s(seconds):
         time.sleep_ms(int(seconds * 1000))
 
     def universal_sleep_ms(milliseconds: int):
         time.sleep_ms(milliseconds)
 else:
-    display = None
-    WIDTH, HEIGHT = 128, 128
-
-    ORANGE = None
-    BLACK = None
-    simFrameCount: int = 0
-
     # Universal Time Abstraction
-    def get_monotonic_ms() -> int:
-        global simFrameCount
-        # Desktop Python uses time.monotonic() and converts to milliseconds
-        sfc = simFrameCount 
-        simFrameCount += 16.7
-        return sfc #time.monotonic() * 1000
-    
     def universal_sleep_s(seconds):
         time.sleep(seconds)
 
     def universal_sleep_ms(milliseconds: int):
         time.sleep(int(milliseconds) / 1000)
 
+# Real ticks_ms() on the board, a deterministic 60Hz clock on desktop
+clock = createClock()
+
+# The simulation always advances in fixed steps, however long a frame takes
+SIM_STEP_MS = FRAME_MS_60HZ
+MAX_SUBSTEPS = 4
+stepper = FixedTimestep(SIM_STEP_MS, MAX_SUBSTEPS)
+
 # Define the duration you want the loop to run (in seconds)
 RUN_DURATION_MS = 10000  # Run for N seconds
 
@@ -71,7 +89,7 @@ MAX_PARTICLE_SPEED = 1.5
 MAX_EXPLOSIVE_PARTICLES = 20
 MAX_NUMBER_OF_SYSTEMS = 10
 
-if IS_MICROPYTHON:
+if display:
     COLORS = [
         display.create_pen(255, 0, 0), # red
         display.create_pen(0, 255, 0), # green
@@ -113,6 +131,11 @@ class Vector:
         self.x = math.cos(angleRadians)
         self.y = math.sin(angleRadians)
 
+    # index is a step of the shared trig table
+    def setByIndex(self, index: int):
+        self.x = trig.cosIndex(index)
+        self.y = trig.sinIndex(index)
+
 v1 = Vector(0.0, 0.0)
 v2 = Vector(0.0, 0.0)
 v3 = Vector(0.0, 0.0)
@@ -145,6 +168,9 @@ class Velocity:
     def setDirectionByAngle(self, angleRadians: float):
         self.direction.setByAngle(angleRadians)
 
+    def setDirectionByIndex(self, index: int):
+        self.direction.setByIndex(index)
+
     def constrainMagnitude(self, constrain: bool):
         self.limitMag = constrain
 
@@ -206,7 +232,9 @@ class Emitter360(Emitter):
         self.maxSpeed = maxSpeed
 
     def activate(self, particle: Particle, epiCenter: Point):
-        self.direction =  random.uniform(0.0, 1.0) * math.pi * 2.0
+        # A random step of the trig table instead of a random angle, so a
+        # burst doesn't call math.cos()/math.sin() for every particle.
+        index = trig.randomIndex()
         self.speed  =  0.05 + random.uniform(0.0, self.maxSpeed)
 
         particle.lifespan = (random.uniform(0.1, self.maxLifespan)) * 1000.0
@@ -214,23 +242,49 @@ class Emitter360(Emitter):
         particle.position.x = epiCenter.x
         particle.position.y = epiCenter.y
         particle.active = True
-        particle.velocity.setDirectionByAngle(self.direction)
+        particle.velocity.setDirectionByIndex(index)
         particle.velocity.magnitude = self.speed
 
 # ------------------------------------------------------------------------
 class ParticleSystem:
-    def __init__(self, numberOfParticles: int, autoTrigger: bool, emitter: Emitter):
+    def __init__(self, numberOfParticles: int, autoTrigger: bool, emitter: Emitter, pool: ObjectPool):
         self.numberOfParticles = numberOfParticles
         self.autoTrigger = autoTrigger
         self.emitter = emitter
-        self.particles: Particle = []
+        self.pool = pool
+        # The active particles, borrowed from the pool, are kept at the
+        # front: particles[0:particleCount].
+        self.particles: Particle = [None] * numberOfParticles
         self.particleCount = 0
         self.epiCenter: Point = Point(0.0, 0.0)
         self.active = False
         self.initialTrigger = True
 
-    def addParticle(self, particle: Particle):
-        self.particles.append(particle)
+    # Borrow a particle from the pool. Returns None if the pool is empty.
+    def addParticle(self) -> Particle:
+        if self.particleCount == self.numberOfParticles:
+            return None
+        p = self.pool.acquire()
+        if p is not None:
+            self.particles[self.particleCount] = p
+            self.particleCount += 1
+        return p
+
+    # Hand particle i back to the pool. The last active particle takes its
+    # slot so the active ones stay at the front.
+    def removeParticle(self, i: int):
+        last = self.particleCount - 1
+        self.pool.release(self.particles[i])
+        self.particles[i] = self.particles[last]
+        self.particles[last] = None
+        self.particleCount = last
+
+    # Hand every borrowed particle back to the pool.
+    def releaseParticles(self):
+        for i in range(self.particleCount):
+            self.pool.release(self.particles[i])
+            self.particles[i] = None
+        self.particleCount = 0
 
     def update(self, dt: float) -> bool:
         return False
@@ -246,15 +300,16 @@ class ParticleSystem:
         self.reset()
 
     def reset(self):
-        for p in self.particles:
-            p.reset()
+        for i in range(self.particleCount):
+            self.particles[i].reset()
 
     def draw(self):
-        if IS_MICROPYTHON:
-            for p in self.particles:
-                if (p.active):
-                    display.set_pen(p.color)
-                    display.pixel(int(p.position.x), int(p.position.y))
+        if display:
+            particles = self.particles
+            for i in range(self.particleCount):
+                p = particles[i]
+                display.set_pen(p.color)
+                display.pixel(int(p.position.x), int(p.position.y))
         # else:
         #     print("DRAW ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~")
         #     for p in self.particles:
@@ -268,22 +323,8 @@ class ParticleSystem:
 # When we trigger we set the count back.
 class ExplosiveParticleSystem(ParticleSystem):
 
-    def __init__(self, numberOfParticles: int, autoTrigger: bool, emitter: Emitter):
-        super().__init__(numberOfParticles, autoTrigger, emitter)
-
-    def generate(self):
-        super().generate()
-        for i in range(0, self.numberOfParticles):
-            p = Particle(
-                    0.0, MAX_PARTICLE_LIFETIME, False, 
-                    Point(0.0, 0.0), 
-                    Velocity(MAX_PARTICLE_SPEED, 0.0, 1.0, Vector(1.0, 0.0), False)
-                )
-            if IS_MICROPYTHON:
-                p.color = COLORS[random.randint(0, len(COLORS)-1)]
-            else:
-                p.color = 0
-            self.addParticle(p)
+    def __init__(self, numberOfParticles: int, autoTrigger: bool, emitter: Emitter, pool: ObjectPool):
+        super().__init__(numberOfParticles, autoTrigger, emitter, pool)
 
     def update(self, dt: float) -> bool:
         if (self.initialTrigger):
@@ -291,36 +332,67 @@ class ExplosiveParticleSystem(ParticleSystem):
             self.initialTrigger = False
             self.trigger()
         else:
-            # The system is active. Evaluate current particles
-            for p in self.particles:
-                active = p.evaluate(dt)
-                if (not active and not p.died): # Did it die AND not died already
-                    self.particleCount -= 1
-                    # We have recognized its death. Now it can officially die!
-                    p.died = True
-                self.active = self.isActive()
-                if (not self.active):
-                    # The system has become in-active.
-                    if (self.autoTrigger):
-                        self.trigger()                
+            # The system is active. Evaluate the active particles only.
+            particles = self.particles
+            i = 0
+            while i < self.particleCount:
+                p = particles[i]
+                if p.evaluate(dt):
+                    i += 1
+                    continue
+                # It died: give it back to the pool right away so other
+                # systems can use it. Slot i now holds another particle.
+                p.died = True
+                self.removeParticle(i)
+
+            self.active = self.isActive()
+            if (not self.active):
+                # The system has become in-active.
+                if (self.autoTrigger):
+                    self.trigger()
 
         return self.active
 
     def trigger(self):
-        self.reset()
-        self.active = True
+        self.releaseParticles()
 
-        for p in self.particles:
+        for i in range(self.numberOfParticles):
+            p = self.addParticle()
+            if p is None:
+                break
             self.emitter.activate(p, self.epiCenter)
-            # Inc count because a new particle has become active
-            self.particleCount += 1
+
+        # With the pool empty there is nothing to explode; try again later.
+        self.active = self.isActive()
+
+# ------------------------------------------------------------------------
+# Factories
+
+def newParticle() -> Particle:
+    p = Particle(
+            0.0, MAX_PARTICLE_LIFETIME, False,
+            Point(0.0, 0.0),
+            Velocity(MAX_PARTICLE_SPEED, 0.0, 1.0, Vector(1.0, 0.0), False)
+        )
+    if display:
+        p.color = COLORS[random.randint(0, len(COLORS)-1)]
+    else:
+        p.color = 0
+    return p
+
+particlePool = ObjectPool(newParticle, MAX_NUMBER_OF_SYSTEMS * MAX_EXPLOSIVE_PARTICLES)
+
+def newSystem() -> ExplosiveParticleSystem:
+    ps = ExplosiveParticleSystem(MAX_EXPLOSIVE_PARTICLES, False, Emitter360(), particlePool)
+    ps.generate()
+    return ps
 
 # ------------------------------------------------------------------------
 
 class Demo:
     # These are coming amoung instances of Demo. This is because there is only
     # one instance of Demo.
-    prevTicks = get_monotonic_ms()
+    prevTicks = clock.ticksMs()
     particleSystems: ParticleSystem = []
 
     def __init__(self):
@@ -328,57 +400,62 @@ class Demo:
 
     def generate(self):
         for i in range(0, MAX_NUMBER_OF_SYSTEMS):
-            ps = ExplosiveParticleSystem(MAX_EXPLOSIVE_PARTICLES, False, Emitter360())
-            ps.epiCenter = Point(
-                random.randint(10, WIDTH-1-10), 
-                random.randint(10, HEIGHT-1-10))
-            ps.generate()
+            ps = newSystem()
+            ps.epiCenter.x = random.randint(10, WIDTH-1-10)
+            ps.epiCenter.y = random.randint(10, HEIGHT-1-10)
             self.particleSystems.append(ps)
 
     def reset(self):
         # Get the starting time
-        self.prevTicks = 0
+        self.prevTicks = clock.ticksMs()
+        stepper.reset()
 
     def run(self):
         active = True
         while active:
+            profiler.beginFrame()
+
             # Calc dt
-            currentTicks = get_monotonic_ms()
+            currentTicks = clock.ticksMs()
 
-            dt = currentTicks - self.prevTicks
+            dt = clock.diff(currentTicks, self.prevTicks)
 
-            active = self.update(dt)
+            for step in range(stepper.advance(dt)):
+                active = self.update(SIM_STEP_MS)
+            profiler.mark("update")
             self.draw()
+            profiler.mark("draw")
 
             self.prevTicks = currentTicks
+            profiler.endFrame()
 
             if not IS_MICROPYTHON:
                 universal_sleep_ms(17)
             
     def update(self, dt: float) -> bool:
-        for ps in self.particleSystems:
+        for i in range(len(self.particleSystems)):
+            ps = self.particleSystems[i]
             active = ps.update(dt)
             if (not active):
                 # print("resetting")
+                # Relaunch the finished system, and its epiCenter, in place.
                 ps.resetToInitial()
-                ps.epiCenter = Point(
-                    random.randint(10, WIDTH-1), 
-                    random.randint(10, HEIGHT-1)
-                )
+                ps.epiCenter.x = random.randint(10, WIDTH-1)
+                ps.epiCenter.y = random.randint(10, HEIGHT-1)
 
         return True # Keep running
 
 
     # Draw the particles
     def draw(self):
-        if IS_MICROPYTHON:
+        if display:
             display.set_pen(BLACK)
             display.clear()
 
         for ps in self.particleSystems:
             ps.draw()
 
-        if IS_MICROPYTHON:
+        if display:
             i75.update()
 
 demo = Demo()
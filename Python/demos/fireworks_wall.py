@@ -0,0 +1,199 @@
+import sys
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Description:
+# fireworks_pool.py drawn on a wall of panels through a TiledCanvas (see
+# lib/tiled_canvas.py). Explosions start anywhere on the wall and are
+# split across the seams between panels.
+#
+# With one board the wall is WALL_COLUMNS x WALL_ROWS regions of its own
+# panel, which shows the same picture as fireworks_pool.py. On a real wall
+# every board runs this with LOCAL_TILE set to its own panel.
+#
+# The boards don't talk to each other, so they all run the same
+# deterministic show:
+#   - the simulation advances exactly one SIM_STEP_MS step per frame,
+#     counted by a step counter, never by the board's own clock
+#   - every launch reseeds random from WALL_SEED, the system and how many
+#     times it has launched, so a burst is the same on every board whatever
+#     else that board skipped
+#   - a system's launch step, end step and the box its particles stay in
+#     follow from its burst alone
+# A board only steps and draws the systems whose box touches its panel;
+# the others are just relaunched when their end step comes. Bursts line up
+# at the seams as long as the boards run the same firmware, start together
+# and keep the frame rate (a board that drops below it falls behind the
+# others; restart the wall to line them up again).
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# Define a global flag
+IS_MICROPYTHON = sys.implementation.name == 'micropython'
+
+if IS_MICROPYTHON:
+    import utime as time # Use utime for time functions
+else:
+    import time # Use standard time module
+
+import random
+
+from particle_pool import ParticlePool
+from frame_profiler import FrameProfiler
+from timing import createClock, FRAME_MS_60HZ
+from dirty_rects import DirtyRectDisplay
+from tiled_canvas import TiledCanvas
+
+from interstate75 import Interstate75, DISPLAY_INTERSTATE75_128X128
+
+i75 = Interstate75(display=DISPLAY_INTERSTATE75_128X128)
+display = i75.display
+
+PANEL_WIDTH, PANEL_HEIGHT = display.get_bounds()
+
+# The wall, in tiles
+WALL_COLUMNS = 2
+WALL_ROWS = 2
+
+# None: every tile is a region of this board's panel.
+# A tile number (row * WALL_COLUMNS + column): this board is that panel of
+# a wall of full size panels, the other tiles are skipped.
+LOCAL_TILE = None
+
+if LOCAL_TILE is None:
+    TILE_WIDTH = PANEL_WIDTH // WALL_COLUMNS
+    TILE_HEIGHT = PANEL_HEIGHT // WALL_ROWS
+    tiles = [
+        (display, (t % WALL_COLUMNS) * TILE_WIDTH, (t // WALL_COLUMNS) * TILE_HEIGHT)
+        for t in range(WALL_COLUMNS * WALL_ROWS)]
+else:
+    TILE_WIDTH = PANEL_WIDTH
+    TILE_HEIGHT = PANEL_HEIGHT
+    tiles = [display if t == LOCAL_TILE else None for t in range(WALL_COLUMNS * WALL_ROWS)]
+
+canvas = TiledCanvas(WALL_COLUMNS, WALL_ROWS, TILE_WIDTH, TILE_HEIGHT, tiles)
+WIDTH, HEIGHT = canvas.get_bounds()
+
+BLACK = display.create_pen(0, 0, 0)
+
+# Prints update/draw/push timings every 120 frames
+profiler = FrameProfiler()
+i75.update = profiler.wrap("push", i75.update)
+
+if IS_MICROPYTHON:
+    # Universal Time Abstraction
+    def universal_sleep_ms(milliseconds: int):
+        time.sleep_ms(milliseconds)
+else:
+    # Universal Time Abstraction
+    def universal_sleep_ms(milliseconds: int):
+        time.sleep(int(milliseconds) / 1000)
+
+# Only paces the frames; the simulation runs off the step counter
+clock = createClock(simulated=False)
+
+# One simulation step per frame, the same on every board
+SIM_STEP_MS = FRAME_MS_60HZ
+# Same on every board of a wall
+WALL_SEED = 75
+MAX_PARTICLE_LIFETIME = 1.5
+MAX_PARTICLE_SPEED = 1.5
+MAX_EXPLOSIVE_PARTICLES = 20
+MAX_NUMBER_OF_SYSTEMS = 10
+
+# Erase only the pixels drawn last frame, on whichever tiles they were.
+# Busy frames fall back to one full clear.
+screen = DirtyRectDisplay(canvas, BLACK)
+
+COLORS = [
+    display.create_pen(255, 0, 0), # red
+    display.create_pen(0, 255, 0), # green
+    display.create_pen(0, 0, 255), # blue
+    display.create_pen(255, 255, 0), # yellow
+    display.create_pen(255, 0, 255), # magenta
+    display.create_pen(0, 255, 255), # cyan
+    display.create_pen(255, 255, 255), # white
+    display.create_pen(255, 128, 0), # orange
+]
+
+# ------------------------------------------------------------------------
+class ExplosiveParticleSystem:
+    def __init__(self, index: int, numberOfParticles: int):
+        self.index = index
+        self.pool = ParticlePool(numberOfParticles)
+        self.launches = 0
+        self.epiCenterX = 0
+        self.epiCenterY = 0
+        # Step at which the burst is over and the system launches again
+        self.endStep = 0
+        # Whether the burst is seen on this board's tiles
+        self.local = False
+
+    # Anywhere on the wall, the same on every board
+    def launch(self, step: int):
+        random.seed(WALL_SEED + self.index * 7919 + self.launches * 104729)
+        self.launches += 1
+        self.epiCenterX = random.randint(10, WIDTH-1-10)
+        self.epiCenterY = random.randint(10, HEIGHT-1-10)
+        self.pool.trigger360(
+            self.epiCenterX, self.epiCenterY,
+            MAX_PARTICLE_SPEED, MAX_PARTICLE_LIFETIME, COLORS)
+        self.endStep = step + self.pool.lifeSteps(SIM_STEP_MS)
+        self.local = canvas.touches(*self.pool.bounds(SIM_STEP_MS))
+
+    def update(self, step: int, dt: float):
+        if step >= self.endStep:
+            self.launch(step)
+        if self.local:
+            self.pool.update(dt)
+
+    def draw(self):
+        if self.local:
+            self.pool.draw(screen)
+
+# ------------------------------------------------------------------------
+class Demo:
+    def __init__(self):
+        # Simulation steps since the start, the same on every board
+        self.step = 0
+        self.particleSystems = [
+            ExplosiveParticleSystem(i, MAX_EXPLOSIVE_PARTICLES)
+            for i in range(MAX_NUMBER_OF_SYSTEMS)]
+
+    def run(self):
+        frameStart = clock.ticksMs()
+        while True:
+            profiler.beginFrame()
+
+            self.update(SIM_STEP_MS)
+            profiler.mark("update")
+            self.draw()
+            profiler.mark("draw")
+            profiler.endFrame()
+
+            # Hold every board to the same frame rate
+            frameEnd = clock.ticksMs()
+            wait = SIM_STEP_MS - clock.diff(frameEnd, frameStart)
+            if wait > 0:
+                universal_sleep_ms(int(wait))
+            frameStart = clock.ticksMs()
+
+    def update(self, dt: float) -> bool:
+        for ps in self.particleSystems:
+            ps.update(self.step, dt)
+        self.step += 1
+
+        return True # Keep running
+
+    # Draw the particles
+    def draw(self):
+        screen.beginFrame()
+
+        for ps in self.particleSystems:
+            ps.draw()
+
+        # Only push the panel if something was drawn on (or erased from) it
+        canvas.update(i75.update)
+
+demo = Demo()
+demo.run()
+
+print("==== Done ======")
@@ -1,4 +1,5 @@
 from interstate75 import Interstate75, DISPLAY_INTERSTATE75_128X128
+from dirty_rects import DirtyRectDisplay
 from picovector import ANTIALIAS_BEST, PicoVector, Transform, Polygon
 
 i75 = Interstate75(display=DISPLAY_INTERSTATE75_128X128)
@@ -11,15 +12,17 @@ HEIGHT = i75.height
 ORANGE = display.create_pen(255, 128, 0)
 BLACK = display.create_pen(0, 0, 0)
 
+# Only the pixels drawn last frame are erased, instead of the whole panel
+screen = DirtyRectDisplay(display, BLACK)
+
 # ------------------------- Loop ---------------------------------
 while True:
 
-    # Clear the display
-    display.set_pen(BLACK)
-    display.clear()
+    # Erase last frame's pixels
+    screen.beginFrame()
 
-    display.set_pen(ORANGE)
-    display.pixel((WIDTH) // 2,(HEIGHT) // 2)
+    screen.set_pen(ORANGE)
+    screen.pixel((WIDTH) // 2,(HEIGHT) // 2)
 
     # Update the display
     i75.update()
@@ -0,0 +1,67 @@
+import sys
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Description:
+# Loops an animation recorded on the desktop with
+# desktop/record_animation.py (see lib/anim_player.py). Copy the .i7a
+# file next to this script. However heavy the recorded effect was, a
+# frame costs one read from flash and a decode, so no overclock needed.
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# Define a global flag
+IS_MICROPYTHON = sys.implementation.name == 'micropython'
+
+if IS_MICROPYTHON:
+    import utime as time # Use utime for time functions
+else:
+    import time # Use standard time module
+
+from anim_player import AnimationPlayer
+from frame_profiler import FrameProfiler
+from timing import createClock
+
+from interstate75 import Interstate75, DISPLAY_INTERSTATE75_128X128
+from picographics import PicoGraphics, PEN_P8
+
+ANIMATION = "fire.i7a"
+
+i75 = Interstate75(display=DISPLAY_INTERSTATE75_128X128)
+
+# A palette buffer lets frames decode straight into the framebuffer; fall
+# back to the RGB888 display if there's no RAM for it.
+try:
+    graphics = PicoGraphics(display=DISPLAY_INTERSTATE75_128X128, pen_type=PEN_P8)
+except MemoryError:
+    graphics = i75.display
+
+# Prints update/draw/push timings every 120 frames
+profiler = FrameProfiler()
+i75.update = profiler.wrap("push", i75.update)
+
+if IS_MICROPYTHON:
+    # Universal Time Abstraction
+    def universal_sleep_ms(milliseconds: int):
+        time.sleep_ms(milliseconds)
+else:
+    # Universal Time Abstraction
+    def universal_sleep_ms(milliseconds: int):
+        time.sleep(int(milliseconds) / 1000)
+
+clock = createClock()
+
+player = AnimationPlayer(ANIMATION, graphics)
+print(f"{ANIMATION}: {player.frameCount} frames, {len(player.palette)} colors, {player.ramBytes} bytes of RAM")
+
+while True:
+    start = clock.ticksMs()
+    profiler.beginFrame()
+    player.next()
+    profiler.mark("update")
+    i75.update(graphics)
+    profiler.mark("draw")
+    profiler.endFrame()
+
+    # Hold each frame for as long as it was recorded
+    wait = player.frameMs - clock.diff(clock.ticksMs(), start)
+    if wait > 0:
+        universal_sleep_ms(wait)
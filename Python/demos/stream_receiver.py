@@ -0,0 +1,97 @@
+import sys
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Description:
+# Shows frames streamed from the desktop (desktop/stream_sender.py) instead
+# of computing them, see lib/frame_stream.py.
+#
+# On the board it joins Wi-Fi with WIFI_SSID and WIFI_PASSWORD from a
+# secrets.py next to it, prints its address and waits for a sender on
+# port DEFAULT_PORT.
+#
+# Frames are PEN_P8 palette indices, 16KB each at 128x128: the display and
+# every jitter buffer slot would be 64KB in RGB888, which doesn't fit next
+# to the Wi-Fi stack. The RGB888 display Interstate75 makes is dropped for
+# a PEN_P8 one.
+#
+# On desktop it is the stand-in receiver: it listens on localhost and
+# decodes into the emulated framebuffer.
+#   PYTHONPATH=Python/lib:Python/emulator python3 Python/demos/stream_receiver.py
+#   PYTHONPATH=Python/lib:Python/emulator python3 Python/desktop/stream_sender.py --host localhost
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# Define a global flag
+IS_MICROPYTHON = sys.implementation.name == 'micropython'
+
+if IS_MICROPYTHON:
+    import utime as time # Use utime for time functions
+else:
+    import time # Use standard time module
+
+import gc
+
+from frame_stream import StreamReceiver, StreamStats, DEFAULT_PORT
+
+from interstate75 import Interstate75, DISPLAY_INTERSTATE75_128X128
+from picographics import PicoGraphics, PEN_P8
+
+i75 = Interstate75(display=DISPLAY_INTERSTATE75_128X128)
+# Free i75's RGB888 framebuffer before making the PEN_P8 one
+i75.display = None
+gc.collect()
+display = PicoGraphics(display=DISPLAY_INTERSTATE75_128X128, pen_type=PEN_P8)
+
+# Frames collected before playing; each one is a frame of latency
+JITTER_DEPTH = 2
+# Frames that can be waiting, each a framebuffer's worth of RAM. Fewer are
+# used if they don't fit.
+JITTER_SLOTS = 3
+
+# Print a line for every frame, not just the summary
+VERBOSE = False
+
+if IS_MICROPYTHON:
+    import network
+    from secrets import WIFI_SSID, WIFI_PASSWORD
+
+    def connectWifi():
+        wlan = network.WLAN(network.STA_IF)
+        wlan.active(True)
+        # Power saving adds tens of ms of latency
+        wlan.config(pm=0xa11140)
+        wlan.connect(WIFI_SSID, WIFI_PASSWORD)
+        while not wlan.isconnected():
+            time.sleep_ms(100)
+        print("Listening on", wlan.ifconfig()[0], "port", DEFAULT_PORT)
+
+    # Universal Time Abstraction
+    def universal_sleep_ms(milliseconds: int):
+        time.sleep_ms(milliseconds)
+else:
+    def connectWifi():
+        print("Listening on localhost port", DEFAULT_PORT)
+
+    # Universal Time Abstraction
+    def universal_sleep_ms(milliseconds: int):
+        time.sleep(int(milliseconds) / 1000)
+
+BLACK = display.create_pen(0, 0, 0)
+display.set_pen(BLACK)
+display.clear()
+i75.update(display)
+
+connectWifi()
+receiver = StreamReceiver(
+    display, DEFAULT_PORT, JITTER_SLOTS, JITTER_DEPTH,
+    StreamStats(reportEvery=120, verbose=VERBOSE))
+
+try:
+    while True:
+        if receiver.frame():
+            i75.update(display)
+        else:
+            universal_sleep_ms(1)
+finally:
+    receiver.close()
+
+print("==== Done ======")
@@ -2,10 +2,15 @@ import time
 import random
 
 from interstate75 import Interstate75, DISPLAY_INTERSTATE75_128X128
+from frame_profiler import FrameProfiler
+from bit_grid import BitGrid
 
 i75 = Interstate75(display=DISPLAY_INTERSTATE75_128X128)
 display = i75.display
 
+# Prints update/draw/push timings every 120 frames
+profiler = FrameProfiler()
+
 WIDTH, HEIGHT = display.get_bounds()
 VIRTUAL_WIDTH = WIDTH // 4
 VIRTUAL_HEIGHT = HEIGHT // 4
@@ -23,14 +28,9 @@ BLACK = display.create_pen(0, 0, 0)
 
 # Create the 2D array of size 32x32 because each virtual pixel is
 # 2x2 pixels in dimensions. This will span the 128x128 pixel area.
-N_ROWS = VIRTUAL_WIDTH
-N_COLS = VIRTUAL_HEIGHT
-initial_value = 0
-
-buf = [[initial_value for col in range(N_COLS)] for row in range(N_ROWS)]
-
-x = 0
-y = 0
+# One bit per virtual pixel. The grid also tracks which pixels changed so
+# only those get redrawn.
+grid = BitGrid(VIRTUAL_WIDTH, VIRTUAL_HEIGHT)
 
 # What we want is to randomly choose a pixel that is on and turn it off.
 # This means we need to "scan" for an On pixel.
@@ -42,6 +42,7 @@ y = 0
 # we are turning Off.
 # ------------------------- Loop ---------------------------------
 while True:
+    profiler.beginFrame()
 
     # We don't clear the display because we have a chance of clearing
     # individual pixels.
@@ -56,69 +57,35 @@ while True:
             for i in range(4): # Block of N
                 col = random.randint(0, VIRTUAL_WIDTH-1)
                 row = random.randint(0, VIRTUAL_HEIGHT-1)
-                buf[col][row] = 1
+                grid.set(col, row, 1)
         else:
             col = random.randint(0, VIRTUAL_WIDTH-1)
             row = random.randint(0, VIRTUAL_HEIGHT-1)
             # Turn on pixel at x,y
-            buf[col][row] = 1
+            grid.set(col, row, 1)
 
     for i in range(10):
         col = random.randint(0, VIRTUAL_WIDTH-1)
         row = random.randint(0, VIRTUAL_HEIGHT-1)
         if (random.random() > 0.25):
             # Turn off pixel at x,y
-            buf[col][row] = 0
+            grid.set(col, row, 0)
+
+    profiler.mark("update")
 
     # -------- Draw pixels --------
-    x = 0
-    y = 0
-    for row in buf:
-        y = 0
-        for col in row:
-            if col == 1:
-                display.set_pen(ORANGE)
-            else:
-                display.set_pen(BLACK)
-
-            xx = x * 4
-            yy = y * 4
-
-            # Fastest
-            display.rectangle(xx, yy, 4, 4)
-
-            # Slow: 4 lines
-            # display.pixel_span(xx, yy, 4)
-            # display.pixel_span(xx, yy+1, 4)
-            # display.pixel_span(xx, yy+2, 4)
-            # display.pixel_span(xx, yy+3, 4)
-
-            # Slowest: individual pixels
-            # display.pixel(xx, yy)
-            # display.pixel(xx+1, yy)
-            # display.pixel(xx+2, yy)
-            # display.pixel(xx+3, yy)
-            
-            # display.pixel(xx, yy+1)
-            # display.pixel(xx+1, yy+1)
-            # display.pixel(xx+2, yy+1)
-            # display.pixel(xx+3, yy+1)
-
-            # display.pixel(xx, yy+2)
-            # display.pixel(xx+1, yy+2)
-            # display.pixel(xx+2, yy+2)
-            # display.pixel(xx+3, yy+2)
-
-            # display.pixel(xx, yy+3)
-            # display.pixel(xx+1, yy+3)
-            # display.pixel(xx+2, yy+3)
-            # display.pixel(xx+3, yy+3)
-
-            y += 1
-        x += 1
-    
-    
+    # Only the pixels that changed since the last frame, with neighbouring
+    # changes of the same color merged into one wide rectangle.
+    #
+    # rectangle() is the fastest way to fill a 4x4 block. Four pixel_span()
+    # calls are slower and sixteen pixel() calls are the slowest.
+    grid.draw(display, ORANGE, BLACK, 4)
+
+    profiler.mark("draw")
+
     # ----------- Update the display --------------------------
     i75.update()
+    profiler.mark("push")
+    profiler.endFrame()
     # time.sleep(0.1)
 
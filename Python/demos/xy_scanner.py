@@ -1,4 +1,5 @@
 from interstate75 import Interstate75, DISPLAY_INTERSTATE75_128X128
+from dirty_rects import DirtyRectDisplay
 
 i75 = Interstate75(display=DISPLAY_INTERSTATE75_128X128)
 display = i75.display
@@ -9,6 +10,9 @@ WIDTH, HEIGHT = display.get_bounds()
 ORANGE = display.create_pen(255, 128, 0)
 BLACK = display.create_pen(0, 0, 0)
 
+# Only the pixels drawn last frame are erased, instead of the whole panel
+screen = DirtyRectDisplay(display, BLACK)
+
 x1 = 0
 y1 = HEIGHT // 2
 
@@ -24,13 +28,12 @@ accY = 0.0
 # ------------------------- Loop ---------------------------------
 while True:
 
-    # Clear the display
-    display.set_pen(BLACK)
-    display.clear()
+    # Erase last frame's pixels
+    screen.beginFrame()
 
-    display.set_pen(ORANGE)
-    display.pixel(x1, y1)
-    display.pixel(x2, y2)
+    screen.set_pen(ORANGE)
+    screen.pixel(x1, y1)
+    screen.pixel(x2, y2)
 
     if x1 > WIDTH:
         incX = -incX
@@ -0,0 +1,220 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Description:
+# Desktop only. Simulates hundreds of firework systems at once by sharding
+# them across worker processes, for previewing shows on walls of panels
+# that are too big for fireworks_simple_multi_sys.py.
+#
+# Every particle attribute is a (systems, particles) NumPy array living in
+# one multiprocessing.shared_memory block. Each frame the workers update
+# their own range of systems in place (and re-launch the ones that burned
+# out), then the main process composites all live particles into one
+# frame.
+#
+#   python3 Python/desktop/parallel_fireworks.py --systems 400 --width 512 --height 256
+#   python3 Python/desktop/parallel_fireworks.py --serial      # no workers, to compare
+#
+# Needs NumPy.
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import argparse
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy
+
+# Same values as the fireworks demos
+MAX_PARTICLE_LIFETIME = 1.5
+MAX_PARTICLE_SPEED = 1.5
+SIM_STEP_MS = 1000.0 / 60.0
+
+# Same colors as fireworks_pool.py, as 0xRRGGBB
+COLORS = numpy.array([
+    0xff0000, 0x00ff00, 0x0000ff, 0xffff00,
+    0xff00ff, 0x00ffff, 0xffffff, 0xff8000,
+], dtype=numpy.uint32)
+
+# name, dtype of each (systems, particles) array in the shared block
+FIELDS = (
+    ("posX", numpy.float32),
+    ("posY", numpy.float32),
+    ("velX", numpy.float32),
+    ("velY", numpy.float32),
+    ("elapsed", numpy.float32),
+    ("lifespan", numpy.float32),
+    ("color", numpy.uint32),
+    ("alive", numpy.bool_),
+)
+
+# ------------------------------------------------------------------------
+class SharedState:
+    def __init__(self, systems: int, particles: int, name: str = None):
+        self.systems = systems
+        self.particles = particles
+        shape = (systems, particles)
+        count = systems * particles
+        size = sum(numpy.dtype(dtype).itemsize * count for (field, dtype) in FIELDS)
+        self.owner = name is None
+        if self.owner:
+            self.memory = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.memory = shared_memory.SharedMemory(name=name)
+        self.name = self.memory.name
+        offset = 0
+        for (field, dtype) in FIELDS:
+            array = numpy.ndarray(shape, dtype=dtype, buffer=self.memory.buf, offset=offset)
+            setattr(self, field, array)
+            offset += array.nbytes
+        if self.owner:
+            self.alive[:] = False
+
+    def close(self):
+        # The arrays hold on to the buffer; drop them first.
+        for (field, dtype) in FIELDS:
+            setattr(self, field, None)
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+# ------------------------------------------------------------------------
+# Worker side. Each worker process attaches to the shared block once.
+_state = None
+
+def _attach(name: str, systems: int, particles: int):
+    global _state
+    _state = SharedState(systems, particles, name)
+
+def _detach():
+    global _state
+    if _state is not None:
+        _state.close()
+        _state = None
+
+# Advance systems first..last-1 by dt ms and re-launch any that finished.
+# Returns the number of live particles in the range.
+def simulate(first: int, last: int, dt: float, width: int, height: int, seed: int) -> int:
+    s = _state
+    rows = slice(first, last)
+    alive = s.alive[rows]
+    elapsed = s.elapsed[rows]
+
+    elapsed += dt * alive
+    alive &= elapsed < s.lifespan[rows]
+    s.posX[rows] += s.velX[rows] * alive
+    s.posY[rows] += s.velY[rows] * alive
+
+    finished = numpy.nonzero(~alive.any(axis=1))[0]
+    if len(finished):
+        _launch(s, finished + first, width, height, numpy.random.default_rng(seed))
+    return int(numpy.count_nonzero(s.alive[rows]))
+
+# Explode the given systems from new random epicenters, with the same
+# distributions as ParticlePool.trigger360().
+def _launch(s: SharedState, systems, width: int, height: int, rng):
+    shape = (len(systems), s.particles)
+    x = rng.integers(10, max(11, width - 10), len(systems))[:, None]
+    y = rng.integers(10, max(11, height - 10), len(systems))[:, None]
+    angle = rng.uniform(0.0, 2.0 * math.pi, shape)
+    speed = 0.05 + rng.uniform(0.0, MAX_PARTICLE_SPEED, shape)
+    s.posX[systems] = x
+    s.posY[systems] = y
+    s.velX[systems] = numpy.cos(angle) * speed
+    s.velY[systems] = numpy.sin(angle) * speed
+    s.elapsed[systems] = 0.0
+    s.lifespan[systems] = rng.uniform(0.1, MAX_PARTICLE_LIFETIME, shape) * 1000.0
+    s.color[systems] = COLORS[rng.integers(0, len(COLORS), shape)]
+    s.alive[systems] = True
+
+# ------------------------------------------------------------------------
+# Main process side.
+
+# Draw every live particle into frame, a width*height uint32 array.
+def composite(s: SharedState, frame, width: int, height: int):
+    frame[:] = 0
+    alive = s.alive
+    x = s.posX[alive].astype(numpy.int32)
+    y = s.posY[alive].astype(numpy.int32)
+    onScreen = (x >= 0) & (x < width) & (y >= 0) & (y < height)
+    frame[y[onScreen] * width + x[onScreen]] = s.color[alive][onScreen]
+
+def savePpm(path: str, frame, width: int, height: int):
+    rgb = numpy.empty((height * width, 3), dtype=numpy.uint8)
+    rgb[:, 0] = frame >> 16
+    rgb[:, 1] = frame >> 8
+    rgb[:, 2] = frame
+    with open(path, "wb") as f:
+        f.write(b"P6\n%d %d\n255\n" % (width, height))
+        f.write(rgb.tobytes())
+
+def shards(systems: int, count: int) -> list:
+    size = (systems + count - 1) // count
+    return [(first, min(first + size, systems)) for first in range(0, systems, size)]
+
+def run(args):
+    state = SharedState(args.systems, args.particles)
+    frame = numpy.zeros(args.width * args.height, dtype=numpy.uint32)
+    # Serial runs use the same shards and seeds, so they draw the same show.
+    workers = args.workers
+    ranges = shards(args.systems, workers)
+    executor = None
+    if args.serial:
+        _attach(state.name, args.systems, args.particles)
+    else:
+        executor = ProcessPoolExecutor(
+            workers, initializer=_attach,
+            initargs=(state.name, args.systems, args.particles))
+
+    simUs = 0
+    compositeUs = 0
+    live = 0
+    try:
+        for f in range(args.frames):
+            start = time.perf_counter_ns()
+            seeds = [args.seed + f * len(ranges) + i for i in range(len(ranges))]
+            if executor:
+                futures = [
+                    executor.submit(simulate, first, last, SIM_STEP_MS, args.width, args.height, seed)
+                    for ((first, last), seed) in zip(ranges, seeds)]
+                live = sum(future.result() for future in futures)
+            else:
+                live = sum(
+                    simulate(first, last, SIM_STEP_MS, args.width, args.height, seed)
+                    for ((first, last), seed) in zip(ranges, seeds))
+            middle = time.perf_counter_ns()
+            composite(state, frame, args.width, args.height)
+            simUs += (middle - start) // 1000
+            compositeUs += (time.perf_counter_ns() - middle) // 1000
+    finally:
+        if executor:
+            executor.shutdown()
+        if args.serial:
+            _detach()
+        if args.snapshot:
+            savePpm(args.snapshot, frame, args.width, args.height)
+        state.close()
+
+    frames = max(1, args.frames)
+    total = (simUs + compositeUs) / frames
+    mode = f"{len(ranges)} shards, " + ("serial" if args.serial else f"{workers} workers")
+    print(f"{args.systems} systems x {args.particles} particles on {args.width}x{args.height}, {mode}")
+    print(f"  simulate {simUs / frames / 1000:7.2f} ms/frame")
+    print(f"  composite {compositeUs / frames / 1000:6.2f} ms/frame")
+    print(f"  {1000000 / total:.1f} FPS, {live} live particles in the last frame")
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate many firework systems across processes.")
+    parser.add_argument("--systems", type=int, default=400)
+    parser.add_argument("--particles", type=int, default=20)
+    parser.add_argument("--width", type=int, default=512)
+    parser.add_argument("--height", type=int, default=256)
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--serial", action="store_true", help="simulate in this process")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--snapshot", help="write the last frame to a PPM file")
+    run(parser.parse_args())
+
+if __name__ == "__main__":
+    main()
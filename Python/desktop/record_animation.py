@@ -0,0 +1,84 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Description:
+# Desktop only. Runs a demo under the emulator, records every frame it
+# pushes with i75.update() and bakes them into an animation file (see
+# lib/anim_format.py) for demos/play_animation.py to play on the board.
+#
+#   PYTHONPATH=Python/lib:Python/emulator python3 Python/desktop/record_animation.py \
+#       Python/pimoroni_examples/glorious_fire.py fire.i7a --frames 240
+#
+# --skip drops the first frames, e.g. while the fire builds up. The demos
+# run on a simulated 60Hz clock on desktop, so --frame-ms should match it
+# unless the demo has its own pacing.
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import argparse
+import os
+import runpy
+import sys
+
+import interstate75
+from anim_format import AnimationWriter
+
+# ------------------------------------------------------------------------
+class Recorder:
+    def __init__(self, args):
+        self.args = args
+        self.writer = None
+        self.pushed = 0
+
+    # Wraps Interstate75.update(), so every board in the demo is recorded
+    def wrap(self, update):
+        recorder = self
+
+        def recordingUpdate(i75, buffer=None):
+            update(i75, buffer)
+            recorder.capture(i75)
+        return recordingUpdate
+
+    def capture(self, i75):
+        args = self.args
+        self.pushed += 1
+        if self.pushed <= args.skip:
+            return
+        if self.writer is None:
+            self.writer = AnimationWriter(args.output, i75.width, i75.height, args.frame_ms, args.keyframe_every)
+        self.writer.add(i75.frame)
+        if len(self.writer.frames) >= args.frames:
+            raise SystemExit(0)
+
+def run(args):
+    recorder = Recorder(args)
+    interstate75.Interstate75.update = recorder.wrap(interstate75.Interstate75.update)
+    os.environ["I75_EMU_QUIET"] = "1"
+    # The demo finds its own imports next to it
+    sys.path.insert(0, os.path.dirname(os.path.abspath(args.demo)))
+    sys.argv = [args.demo]
+    try:
+        runpy.run_path(args.demo, run_name="__main__")
+    except SystemExit:
+        pass
+
+    writer = recorder.writer
+    if writer is None or not writer.frames:
+        print("The demo didn't push any frames")
+        return
+    frames = len(writer.frames)
+    writer.close()
+    raw = frames * writer.width * writer.height * 4
+    print(f"{frames} frames of {writer.width}x{writer.height}, {len(writer.palette)} colors")
+    print(f"  full/rle/delta {writer.types[0]}/{writer.types[1]}/{writer.types[2]}")
+    print(f"  {writer.size} bytes, {writer.size / frames:.0f} per frame, {100 * writer.size / raw:.1f}% of RGB888")
+
+def main():
+    parser = argparse.ArgumentParser(description="Record a demo into an animation file.")
+    parser.add_argument("demo", help="demo script to run")
+    parser.add_argument("output", help="animation file to write")
+    parser.add_argument("--frames", type=int, default=240)
+    parser.add_argument("--skip", type=int, default=0, help="frames to drop first")
+    parser.add_argument("--frame-ms", type=int, default=17)
+    parser.add_argument("--keyframe-every", type=int, default=60)
+    run(parser.parse_args())
+
+if __name__ == "__main__":
+    main()
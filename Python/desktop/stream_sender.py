@@ -0,0 +1,157 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Description:
+# Desktop only. Renders the fire or fireworks effect with the emulator's
+# PicoGraphics and streams the frames to demos/stream_receiver.py running
+# on the panel (or on localhost), see lib/frame_stream.py.
+#
+# The desktop can afford what the board can't, e.g. the fire at full
+# resolution (--scale 1) instead of glorious_fire.py's 4x4 cells.
+#
+#   PYTHONPATH=Python/lib:Python/emulator python3 Python/desktop/stream_sender.py --host 192.168.1.75
+#   PYTHONPATH=Python/lib:Python/emulator python3 Python/desktop/stream_sender.py --effect fireworks --verbose
+#
+# Frames are rendered and sent as PEN_P8 palette indices, which is what
+# the receiver on the board has room for, with the palette.
+#
+# Prints the size and encoding of every frame with --verbose, and a
+# bandwidth summary at the end.
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import argparse
+import random
+import time
+
+import numpy
+
+from picographics import PicoGraphics, DISPLAY_INTERSTATE75_128X128, PEN_P8
+from frame_stream import FrameSender, DEFAULT_PORT, FRAME_NAMES
+from fire_engine import FireEngine
+from palette_blit import PaletteBlitter
+from particle_pool import ParticlePool
+
+# Same as glorious_fire.py
+FIRE_PALETTE = [
+    (0, 0, 0),
+    (5, 5, 5),
+    (20, 20, 20),
+    (180, 30, 0),
+    (220, 160, 0),
+    (255, 255, 180)
+]
+
+# Same values as fireworks_pool.py
+MAX_PARTICLE_LIFETIME = 1.5
+MAX_PARTICLE_SPEED = 1.5
+SIM_STEP_MS = 1000.0 / 60.0
+
+# ------------------------------------------------------------------------
+class FireSource:
+    def __init__(self, display, scale: int):
+        (width, height) = display.get_bounds()
+        self.display = display
+        self.fire = FireEngine(width // scale, height // scale, max(1, 16 // scale), 3.0, 0.98)
+        self.blitter = PaletteBlitter(display, FIRE_PALETTE, width // scale, height // scale, scale)
+        self.white = display.create_pen(255, 255, 255)
+
+    def render(self):
+        self.fire.update()
+        cells = numpy.clip(self.fire.visible(), 0, 1) * (len(FIRE_PALETTE) - 1)
+        self.blitter.blit(cells.astype(numpy.uint8).tobytes())
+        self.display.set_pen(self.white)
+        self.display.text("This is\nfine!", 10, 10)
+
+class FireworksSource:
+    def __init__(self, display, systems: int, particles: int):
+        (self.width, self.height) = display.get_bounds()
+        self.display = display
+        self.black = display.create_pen(0, 0, 0)
+        self.colors = [
+            display.create_pen(r, g, b) for (r, g, b) in (
+                (255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 0),
+                (255, 0, 255), (0, 255, 255), (255, 255, 255), (255, 128, 0))]
+        self.pools = [ParticlePool(particles) for i in range(systems)]
+        for pool in self.pools:
+            self.launch(pool)
+
+    def launch(self, pool: ParticlePool):
+        pool.trigger360(
+            random.randint(10, self.width - 11), random.randint(10, self.height - 11),
+            MAX_PARTICLE_SPEED, MAX_PARTICLE_LIFETIME, self.colors)
+
+    def render(self):
+        self.display.set_pen(self.black)
+        self.display.clear()
+        for pool in self.pools:
+            if pool.update(SIM_STEP_MS) == 0:
+                self.launch(pool)
+            pool.draw(self.display)
+
+# ------------------------------------------------------------------------
+def run(args):
+    display = PicoGraphics(display=DISPLAY_INTERSTATE75_128X128, pen_type=PEN_P8)
+    (width, height) = display.get_bounds()
+    if args.effect == "fire":
+        source = FireSource(display, args.scale)
+    else:
+        source = FireworksSource(display, args.systems, args.particles)
+
+    sender = FrameSender.connect(args.host, args.port, width, height, display.bytesPerPixel, args.keyframe_every)
+    # The sources create all their pens up front
+    sender.setPalette(display.palette)
+    print(f"Streaming {args.effect} to {args.host}:{args.port} at {args.fps} FPS")
+
+    frameS = 1.0 / args.fps
+    counts = [0, 0, 0]
+    totalBytes = 0
+    encodeS = 0.0
+    start = time.monotonic()
+    nextFrame = start
+    frames = 0
+    try:
+        while args.frames == 0 or frames < args.frames:
+            source.render()
+            before = time.perf_counter()
+            (frameType, size) = sender.send(display.buffer)
+            encodeS += time.perf_counter() - before
+            counts[frameType] += 1
+            totalBytes += size
+            frames += 1
+            if args.verbose:
+                print(f"frame {sender.sequence - 1:6d} {FRAME_NAMES[frameType]:>5} {size:6d} bytes")
+            nextFrame += frameS
+            wait = nextFrame - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            else:
+                # Fell behind, don't try to catch up
+                nextFrame = time.monotonic()
+    except (BrokenPipeError, ConnectionResetError):
+        print("Receiver went away")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sender.close()
+
+    elapsed = time.monotonic() - start
+    frames = max(1, frames)
+    raw = width * height * display.bytesPerPixel
+    print(f"{frames} frames in {elapsed:.1f}s, full/rle/delta {counts[0]}/{counts[1]}/{counts[2]}")
+    print(f"  {totalBytes / frames:.0f} bytes/frame ({100 * totalBytes / frames / raw:.1f}% of {raw}), {totalBytes / elapsed / 1024:.1f} kB/s")
+    print(f"  encode {encodeS / frames * 1000:.2f} ms/frame")
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream rendered frames to a panel.")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--effect", choices=("fire", "fireworks"), default="fire")
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--frames", type=int, default=0, help="stop after this many, 0 runs until interrupted")
+    parser.add_argument("--scale", type=int, default=1, help="fire cell size in pixels")
+    parser.add_argument("--systems", type=int, default=10)
+    parser.add_argument("--particles", type=int, default=20)
+    parser.add_argument("--keyframe-every", type=int, default=120)
+    parser.add_argument("--verbose", action="store_true", help="print every frame")
+    run(parser.parse_args())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Description:
+# Adds the MicroPython-only functions of the time module (ticks_ms,
+# ticks_diff, sleep_ms...) to CPython's time module so demos that call
+# them run unchanged on desktop. Imported by the emulator modules.
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import time
+
+def _ticks_ms() -> int:
+    return time.monotonic_ns() // 1000000
+
+def _ticks_us() -> int:
+    return time.monotonic_ns() // 1000
+
+def _ticks_cpu() -> int:
+    return time.perf_counter_ns()
+
+def _ticks_diff(ticks1: int, ticks2: int) -> int:
+    return ticks1 - ticks2
+
+def _ticks_add(ticks: int, delta: int) -> int:
+    return ticks + delta
+
+def _sleep_ms(milliseconds: int):
+    time.sleep(milliseconds / 1000)
+
+def _sleep_us(microseconds: int):
+    time.sleep(microseconds / 1000000)
+
+def install():
+    for name, f in (
+        ("ticks_ms", _ticks_ms),
+        ("ticks_us", _ticks_us),
+        ("ticks_cpu", _ticks_cpu),
+        ("ticks_diff", _ticks_diff),
+        ("ticks_add", _ticks_add),
+        ("sleep_ms", _sleep_ms),
+        ("sleep_us", _sleep_us)):
+        if not hasattr(time, name):
+            setattr(time, name, f)
+
+install()
@@ -0,0 +1,110 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Description:
+# Desktop stand-in for Pimoroni's interstate75 module. It wraps the
+# emulated PicoGraphics and, instead of pushing to a HUB75 panel, keeps
+# frame-time statistics on every update().
+#
+# Environment variables:
+#   I75_EMU_FRAMES=N         exit after N frames
+#   I75_EMU_SNAPSHOT=f.ppm   write the last frame to a PPM file on exit
+#   I75_EMU_QUIET=1          don't print the frame-time summary on exit
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import atexit
+import os
+import time
+
+from picographics import (
+    PicoGraphics,
+    DISPLAY_INTERSTATE75_32X32,
+    DISPLAY_INTERSTATE75_64X32,
+    DISPLAY_INTERSTATE75_96X32,
+    DISPLAY_INTERSTATE75_96X48,
+    DISPLAY_INTERSTATE75_128X32,
+    DISPLAY_INTERSTATE75_64X64,
+    DISPLAY_INTERSTATE75_128X64,
+    DISPLAY_INTERSTATE75_192X64,
+    DISPLAY_INTERSTATE75_256X64,
+    DISPLAY_INTERSTATE75_128X128,
+)
+
+# ------------------------------------------------------------------------
+class Interstate75:
+    DISPLAY_INTERSTATE75_32X32 = DISPLAY_INTERSTATE75_32X32
+    DISPLAY_INTERSTATE75_64X32 = DISPLAY_INTERSTATE75_64X32
+    DISPLAY_INTERSTATE75_96X32 = DISPLAY_INTERSTATE75_96X32
+    DISPLAY_INTERSTATE75_96X48 = DISPLAY_INTERSTATE75_96X48
+    DISPLAY_INTERSTATE75_128X32 = DISPLAY_INTERSTATE75_128X32
+    DISPLAY_INTERSTATE75_64X64 = DISPLAY_INTERSTATE75_64X64
+    DISPLAY_INTERSTATE75_128X64 = DISPLAY_INTERSTATE75_128X64
+    DISPLAY_INTERSTATE75_192X64 = DISPLAY_INTERSTATE75_192X64
+    DISPLAY_INTERSTATE75_256X64 = DISPLAY_INTERSTATE75_256X64
+    DISPLAY_INTERSTATE75_128X128 = DISPLAY_INTERSTATE75_128X128
+
+    PANEL_GENERIC = 0
+    PANEL_FM6126A = 1
+
+    COLOR_ORDER_RGB = 0
+    COLOR_ORDER_RBG = 1
+    COLOR_ORDER_GRB = 2
+    COLOR_ORDER_GBR = 3
+    COLOR_ORDER_BRG = 4
+    COLOR_ORDER_BGR = 5
+
+    def __init__(self, display=DISPLAY_INTERSTATE75_128X128, panel_type=PANEL_GENERIC, stb_invert=False, color_order=COLOR_ORDER_RGB, **kwargs):
+        self.display = PicoGraphics(display=display)
+        self.width, self.height = self.display.get_bounds()
+        # The last frame pushed to the "panel" as 0x00RRGGBB uint32s
+        self.frame = bytes(self.width * self.height * 4)
+
+        self.frameCount = 0
+        self.maxFrames = int(os.environ.get("I75_EMU_FRAMES", "0"))
+        self.snapshotPath = os.environ.get("I75_EMU_SNAPSHOT")
+        self.quiet = os.environ.get("I75_EMU_QUIET") == "1"
+        self.startTime = None
+        self.lastTime = None
+        self.minFrameMs = None
+        self.maxFrameMs = 0.0
+        atexit.register(self._atExit)
+
+    def update(self, buffer=None):
+        if buffer is None:
+            buffer = self.display
+        self.frame = bytes(buffer.composite())
+
+        now = time.perf_counter()
+        if self.lastTime is None:
+            self.startTime = now
+        else:
+            frameMs = (now - self.lastTime) * 1000.0
+            self.maxFrameMs = max(self.maxFrameMs, frameMs)
+            self.minFrameMs = frameMs if self.minFrameMs is None else min(self.minFrameMs, frameMs)
+        self.lastTime = now
+        self.frameCount += 1
+
+        if self.maxFrames and self.frameCount >= self.maxFrames:
+            raise SystemExit(0)
+
+    # The last frame as packed RGB888 bytes, 3 bytes per pixel.
+    def frame_rgb(self) -> bytes:
+        frame = self.frame
+        rgb = bytearray(self.width * self.height * 3)
+        rgb[0::3] = frame[2::4]
+        rgb[1::3] = frame[1::4]
+        rgb[2::3] = frame[0::4]
+        return bytes(rgb)
+
+    def save_ppm(self, path: str):
+        with open(path, "wb") as f:
+            f.write(b"P6\n%d %d\n255\n" % (self.width, self.height))
+            f.write(self.frame_rgb())
+
+    def _atExit(self):
+        if self.snapshotPath and self.frameCount:
+            self.save_ppm(self.snapshotPath)
+        if self.quiet or self.frameCount < 2:
+            return
+        totalMs = (self.lastTime - self.startTime) * 1000.0
+        avgMs = totalMs / (self.frameCount - 1)
+        print(f"{self.frameCount} frames in {totalMs:.0f}ms, avg {avgMs:.02f}ms per frame "
+              f"(min {self.minFrameMs:.02f}, max {self.maxFrameMs:.02f}), {1000 / avgMs:.02f} FPS")
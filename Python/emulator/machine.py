@@ -0,0 +1,15 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Description:
+# Desktop stand-in for the machine module. Only what the demos touch.
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+_freq = 125_000_000
+
+def freq(hz: int = None) -> int:
+    global _freq
+    if hz is None:
+        return _freq
+    _freq = hz
+
+def reset():
+    raise SystemExit(0)
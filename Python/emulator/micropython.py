@@ -0,0 +1,24 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Description:
+# Desktop stand-in for the micropython module. The code emitters are
+# no-ops here, so decorated functions run as ordinary Python.
+# Note: @micropython.viper code that uses ptr8/ptr32 won't run on desktop.
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def const(value):
+    return value
+
+def native(f):
+    return f
+
+def viper(f):
+    return f
+
+def mem_info(verbose=None):
+    pass
+
+def alloc_emergency_exception_buf(size: int):
+    pass
+
+def schedule(f, arg):
+    f(arg)
@@ -0,0 +1,361 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Description:
+# A pure Python stand-in for Pimoroni's PicoGraphics so the demos can run
+# on desktop. It implements the subset of picographics_api.md the demos
+# use on top of an in-memory framebuffer.
+#
+# Like PicoGraphics in PEN_RGB888 mode every pixel is a little-endian
+# uint32 0x00RRGGBB, so a pen is just that integer. In PEN_P8 mode every
+# pixel is one byte indexing a 256 entry palette and a pen is the index.
+# Each layer has its own buffer. Pixels that are 0 in layers above 0 are
+# transparent when the layers are composited.
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import math
+
+import _mpcompat
+
+PEN_P8 = 3
+PEN_RGB888 = 7
+
+DISPLAY_INTERSTATE75_32X32 = 20
+DISPLAY_INTERSTATE75_64X32 = 21
+DISPLAY_INTERSTATE75_96X32 = 22
+DISPLAY_INTERSTATE75_96X48 = 23
+DISPLAY_INTERSTATE75_128X32 = 24
+DISPLAY_INTERSTATE75_64X64 = 25
+DISPLAY_INTERSTATE75_128X64 = 26
+DISPLAY_INTERSTATE75_192X64 = 27
+DISPLAY_INTERSTATE75_256X64 = 28
+DISPLAY_INTERSTATE75_128X128 = 29
+
+DISPLAY_SIZES = {
+    DISPLAY_INTERSTATE75_32X32: (32, 32),
+    DISPLAY_INTERSTATE75_64X32: (64, 32),
+    DISPLAY_INTERSTATE75_96X32: (96, 32),
+    DISPLAY_INTERSTATE75_96X48: (96, 48),
+    DISPLAY_INTERSTATE75_128X32: (128, 32),
+    DISPLAY_INTERSTATE75_64X64: (64, 64),
+    DISPLAY_INTERSTATE75_128X64: (128, 64),
+    DISPLAY_INTERSTATE75_192X64: (192, 64),
+    DISPLAY_INTERSTATE75_256X64: (256, 64),
+    DISPLAY_INTERSTATE75_128X128: (128, 128),
+}
+
+# Classic 5x7 font, printable ASCII from 0x20 to 0x7E. Five column bytes
+# per glyph, bit 0 is the top row. All bitmap and vector font names map to
+# it; only the line height changes.
+_FONT_5X7 = bytes.fromhex(
+    "0000000000" "00005f0000" "0007000700" "147f147f14" "242a7f2a12"
+    "2313086462" "3649552250" "0005030000" "001c224100" "0041221c00"
+    "082a1c2a08" "08083e0808" "0050300000" "0808080808" "0060600000"
+    "2010080402" "3e5149453e" "00427f4000" "4261514946" "2141454b31"
+    "1814127f10" "2745454539" "3c4a494930" "0171090503" "3649494936"
+    "064949291e" "0036360000" "0056360000" "0814224100" "1414141414"
+    "0041221408" "0201510906" "324979413e" "7e1111117e" "7f49494936"
+    "3e41414122" "7f4141221c" "7f49494941" "7f09090101" "3e41415132"
+    "7f0808087f" "00417f4100" "2040413f01" "7f08142241" "7f40404040"
+    "7f0204027f" "7f0408107f" "3e4141413e" "7f09090906" "3e4151215e"
+    "7f09192946" "4649494931" "01017f0101" "3f4040403f" "1f2040201f"
+    "7f2018207f" "6314081463" "0304780403" "6151494543" "00007f4141"
+    "0204081020" "41417f0000" "0402010204" "4040404040" "0001020400"
+    "2054545478" "7f48444438" "3844444420" "384444487f" "3854545418"
+    "087e090102" "081454543c" "7f08040478" "00447d4000" "2040443d00"
+    "007f102844" "00417f4000" "7c04180478" "7c08040478" "3844444438"
+    "7c14141408" "081414187c" "7c08040408" "4854545420" "043f444020"
+    "3c4040207c" "1c2040201c" "3c4030403c" "4428102844" "0c5050503c"
+    "4464544c44" "0008364100" "00007f0000" "0041360800" "0201020402")
+
+_FONT_HEIGHTS = {
+    "bitmap6": 6,
+    "bitmap8": 8,
+    "bitmap14_outline": 14,
+}
+
+# ------------------------------------------------------------------------
+class PicoGraphics:
+    def __init__(self, display=DISPLAY_INTERSTATE75_128X128, pen_type=PEN_RGB888, layers=1, **kwargs):
+        self.width, self.height = DISPLAY_SIZES.get(display, (128, 128))
+        self.pen_type = pen_type
+        self.layers = layers
+        self.bytesPerPixel = 1 if pen_type == PEN_P8 else 4
+        self.frameSize = self.width * self.height * self.bytesPerPixel
+        # All layers live back to back in one buffer, as on the board.
+        self.buffer = bytearray(self.frameSize * layers)
+        self.layer = 0
+        self.layerOffset = 0
+        self.pen = 0
+        self.penBytes = bytes(self.bytesPerPixel)
+        # PEN_P8 only
+        self.palette = [(0, 0, 0)] * 256
+        self.paletteUsed = [False] * 256
+        self.font = "bitmap8"
+        self.thickness = 1
+        self.remove_clip()
+
+    # Python 3.12+ lets memoryview(display) work like it does on the board.
+    def __buffer__(self, flags):
+        return memoryview(self.buffer)
+
+    def get_bounds(self) -> tuple:
+        return (self.width, self.height)
+
+    # -------------------------------------------------------------------
+    # Pens
+    def create_pen(self, r: int, g: int, b: int) -> int:
+        if self.pen_type == PEN_P8:
+            for i in range(256):
+                if not self.paletteUsed[i]:
+                    self.update_pen(i, r, g, b)
+                    return i
+            raise RuntimeError("palette full")
+        return ((int(r) & 0xff) << 16) | ((int(g) & 0xff) << 8) | (int(b) & 0xff)
+
+    def create_pen_hsv(self, h: float, s: float, v: float) -> int:
+        (r, g, b) = hsv_to_rgb(h, s, v)
+        return self.create_pen(r, g, b)
+
+    def set_pen(self, pen: int):
+        self.pen = pen
+        self.penBytes = int(pen).to_bytes(self.bytesPerPixel, 'little')
+
+    def reset_pen(self, pen: int):
+        # Only P8 pens use palette slots.
+        if self.pen_type == PEN_P8:
+            self.palette[pen] = (0, 0, 0)
+            self.paletteUsed[pen] = False
+
+    def update_pen(self, index: int, r: int, g: int, b: int):
+        self.palette[index] = (int(r) & 0xff, int(g) & 0xff, int(b) & 0xff)
+        self.paletteUsed[index] = True
+
+    def set_palette(self, colors: list):
+        for i, (r, g, b) in enumerate(colors):
+            self.update_pen(i, r, g, b)
+
+    def set_layer(self, layer: int):
+        if layer < 0 or layer >= self.layers:
+            raise ValueError("layer out of range")
+        self.layer = layer
+        self.layerOffset = layer * self.frameSize
+
+    def set_font(self, font: str):
+        self.font = font
+
+    def set_thickness(self, thickness: int):
+        self.thickness = thickness
+
+    # -------------------------------------------------------------------
+    # Clipping
+    def set_clip(self, x: int, y: int, w: int, h: int):
+        self.clipX0 = max(0, int(x))
+        self.clipY0 = max(0, int(y))
+        self.clipX1 = min(self.width, int(x) + int(w))
+        self.clipY1 = min(self.height, int(y) + int(h))
+
+    def remove_clip(self):
+        self.clipX0 = 0
+        self.clipY0 = 0
+        self.clipX1 = self.width
+        self.clipY1 = self.height
+
+    # -------------------------------------------------------------------
+    # Every primitive ends up here: a horizontal run of pixels, clipped.
+    def _span(self, x: int, y: int, length: int):
+        if y < self.clipY0 or y >= self.clipY1:
+            return
+        x0 = max(x, self.clipX0)
+        x1 = min(x + length, self.clipX1)
+        if x1 <= x0:
+            return
+        bpp = self.bytesPerPixel
+        start = self.layerOffset + (y * self.width + x0) * bpp
+        self.buffer[start:start + (x1 - x0) * bpp] = self.penBytes * (x1 - x0)
+
+    def clear(self):
+        self.rectangle(0, 0, self.width, self.height)
+
+    def pixel(self, x: int, y: int):
+        x = int(x)
+        y = int(y)
+        if self.clipX0 <= x < self.clipX1 and self.clipY0 <= y < self.clipY1:
+            bpp = self.bytesPerPixel
+            start = self.layerOffset + (y * self.width + x) * bpp
+            self.buffer[start:start + bpp] = self.penBytes
+
+    def pixel_span(self, x: int, y: int, length: int):
+        self._span(int(x), int(y), int(length))
+
+    def rectangle(self, x: int, y: int, w: int, h: int):
+        x = int(x)
+        w = int(w)
+        y0 = max(int(y), self.clipY0)
+        y1 = min(int(y) + int(h), self.clipY1)
+        for row in range(y0, y1):
+            self._span(x, row, w)
+
+    def circle(self, x: int, y: int, r: int):
+        x = int(x)
+        y = int(y)
+        r = int(r)
+        rr = r * r
+        for dy in range(-r, r + 1):
+            dx = int(math.sqrt(rr - dy * dy))
+            self._span(x - dx, y + dy, dx * 2 + 1)
+
+    def line(self, x1: int, y1: int, x2: int, y2: int, thickness: int = 1):
+        x1 = int(x1)
+        y1 = int(y1)
+        x2 = int(x2)
+        y2 = int(y2)
+        half = int(thickness) // 2
+        dx = abs(x2 - x1)
+        dy = -abs(y2 - y1)
+        sx = 1 if x1 < x2 else -1
+        sy = 1 if y1 < y2 else -1
+        err = dx + dy
+        while True:
+            if half:
+                self.rectangle(x1 - half, y1 - half, thickness, thickness)
+            else:
+                self.pixel(x1, y1)
+            if x1 == x2 and y1 == y2:
+                break
+            e2 = 2 * err
+            if e2 >= dy:
+                err += dy
+                x1 += sx
+            if e2 <= dx:
+                err += dx
+                y1 += sy
+
+    def triangle(self, x1: int, y1: int, x2: int, y2: int, x3: int, y3: int):
+        self.polygon([(x1, y1), (x2, y2), (x3, y3)])
+
+    # Even-odd scanline fill
+    def polygon(self, points: list):
+        if len(points) < 3:
+            return
+        ys = [p[1] for p in points]
+        top = max(int(min(ys)), self.clipY0)
+        bottom = min(int(math.ceil(max(ys))), self.clipY1 - 1)
+        n = len(points)
+        for row in range(top, bottom + 1):
+            cy = row + 0.5
+            crossings = []
+            for i in range(n):
+                (ax, ay) = points[i]
+                (bx, by) = points[(i + 1) % n]
+                if (ay <= cy < by) or (by <= cy < ay):
+                    crossings.append(ax + (cy - ay) * (bx - ax) / (by - ay))
+            crossings.sort()
+            for i in range(0, len(crossings) - 1, 2):
+                x0 = int(math.ceil(crossings[i] - 0.5))
+                x1 = int(math.ceil(crossings[i + 1] - 0.5))
+                self._span(x0, row, x1 - x0)
+
+    # -------------------------------------------------------------------
+    # Text
+    def _lineHeight(self) -> int:
+        return _FONT_HEIGHTS.get(self.font, 8)
+
+    def character(self, char: int, x: int, y: int, scale: int = 2):
+        if char < 0x20 or char > 0x7e:
+            return
+        scale = max(1, int(scale))
+        glyph = (char - 0x20) * 5
+        for col in range(5):
+            bits = _FONT_5X7[glyph + col]
+            row = 0
+            while bits:
+                if bits & 1:
+                    self.rectangle(x + col * scale, y + row * scale, scale, scale)
+                bits >>= 1
+                row += 1
+
+    def measure_text(self, text: str, scale: int = 2, spacing: int = 1, fixed_width: bool = False) -> int:
+        scale = max(1, int(scale))
+        widest = 0
+        for line in text.split("\n"):
+            widest = max(widest, len(line) * (5 + spacing) * scale)
+        return widest
+
+    def text(self, text: str, x: int, y: int, wordwrap: int = None, scale: int = 2, angle: int = 0, spacing: int = 1, fixed_width: bool = False):
+        x = int(x)
+        y = int(y)
+        scale = max(1, int(scale))
+        advance = (5 + spacing) * scale
+        lineHeight = self._lineHeight() * scale
+        cx = x
+        cy = y
+        for word in _words(text):
+            if word == "\n":
+                cx = x
+                cy += lineHeight
+                continue
+            if wordwrap and cx > x and cx - x + len(word.rstrip()) * advance > wordwrap:
+                cx = x
+                cy += lineHeight
+                word = word.lstrip()
+            for c in word:
+                self.character(ord(c), cx, cy, scale)
+                cx += advance
+
+    # -------------------------------------------------------------------
+    # Flatten the layers into one RGB888 frame. Returns the framebuffer
+    # itself when there is only one RGB888 layer.
+    def composite(self) -> bytearray:
+        size = self.frameSize
+        if self.pen_type == PEN_P8:
+            colors = [
+                bytes((b, g, r, 0)) for (r, g, b) in self.palette]
+            frame = bytearray(b"".join([colors[i] for i in self.buffer[0:size]]))
+            for layer in range(1, self.layers):
+                src = self.buffer[layer * size:(layer + 1) * size]
+                for i in range(size):
+                    if src[i]:
+                        frame[i * 4:i * 4 + 4] = colors[src[i]]
+            return frame
+        if self.layers == 1:
+            return self.buffer
+        frame = bytearray(self.buffer[0:size])
+        for layer in range(1, self.layers):
+            src = self.buffer[layer * size:(layer + 1) * size]
+            for i in range(0, size, 4):
+                if src[i] or src[i + 1] or src[i + 2]:
+                    frame[i:i + 4] = src[i:i + 4]
+        return frame
+
+    def update(self):
+        pass
+
+# ------------------------------------------------------------------------
+def _words(text: str) -> list:
+    words = []
+    current = ""
+    for c in text:
+        if c == "\n":
+            if current:
+                words.append(current)
+            words.append("\n")
+            current = ""
+        elif c == " " and current and current[-1] != " ":
+            words.append(current)
+            current = " "
+        else:
+            current += c
+    if current:
+        words.append(current)
+    return words
+
+def hsv_to_rgb(h: float, s: float, v: float) -> tuple:
+    h = h % 1.0
+    i = int(h * 6.0)
+    f = h * 6.0 - i
+    p = v * (1.0 - s)
+    q = v * (1.0 - s * f)
+    t = v * (1.0 - s * (1.0 - f))
+    (r, g, b) = [
+        (v, t, p), (q, v, p), (p, v, t),
+        (p, q, v), (t, p, v), (v, p, q)][i % 6]
+    return (int(r * 255), int(g * 255), int(b * 255))
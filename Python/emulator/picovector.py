@@ -0,0 +1,124 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Description:
+# Desktop stand-in for Pimoroni's picovector module. Polygons are filled
+# with the emulated PicoGraphics scanline filler and there is no
+# antialiasing. Vector text falls back to the bitmap font scaled to
+# roughly the requested size.
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import math
+
+ANTIALIAS_NONE = 0
+ANTIALIAS_X4 = 1
+ANTIALIAS_X16 = 2
+ANTIALIAS_FAST = ANTIALIAS_X4
+ANTIALIAS_BEST = ANTIALIAS_X16
+
+# ------------------------------------------------------------------------
+# 2D affine transform stored as the 2x3 matrix [a c e; b d f]
+class Transform:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.m = [1.0, 0.0, 0.0, 1.0, 0.0, 0.0]
+
+    def _multiply(self, a, b, c, d, e, f):
+        (ma, mb, mc, md, me, mf) = self.m
+        self.m = [
+            ma * a + mc * b, mb * a + md * b,
+            ma * c + mc * d, mb * c + md * d,
+            ma * e + mc * f + me, mb * e + md * f + mf]
+
+    def translate(self, x: float, y: float):
+        self._multiply(1.0, 0.0, 0.0, 1.0, x, y)
+
+    def scale(self, x: float, y: float = None):
+        self._multiply(x, 0.0, 0.0, x if y is None else y, 0.0, 0.0)
+
+    def rotate(self, angle: float, origin: tuple = (0, 0)):
+        r = math.radians(angle)
+        c = math.cos(r)
+        s = math.sin(r)
+        (ox, oy) = origin
+        self.translate(ox, oy)
+        self._multiply(c, s, -s, c, 0.0, 0.0)
+        self.translate(-ox, -oy)
+
+    def apply(self, x: float, y: float) -> tuple:
+        (a, b, c, d, e, f) = self.m
+        return (a * x + c * y + e, b * x + d * y + f)
+
+# ------------------------------------------------------------------------
+class Polygon:
+    def __init__(self):
+        self.paths = []
+
+    def path(self, *points):
+        self.paths.append(list(points))
+        return self
+
+    def rectangle(self, x: float, y: float, w: float, h: float, corners=(0, 0, 0, 0), stroke=0):
+        self.paths.append([(x, y), (x + w, y), (x + w, y + h), (x, y + h)])
+        return self
+
+    def regular(self, x: float, y: float, radius: float, sides: int, stroke=0):
+        step = math.pi * 2.0 / sides
+        self.paths.append([
+            (x + math.cos(i * step) * radius, y + math.sin(i * step) * radius)
+            for i in range(sides)])
+        return self
+
+    def circle(self, x: float, y: float, radius: float, stroke=0):
+        return self.regular(x, y, radius, 32, stroke)
+
+# ------------------------------------------------------------------------
+class PicoVector:
+    def __init__(self, display):
+        self.display = display
+        self.antialiasing = ANTIALIAS_NONE
+        self.transform = None
+        self.fontSize = 16
+        self.letterSpacing = 100
+        self.wordSpacing = 100
+
+    def set_antialiasing(self, aa: int):
+        self.antialiasing = aa
+
+    def set_transform(self, transform: Transform):
+        self.transform = transform
+
+    def set_font(self, font: str, size: int = None):
+        if size is not None:
+            self.fontSize = size
+
+    def set_font_size(self, size: int):
+        self.fontSize = size
+
+    def set_font_letter_spacing(self, spacing: int):
+        self.letterSpacing = spacing
+
+    def set_font_word_spacing(self, spacing: int):
+        self.wordSpacing = spacing
+
+    def draw(self, polygon: Polygon):
+        t = self.transform
+        for path in polygon.paths:
+            if t:
+                path = [t.apply(x, y) for (x, y) in path]
+            self.display.polygon(path)
+
+    # y is the baseline, as with Alright Fonts
+    def text(self, text: str, x: int, y: int, angle: float = None, max_width: int = 0, max_height: int = 0):
+        scale = self._scale()
+        if self.transform:
+            (x, y) = self.transform.apply(x, y)
+        self.display.text(text, int(x), int(y) - 7 * scale, scale=scale)
+
+    # (x, y, w, h) of the text drawn at x, y, ignoring the transform
+    def measure_text(self, text: str, x: float = 0, y: float = 0, angle: float = None) -> tuple:
+        scale = self._scale()
+        return (x, y - 7 * scale, len(text) * 6 * scale, 8 * scale)
+
+    def _scale(self) -> int:
+        return max(1, round(self.fontSize / 8))
@@ -0,0 +1,11 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Description:
+# ulab.numpy on top of NumPy. ulab's ndarray() builds an array from an
+# iterable, which in NumPy is array().
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from numpy import *
+import numpy as _numpy
+
+def ndarray(iterable, dtype=float):
+    return _numpy.array(iterable, dtype=dtype)
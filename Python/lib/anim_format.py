@@ -0,0 +1,132 @@
+import sys
+
+# Define a global flag
+IS_MICROPYTHON = sys.implementation.name == 'micropython'
+
+if IS_MICROPYTHON:
+    import ustruct as struct
+    numpy = None
+else:
+    import struct
+    # NumPy is only needed to write animations
+    try:
+        import numpy
+    except ImportError:
+        numpy = None
+
+from frame_codec import FRAME_DELTA, encodeFrame
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Description:
+# A compact container for prerecorded animations (.i7a), written on the
+# desktop by desktop/record_animation.py and played on the board by
+# lib/anim_player.py.
+#
+#   header      HEADER_FORMAT, see below
+#   palette     paletteSize x (r, g, b) bytes
+#   frames      the frame payloads, back to back
+#   index       frameCount x INDEX_FORMAT (offset, length, frameType)
+#
+# Frames are palette indices, one byte per pixel, so a 128x128 frame is
+# 16kB before compression instead of 64kB. Each is stored as whichever of
+# FRAME_FULL, FRAME_RLE and FRAME_DELTA (XOR against the previous frame)
+# is smallest, see frame_codec.py. Every keyframeEvery frames a frame that
+# decodes on its own is forced, so seeking only has to decode forward from
+# the keyframe before the target.
+#
+# Frames with more than 256 colors keep the 256 most used ones and map
+# the rest to the nearest of those.
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+MAGIC = b"I7AN"
+VERSION = 1
+
+# magic, version, bpp, width, height, frameCount, frameMs, paletteSize, indexOffset
+HEADER_FORMAT = "<4sBBHHIHHI"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+# offset, length, frameType
+INDEX_FORMAT = "<IIB"
+INDEX_SIZE = struct.calcsize(INDEX_FORMAT)
+
+MAX_COLORS = 256
+
+def isKeyframe(frameType: int) -> bool:
+    return frameType != FRAME_DELTA
+
+# Returns (width, height, frameCount, frameMs, paletteSize, indexOffset)
+def readHeader(f) -> tuple:
+    (magic, version, bpp, width, height, frameCount, frameMs, paletteSize, indexOffset) = struct.unpack(HEADER_FORMAT, f.read(HEADER_SIZE))
+    if magic != MAGIC or version != VERSION or bpp != 1:
+        raise ValueError("not an animation")
+    return (width, height, frameCount, frameMs, paletteSize, indexOffset)
+
+# ------------------------------------------------------------------------
+# Desktop side. Collects RGB888 frames (the framebuffer layout, 0x00RRGGBB
+# per pixel) and writes the file on close().
+class AnimationWriter:
+    def __init__(self, path: str, width: int, height: int, frameMs: int, keyframeEvery: int = 60):
+        if numpy is None:
+            raise ImportError("AnimationWriter needs NumPy")
+        self.path = path
+        self.width = width
+        self.height = height
+        self.frameMs = frameMs
+        self.keyframeEvery = keyframeEvery
+        self.frames = []
+        # Filled in by close()
+        self.palette = None
+        self.types = [0, 0, 0]
+        self.size = 0
+
+    def add(self, frame):
+        pixels = numpy.frombuffer(bytes(frame), dtype=numpy.uint32) & 0xffffff
+        self.frames.append(pixels)
+
+    # Palette, as 0xRRGGBB values, and the palette index of every color
+    # in colors.
+    def _quantize(self, colors, counts) -> tuple:
+        if len(colors) <= MAX_COLORS:
+            return (colors, numpy.arange(len(colors)))
+        palette = colors[numpy.argsort(counts)[::-1][:MAX_COLORS]]
+        rgb = numpy.stack(((palette >> 16) & 0xff, (palette >> 8) & 0xff, palette & 0xff), axis=1).astype(numpy.int32)
+        nearest = numpy.empty(len(colors), dtype=numpy.int64)
+        for start in range(0, len(colors), 4096):
+            chunk = colors[start:start + 4096]
+            c = numpy.stack(((chunk >> 16) & 0xff, (chunk >> 8) & 0xff, chunk & 0xff), axis=1).astype(numpy.int32)
+            distance = ((c[:, None, :] - rgb[None, :, :]) ** 2).sum(axis=2)
+            nearest[start:start + 4096] = numpy.argmin(distance, axis=1)
+        return (palette, nearest)
+
+    def close(self):
+        every = numpy.concatenate(self.frames)
+        (colors, inverse, counts) = numpy.unique(every, return_inverse=True, return_counts=True)
+        (palette, nearest) = self._quantize(colors, counts)
+        indices = nearest[inverse].astype(numpy.uint8)
+        self.palette = palette
+
+        frameSize = self.width * self.height
+        index = []
+        with open(self.path, "wb") as f:
+            f.write(bytes(HEADER_SIZE))
+            for color in palette.tolist():
+                f.write(bytes(((color >> 16) & 0xff, (color >> 8) & 0xff, color & 0xff)))
+            previous = None
+            for i in range(len(self.frames)):
+                frame = indices[i * frameSize:(i + 1) * frameSize].tobytes()
+                if i % self.keyframeEvery == 0:
+                    previous = None
+                (frameType, payload) = encodeFrame(frame, previous, 1)
+                index.append((f.tell(), len(payload), frameType))
+                self.types[frameType] += 1
+                f.write(payload)
+                previous = frame
+            indexOffset = f.tell()
+            for entry in index:
+                f.write(struct.pack(INDEX_FORMAT, *entry))
+            self.size = f.tell()
+            f.seek(0)
+            f.write(struct.pack(
+                HEADER_FORMAT, MAGIC, VERSION, 1, self.width, self.height,
+                len(self.frames), self.frameMs, len(palette), indexOffset))
+        self.frames = []
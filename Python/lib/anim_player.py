@@ -0,0 +1,110 @@
+import sys
+
+# Define a global flag
+IS_MICROPYTHON = sys.implementation.name == 'micropython'
+
+if IS_MICROPYTHON:
+    import ustruct as struct
+else:
+    import struct
+
+from array import array
+
+from anim_format import readHeader, isKeyframe, HEADER_SIZE, INDEX_FORMAT, INDEX_SIZE
+from frame_codec import decodeFrame
+from framebuffer import framebufferOf, bytesPerPixel
+from palette_blit import PaletteBlitter
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Description:
+# Plays an animation file (see anim_format.py) from flash one frame at a
+# time, so playback costs the same however heavy the recorded effect was.
+#
+#   player = AnimationPlayer("fire.i7a", graphics)
+#   while True:
+#       player.next()              # decode the next frame, loops at the end
+#       i75.update(graphics)
+#       sleep player.frameMs
+#
+# RAM use is fixed when the file is opened: the index (9 bytes a frame)
+# and one buffer for the largest frame payload in the file. On a PEN_P8
+# display of the animation's size the palette is loaded and frames are
+# decoded straight into the framebuffer, which then has to be left alone
+# between frames because deltas apply on top of it. Anything else gets a
+# buffer of palette indices that is drawn with a PaletteBlitter.
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# ------------------------------------------------------------------------
+class AnimationPlayer:
+    def __init__(self, path: str, display, offsetX: int = 0, offsetY: int = 0):
+        self.file = open(path, "rb")
+        (self.width, self.height, self.frameCount, self.frameMs, paletteSize, indexOffset) = readHeader(self.file)
+
+        self.file.seek(HEADER_SIZE)
+        data = self.file.read(paletteSize * 3)
+        self.palette = [(data[i], data[i + 1], data[i + 2]) for i in range(0, len(data), 3)]
+
+        self.offsets = array('I', bytes(4 * self.frameCount))
+        self.lengths = array('I', bytes(4 * self.frameCount))
+        self.types = bytearray(self.frameCount)
+        self.file.seek(indexOffset)
+        entry = bytearray(INDEX_SIZE)
+        largest = 0
+        for i in range(self.frameCount):
+            self.file.readinto(entry)
+            (self.offsets[i], self.lengths[i], self.types[i]) = struct.unpack(INDEX_FORMAT, entry)
+            largest = max(largest, self.lengths[i])
+        self.payload = bytearray(largest)
+        self.payloadView = memoryview(self.payload)
+
+        (screenWidth, screenHeight) = display.get_bounds()
+        try:
+            direct = bytesPerPixel(display) == 1
+        except (TypeError, AttributeError):
+            direct = False
+        direct = direct and (screenWidth, screenHeight) == (self.width, self.height)
+        if direct:
+            display.set_palette(self.palette)
+            self.indices = framebufferOf(display)
+            self.blitter = None
+        else:
+            self.indices = bytearray(self.width * self.height)
+            self.blitter = PaletteBlitter(display, self.palette, self.width, self.height, 1, offsetX, offsetY)
+        # RAM held for playback, not counting the framebuffer
+        self.ramBytes = len(self.payload) + 9 * self.frameCount + (0 if direct else len(self.indices))
+        # The frame in indices, -1 before the first
+        self.current = -1
+
+    def close(self):
+        self.file.close()
+
+    def _decode(self, frame: int):
+        length = self.lengths[frame]
+        self.file.seek(self.offsets[frame])
+        self.file.readinto(self.payloadView[0:length])
+        decodeFrame(self.types[frame], self.payloadView, length, self.indices, 1)
+        self.current = frame
+
+    def _show(self):
+        if self.blitter:
+            self.blitter.blit(self.indices)
+
+    # Decode frame, starting from the keyframe before it if it doesn't
+    # follow the current one.
+    def seek(self, frame: int):
+        frame %= self.frameCount
+        if frame != self.current + 1:
+            start = frame
+            while not isKeyframe(self.types[start]):
+                start -= 1
+            if self.current < start or self.current > frame:
+                self._decode(start)
+        while self.current < frame:
+            self._decode(self.current + 1)
+        self._show()
+
+    # Decode the next frame, going back to the first after the last.
+    # Returns the frame number.
+    def next(self) -> int:
+        self.seek(self.current + 1)
+        return self.current
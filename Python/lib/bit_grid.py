@@ -0,0 +1,107 @@
+import sys
+
+# Define a global flag
+IS_MICROPYTHON = sys.implementation.name == 'micropython'
+
+if IS_MICROPYTHON:
+    import micropython
+    native = micropython.native
+else:
+    def native(f):
+        return f
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Description:
+# An on/off grid packed eight cells to a byte, which also remembers which
+# cells changed since it was last drawn. A 32x32 grid is 128 bytes plus
+# another 128 for the changed bits, instead of 32 lists of 32 ints.
+#
+#   grid = BitGrid(32, 32)
+#   grid.set(x, y, 1)
+#   grid.draw(display, ORANGE, BLACK, 4)   # only the changed cells
+#
+# draw() walks the rows that have changes and merges each run of
+# neighbouring changed cells with the same value into one rectangle. The
+# first draw() (and the one after invalidate()) redraws every cell, which
+# then becomes one rectangle per run of equal cells.
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# ------------------------------------------------------------------------
+class BitGrid:
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.stride = (width + 7) >> 3
+        self.cells = bytearray(self.stride * height)
+        self.changed = bytearray(self.stride * height)
+        # 1 for each row with at least one changed cell
+        self.dirtyRows = bytearray(height)
+        self.invalidate()
+
+    def get(self, x: int, y: int) -> int:
+        return (self.cells[y * self.stride + (x >> 3)] >> (x & 7)) & 1
+
+    @native
+    def set(self, x: int, y: int, value: int):
+        i = y * self.stride + (x >> 3)
+        bit = 1 << (x & 7)
+        old = self.cells[i]
+        new = (old | bit) if value else (old & ~bit)
+        if new != old:
+            self.cells[i] = new
+            self.changed[i] |= bit
+            self.dirtyRows[y] = 1
+
+    def clear(self):
+        for i in range(len(self.cells)):
+            self.cells[i] = 0
+        self.invalidate()
+
+    # Mark every cell as changed so the next draw() repaints everything.
+    def invalidate(self):
+        for i in range(len(self.changed)):
+            self.changed[i] = 0xff
+        for y in range(self.height):
+            self.dirtyRows[y] = 1
+
+    # Draw the changed cells as scale x scale squares and forget the
+    # changes. Returns the number of rectangles drawn.
+    @native
+    def draw(self, display, onPen, offPen, scale: int, offsetX: int = 0, offsetY: int = 0) -> int:
+        cells = self.cells
+        changed = self.changed
+        stride = self.stride
+        w = self.width
+        count = 0
+        for y in range(self.height):
+            if not self.dirtyRows[y]:
+                continue
+            self.dirtyRows[y] = 0
+            base = y * stride
+            py = y * scale + offsetY
+            x = 0
+            while x < w:
+                i = base + (x >> 3)
+                if changed[i] == 0:
+                    # Skip a whole byte of unchanged cells
+                    x = (x | 7) + 1
+                    continue
+                bit = 1 << (x & 7)
+                if not (changed[i] & bit):
+                    x += 1
+                    continue
+                value = cells[i] & bit
+                end = x + 1
+                while end < w:
+                    j = base + (end >> 3)
+                    b = 1 << (end & 7)
+                    if not (changed[j] & b) or bool(cells[j] & b) != bool(value):
+                        break
+                    end += 1
+                display.set_pen(onPen if value else offPen)
+                display.rectangle(x * scale + offsetX, py, (end - x) * scale, scale)
+                count += 1
+                x = end
+            for i in range(base, base + stride):
+                changed[i] = 0
+        return count
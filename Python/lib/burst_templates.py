@@ -0,0 +1,102 @@
+import random
+import math
+
+from particle_pool import ParticlePool, floatArray, penArray, numpy, native
+from trig_table import trig
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Description:
+# Explosions computed ahead of time. At startup count random bursts are
+# generated, each with a velocity (direction times speed), lifespan and
+# color per particle, all stored back to back in flat arrays. Triggering a
+# ParticlePool then copies one of them, rotated by a random angle, instead
+# of drawing three random numbers and a sin/cos pair per particle.
+#
+#   bursts = BurstTemplates(8, 20, MAX_PARTICLE_SPEED, MAX_PARTICLE_LIFETIME, COLORS)
+#   pool = ParticlePool(20)
+#   bursts.trigger(pool, x, y)
+#
+# With 8 templates and a random rotation repeats are hard to spot. The
+# pool's dirX/dirY hold the whole velocity and magnitude is set to 1.
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# ------------------------------------------------------------------------
+class BurstTemplates:
+    def __init__(self, count: int, particles: int, maxSpeed: float, maxLifespan: float, colors=None):
+        self.count = count
+        self.particles = particles
+        size = count * particles
+        self.velX = floatArray(size)
+        self.velY = floatArray(size)
+        self.lifespan = floatArray(size)
+        self.color = penArray(size)
+
+        # Same distributions as ParticlePool.trigger360()
+        uniform = random.uniform
+        twoPi = math.pi * 2.0
+        for i in range(size):
+            angle = uniform(0.0, 1.0) * twoPi
+            speed = 0.05 + uniform(0.0, maxSpeed)
+            self.velX[i] = math.cos(angle) * speed
+            self.velY[i] = math.sin(angle) * speed
+            self.lifespan[i] = uniform(0.1, maxLifespan) * 1000.0
+            if colors:
+                self.color[i] = colors[random.randint(0, len(colors) - 1)]
+
+    # Explode every slot of pool (up to the template size) out from
+    # (x, y) using a random template and rotation.
+    def trigger(self, pool: ParticlePool, x: float, y: float):
+        start = random.randint(0, self.count - 1) * self.particles
+        n = min(pool.capacity, self.particles)
+        rotation = trig.randomIndex()
+        c = trig.cosIndex(rotation)
+        s = trig.sinIndex(rotation)
+        if numpy:
+            end = start + n
+            vx = self.velX[start:end]
+            vy = self.velY[start:end]
+            pool.posX[:n] = x
+            pool.posY[:n] = y
+            pool.dirX[:n] = vx * c - vy * s
+            pool.dirY[:n] = vx * s + vy * c
+            pool.magnitude[:n] = 1.0
+            pool.elapsed[:n] = 0.0
+            pool.lifespan[:n] = self.lifespan[start:end]
+            pool.color[:n] = self.color[start:end]
+            pool.alive[:n] = True
+            pool.activeCount = int(numpy.count_nonzero(pool.alive))
+        else:
+            self._copyLoop(pool, x, y, start, n, c, s)
+
+    @native
+    def _copyLoop(self, pool, x: float, y: float, start: int, n: int, c: float, s: float):
+        velX = self.velX
+        velY = self.velY
+        lifespan = self.lifespan
+        color = self.color
+        posX = pool.posX
+        posY = pool.posY
+        dirX = pool.dirX
+        dirY = pool.dirY
+        magnitude = pool.magnitude
+        elapsed = pool.elapsed
+        poolLifespan = pool.lifespan
+        poolColor = pool.color
+        alive = pool.alive
+        count = pool.activeCount
+        for i in range(n):
+            j = start + i
+            vx = velX[j]
+            vy = velY[j]
+            posX[i] = x
+            posY[i] = y
+            dirX[i] = vx * c - vy * s
+            dirY[i] = vx * s + vy * c
+            magnitude[i] = 1.0
+            elapsed[i] = 0.0
+            poolLifespan[i] = lifespan[j]
+            poolColor[i] = color[j]
+            if not alive[i]:
+                alive[i] = 1
+                count += 1
+        pool.activeCount = count
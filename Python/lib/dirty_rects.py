@@ -0,0 +1,137 @@
+from array import array
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Description:
+# Wraps a PicoGraphics display and remembers the bounding box of every
+# drawing call. Instead of clear() at the start of a frame, call
+# beginFrame(): it erases only what was drawn during the previous frame.
+#
+#   screen = DirtyRectDisplay(display, BLACK)
+#   while True:
+#       screen.beginFrame()
+#       screen.set_pen(ORANGE)
+#       screen.pixel(x, y)
+#       i75.update()
+#
+# When a frame draws more than maxRects shapes (or calls clear()) the next
+# beginFrame() falls back to a full clear, which is cheaper than erasing
+# lots of small rectangles from Python.
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# Tallest bitmap font (bitmap14_outline), used to bound text
+TEXT_LINE_HEIGHT = 14
+
+# ------------------------------------------------------------------------
+class DirtyRectDisplay:
+    def __init__(self, display, background, maxRects: int = 64):
+        self.display = display
+        self.background = background
+        self.maxRects = maxRects
+        self.width, self.height = display.get_bounds()
+        # x, y, w, h per rect
+        self.rects = array('h', bytes(2 * 4 * maxRects))
+        self.rectCount = 0
+        # The first frame has to clear whatever is on the screen.
+        self.fullRedraw = True
+        self.pen = background
+
+    # Anything we don't track is passed straight to the display.
+    def __getattr__(self, name):
+        return getattr(self.display, name)
+
+    def _mark(self, x: int, y: int, w: int, h: int):
+        if self.fullRedraw:
+            return
+        # Clip to the screen, dropping rects that are entirely off it.
+        if x < 0:
+            w += x
+            x = 0
+        if y < 0:
+            h += y
+            y = 0
+        if x + w > self.width:
+            w = self.width - x
+        if y + h > self.height:
+            h = self.height - y
+        if w <= 0 or h <= 0:
+            return
+        if self.rectCount == self.maxRects:
+            self.fullRedraw = True
+            return
+        i = self.rectCount * 4
+        rects = self.rects
+        rects[i] = x
+        rects[i + 1] = y
+        rects[i + 2] = w
+        rects[i + 3] = h
+        self.rectCount += 1
+
+    # Erase everything drawn since the previous beginFrame().
+    def beginFrame(self):
+        d = self.display
+        d.set_pen(self.background)
+        if self.fullRedraw:
+            d.clear()
+        else:
+            rects = self.rects
+            for i in range(0, self.rectCount * 4, 4):
+                w = rects[i + 2]
+                h = rects[i + 3]
+                if w == 1 and h == 1:
+                    d.pixel(rects[i], rects[i + 1])
+                else:
+                    d.rectangle(rects[i], rects[i + 1], w, h)
+        d.set_pen(self.pen)
+        self.rectCount = 0
+        self.fullRedraw = False
+
+    def set_pen(self, pen):
+        self.pen = pen
+        self.display.set_pen(pen)
+
+    def clear(self):
+        self.display.clear()
+        self.fullRedraw = True
+
+    def pixel(self, x: int, y: int):
+        self.display.pixel(x, y)
+        self._mark(int(x), int(y), 1, 1)
+
+    def pixel_span(self, x: int, y: int, length: int):
+        self.display.pixel_span(x, y, length)
+        self._mark(int(x), int(y), int(length), 1)
+
+    def rectangle(self, x: int, y: int, w: int, h: int):
+        self.display.rectangle(x, y, w, h)
+        self._mark(int(x), int(y), int(w), int(h))
+
+    def circle(self, x: int, y: int, r: int):
+        self.display.circle(x, y, r)
+        r = int(r)
+        self._mark(int(x) - r, int(y) - r, 2 * r + 1, 2 * r + 1)
+
+    def line(self, x1: int, y1: int, x2: int, y2: int, thickness: int = 1):
+        self.display.line(x1, y1, x2, y2, thickness)
+        pad = int(thickness) // 2 + 1
+        x0 = int(min(x1, x2)) - pad
+        y0 = int(min(y1, y2)) - pad
+        self._mark(x0, y0, int(abs(x2 - x1)) + 2 * pad + 1, int(abs(y2 - y1)) + 2 * pad + 1)
+
+    def triangle(self, x1: int, y1: int, x2: int, y2: int, x3: int, y3: int):
+        self.display.triangle(x1, y1, x2, y2, x3, y3)
+        x0 = int(min(x1, x2, x3))
+        y0 = int(min(y1, y2, y3))
+        self._mark(x0, y0, int(max(x1, x2, x3)) - x0 + 1, int(max(y1, y2, y3)) - y0 + 1)
+
+    def text(self, text: str, x: int, y: int, wordwrap: int = None, scale: int = 2, *args, **kwargs):
+        if wordwrap is None:
+            wordwrap = self.width
+        self.display.text(text, x, y, wordwrap, scale, *args, **kwargs)
+        # Without the font metrics assume the tallest font and let a wrapped
+        # line run as wide as the wrap.
+        lines = text.count("\n") + 1
+        width = self.display.measure_text(text, scale)
+        if width > wordwrap:
+            lines += width // wordwrap + 1
+            width = wordwrap
+        self._mark(int(x), int(y), width, lines * TEXT_LINE_HEIGHT * int(scale))
@@ -0,0 +1,201 @@
+import sys
+
+# Define a global flag
+IS_MICROPYTHON = sys.implementation.name == 'micropython'
+
+import random
+from array import array
+
+if IS_MICROPYTHON:
+    import micropython
+    numpy = None
+    native = micropython.native
+else:
+    # NumPy is optional on desktop, see particle_pool.py
+    try:
+        import numpy
+    except ImportError:
+        numpy = None
+
+    def native(f):
+        return f
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Description:
+# Pixels that fall straight down, bounce with friction and pile up. Every
+# attribute is a flat array with one slot per pixel and update() moves all
+# of them in one pass.
+#
+#   column          x, never changes
+#   posY            current y
+#   velocity        pixels per update, positive is down
+#   energy          grows with every bounce; bounces get weaker
+#   bounce          upward kick of the first bounce, picked once in add()
+#   falling         1 until the pixel comes to rest on the pile
+#
+# heights[x] is how many pixels rest in column x. A falling pixel bounces
+# off the top of its column's pile, and once its energy passes
+# SETTLE_ENERGY it joins the pile, raising the floor for the pixels above.
+# A settled pixel always sits on the pile top, floor(x), so the pixels
+# resting in a column fill it from the bottom up, one per row, heights[x]
+# of them. A pixel added below the pile top is lifted onto it, and one
+# still falling when a faster pixel overtakes it and settles is bounced off
+# the new pile top, so no pixel is ever inside the pile.
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+GRAVITY = 0.003
+MAX_VELOCITY = 1.0
+# Energy added per bounce
+ENERGY_LOSS = 0.05
+# Energy at which a bouncing pixel stops and joins the pile
+SETTLE_ENERGY = 2.0
+
+def floatArray(size: int):
+    if numpy:
+        return numpy.zeros(size, dtype=numpy.float32)
+    return array('f', bytes(4 * size))
+
+def intArray(size: int):
+    if numpy:
+        return numpy.zeros(size, dtype=numpy.int16)
+    return array('h', bytes(2 * size))
+
+def flagArray(size: int):
+    if numpy:
+        return numpy.zeros(size, dtype=numpy.bool_)
+    return bytearray(size)
+
+# ------------------------------------------------------------------------
+class FallingPile:
+    def __init__(self, capacity: int, width: int, height: int):
+        self.capacity = capacity
+        self.width = width
+        self.height = height
+        self.column = intArray(capacity)
+        self.posY = floatArray(capacity)
+        self.velocity = floatArray(capacity)
+        self.energy = floatArray(capacity)
+        self.bounce = floatArray(capacity)
+        self.falling = flagArray(capacity)
+        self.heights = intArray(width)
+        self.count = 0
+        self.fallingCount = 0
+
+    def reset(self):
+        for x in range(self.width):
+            self.heights[x] = 0
+        self.count = 0
+        self.fallingCount = 0
+
+    # Add a pixel at x,y moving down at velocity. Returns False when full.
+    def add(self, x: int, y: float, velocity: float) -> bool:
+        i = self.count
+        if i == self.capacity:
+            return False
+        self.column[i] = x
+        # Not inside the pile
+        self.posY[i] = min(y, self.floor(x))
+        self.velocity[i] = velocity
+        self.energy[i] = 1.0
+        self.bounce[i] = random.uniform(0.0, 0.4)
+        self.falling[i] = 1
+        self.count += 1
+        self.fallingCount += 1
+        return True
+
+    # y of the top of the pile in column x, where the next pixel rests
+    def floor(self, x: int) -> int:
+        return self.height - 1 - self.heights[x]
+
+    # Advance one update. Returns the number of pixels still falling.
+    def update(self, gravity: float = GRAVITY) -> int:
+        if self.fallingCount == 0:
+            return 0
+        if numpy:
+            self._updateVectorized(gravity)
+        else:
+            self._updateLoop(gravity)
+        return self.fallingCount
+
+    def _updateVectorized(self, gravity: float):
+        n = self.count
+        falling = self.falling[:n]
+        y = self.posY[:n]
+        v = self.velocity[:n]
+        e = self.energy[:n]
+
+        # Gravity, speed clamp and move, for every falling pixel at once
+        v += gravity * falling
+        numpy.minimum(v, MAX_VELOCITY, out=v)
+        y += v * falling
+
+        # Bounce off the top of the pile below
+        floorY = (self.height - 1) - self.heights[self.column[:n]]
+        hit = falling & (y > floorY)
+        y[hit] = floorY[hit]
+        v[hit] = -self.bounce[:n][hit] / e[hit]
+        e[hit] += ENERGY_LOSS
+
+        # Only a few settle per update; do them one by one because two in
+        # the same column stack on top of each other.
+        for i in numpy.nonzero(hit & (e > SETTLE_ENERGY))[0]:
+            self._settle(int(i))
+
+    @native
+    def _updateLoop(self, gravity: float):
+        column = self.column
+        posY = self.posY
+        velocity = self.velocity
+        energy = self.energy
+        falling = self.falling
+        heights = self.heights
+        bottom = self.height - 1
+        for i in range(self.count):
+            if not falling[i]:
+                continue
+            v = velocity[i] + gravity
+            if v > MAX_VELOCITY:
+                v = MAX_VELOCITY
+            y = posY[i] + v
+            floorY = bottom - heights[column[i]]
+            if y > floorY:
+                y = floorY
+                v = -self.bounce[i] / energy[i]
+                energy[i] += ENERGY_LOSS
+                if energy[i] > SETTLE_ENERGY:
+                    posY[i] = y
+                    self._settle(i)
+                    continue
+            posY[i] = y
+            velocity[i] = v
+
+    # Pixel i comes to rest on top of its column's pile.
+    def _settle(self, i: int):
+        x = self.column[i]
+        self.posY[i] = max(0, self.floor(x))
+        self.velocity[i] = 0.0
+        self.falling[i] = 0
+        if self.heights[x] < self.height:
+            self.heights[x] += 1
+        self.fallingCount -= 1
+
+    # True if the resting pixels of every column x are one per row from
+    # the bottom up to heights[x], which is what draw() shows.
+    def isConsistent(self) -> bool:
+        rows = [[] for x in range(self.width)]
+        for i in range(self.count):
+            if not self.falling[i]:
+                rows[int(self.column[i])].append(int(self.posY[i]))
+        for x in range(self.width):
+            rows[x].sort()
+            if rows[x] != list(range(self.height - int(self.heights[x]), self.height)):
+                return False
+        return True
+
+    def draw(self, display, pen=None):
+        if pen is not None:
+            display.set_pen(pen)
+        column = self.column
+        posY = self.posY
+        for i in range(self.count):
+            display.pixel(int(column[i]), int(posY[i]))
@@ -0,0 +1,83 @@
+import sys
+
+# Define a global flag
+IS_MICROPYTHON = sys.implementation.name == 'micropython'
+
+import random
+
+try:
+    from ulab import numpy
+except ImportError:
+    import numpy
+
+if IS_MICROPYTHON:
+    import micropython
+    native = micropython.native
+else:
+    def native(f):
+        return f
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Description:
+# The classic fire effect from glorious_fire.py without the per-frame
+# allocations. Each cell becomes the damped average of itself and the four
+# cells below it:
+#
+#     new[y][x] = (heat[y][x] + heat[y+1][x] + heat[y+2][x]
+#                  + heat[y+1][x-1] + heat[y+1][x+1]) * damping / 5
+#
+# The five taps are summed with in-place slice arithmetic on views instead
+# of numpy.roll() copies, and heat/new swap references every frame instead
+# of copying new back into heat. Unlike roll() the stencil doesn't wrap
+# around the left and right edges.
+#
+# The two rows below the visible area are where fire is spawned.
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class FireEngine:
+    def __init__(self, width: int, height: int, spawns: int, heat: float = 3.0, damping: float = 0.98):
+        self.width = width
+        self.height = height
+        self.spawns = spawns
+        self.spawnHeat = heat
+        self.damping = damping
+        rows = height + 2
+        self.heat = numpy.zeros((rows, width))
+        self.new = numpy.zeros((rows, width))
+
+    # The rows that are on screen
+    def visible(self):
+        return self.heat[0:self.height]
+
+    @native
+    def update(self):
+        heat = self.heat
+        w = self.width
+        h = self.height
+        bottom = h + 1
+
+        # Clear the bottom two rows (off screen)
+        heat[bottom][:] = 0.0
+        heat[h][:] = 0.0
+
+        # Add random fire spawns
+        hot = self.spawnHeat
+        for c in range(self.spawns):
+            x = random.randint(0, w - 4) + 2
+            heat[bottom][x - 1:x + 1] = hot / 2.0
+            heat[h][x - 1:x + 1] = hot
+
+        # Propagate the fire upwards into the visible rows of new
+        out = self.new[0:h]
+        out[:] = heat[0:h]                          # y, x
+        out += heat[1:h + 1]                        # y + 1, x
+        out += heat[2:h + 2]                        # y + 2, x
+        out[:, 1:w] += heat[1:h + 1, 0:w - 1]       # y + 1, x - 1
+        out[:, 0:w - 1] += heat[1:h + 1, 1:w]       # y + 1, x + 1
+
+        # Average over 5 adjacent pixels and apply damping
+        out *= self.damping / 5.0
+
+        # new becomes the current heat map; the old one is reused next frame
+        self.heat = self.new
+        self.new = heat
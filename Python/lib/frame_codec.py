@@ -0,0 +1,197 @@
+import sys
+
+# Define a global flag
+IS_MICROPYTHON = sys.implementation.name == 'micropython'
+
+if IS_MICROPYTHON:
+    import micropython
+    numpy = None
+    native = micropython.native
+else:
+    # NumPy is optional, it only speeds up encoding.
+    try:
+        import numpy
+    except ImportError:
+        numpy = None
+
+    def native(f):
+        return f
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Description:
+# Run-length coding of framebuffers, shared by the network stream
+# (frame_stream.py) and the animation files (anim_format.py).
+#
+# The encoding is PackBits style over whole pixels of bpp bytes (1 for
+# PEN_P8, 4 for PEN_RGB888), one control byte per packet:
+#   0..127     copy the next control+1 pixels
+#   128..255   repeat the next pixel control-125 times (3..130)
+#
+# Frames are sent or stored in one of three forms:
+#   FRAME_FULL     the framebuffer bytes as they are
+#   FRAME_RLE      the framebuffer bytes run-length coded
+#   FRAME_DELTA    the framebuffer XOR the previous frame, run-length coded
+#
+# A delta is mostly zero runs where nothing changed. Decoding XORs it onto
+# the previous frame in place, skipping the zero runs, so unchanged pixels
+# cost nothing to decode.
+#
+# Encoding is meant for the desktop. Decoding runs on the board, straight
+# into the framebuffer.
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+FRAME_FULL = 0
+FRAME_RLE = 1
+FRAME_DELTA = 2
+
+MAX_LITERAL = 128
+MIN_RUN = 3
+MAX_RUN = 130
+
+# ------------------------------------------------------------------------
+# Encoding
+
+# Start and length, in pixels, of every run of equal pixels in data
+def _runs(data, bpp: int) -> list:
+    n = len(data) // bpp
+    if n == 0:
+        return []
+    if numpy and bpp in (1, 2, 4):
+        a = numpy.frombuffer(bytes(data), dtype={1: numpy.uint8, 2: numpy.uint16, 4: numpy.uint32}[bpp])
+        starts = numpy.concatenate(([0], numpy.nonzero(a[1:] != a[:-1])[0] + 1))
+        lengths = numpy.diff(numpy.concatenate((starts, [n])))
+        return list(zip(starts.tolist(), lengths.tolist()))
+    runs = []
+    start = 0
+    value = data[0:bpp]
+    for i in range(1, n):
+        pixel = data[i * bpp:(i + 1) * bpp]
+        if pixel != value:
+            runs.append((start, i - start))
+            start = i
+            value = pixel
+    runs.append((start, n - start))
+    return runs
+
+def rleEncode(data, bpp: int = 1) -> bytes:
+    out = bytearray()
+    # Pixels not covered by a run packet yet start here
+    literalStart = 0
+
+    def flushLiterals(start: int, end: int):
+        while start < end:
+            count = min(MAX_LITERAL, end - start)
+            out.append(count - 1)
+            out.extend(data[start * bpp:(start + count) * bpp])
+            start += count
+
+    for (start, length) in _runs(data, bpp):
+        if length < MIN_RUN:
+            # Too short to be worth a run packet
+            continue
+        flushLiterals(literalStart, start)
+        value = data[start * bpp:(start + 1) * bpp]
+        while length >= MIN_RUN:
+            count = min(MAX_RUN, length)
+            out.append(count + 125)
+            out.extend(value)
+            start += count
+            length -= count
+        # A leftover of 1 or 2 pixels goes out with the next literals
+        literalStart = start
+    flushLiterals(literalStart, len(data) // bpp)
+    return bytes(out)
+
+# a XOR b, for two frames of the same size
+def xorFrames(a, b) -> bytes:
+    n = len(a)
+    return (int.from_bytes(a, 'little') ^ int.from_bytes(b, 'little')).to_bytes(n, 'little')
+
+# Encode frame in whichever form is smallest. previous is the frame the
+# receiver already has, or None for a frame that decodes on its own.
+# Returns (frameType, payload).
+def encodeFrame(frame, previous=None, bpp: int = 1) -> tuple:
+    best = (FRAME_FULL, bytes(frame))
+    packed = rleEncode(frame, bpp)
+    if len(packed) < len(best[1]):
+        best = (FRAME_RLE, packed)
+    if previous is not None:
+        delta = rleEncode(xorFrames(frame, previous), bpp)
+        if len(delta) < len(best[1]):
+            best = (FRAME_DELTA, delta)
+    return best
+
+# ------------------------------------------------------------------------
+# Decoding
+
+# Unpack length bytes of src into dst. Returns the number of bytes written.
+@native
+def rleDecodeInto(src, length: int, dst, bpp: int = 1) -> int:
+    i = 0
+    o = 0
+    end = len(dst)
+    while i < length:
+        control = int(src[i])
+        i += 1
+        if control < 128:
+            count = (control + 1) * bpp
+            if o + count > end:
+                count = end - o
+            for k in range(count):
+                dst[o + k] = src[i + k]
+            i += (control + 1) * bpp
+            o += count
+        else:
+            for r in range(control - 125):
+                if o + bpp > end:
+                    break
+                for k in range(bpp):
+                    dst[o + k] = src[i + k]
+                o += bpp
+            i += bpp
+    return o
+
+# XOR the unpacked length bytes of src onto dst. Runs of zero pixels, the
+# ones that didn't change, are skipped.
+@native
+def rleXorInto(src, length: int, dst, bpp: int = 1) -> int:
+    i = 0
+    o = 0
+    end = len(dst)
+    while i < length:
+        control = int(src[i])
+        i += 1
+        if control < 128:
+            count = (control + 1) * bpp
+            if o + count > end:
+                count = end - o
+            for k in range(count):
+                dst[o + k] ^= src[i + k]
+            i += (control + 1) * bpp
+            o += count
+        else:
+            count = (control - 125) * bpp
+            if o + count > end:
+                count = end - o
+            zero = True
+            for k in range(bpp):
+                if src[i + k] != 0:
+                    zero = False
+            if not zero:
+                for k in range(count):
+                    dst[o + k] ^= src[i + k % bpp]
+            i += bpp
+            o += count
+    return o
+
+# Apply a frame of frameType, the first length bytes of payload, to dst.
+# dst must hold the previous frame for FRAME_DELTA.
+def decodeFrame(frameType: int, payload, length: int, dst, bpp: int = 1) -> int:
+    if frameType == FRAME_FULL:
+        dst[0:length] = payload[0:length]
+        return length
+    if frameType == FRAME_RLE:
+        return rleDecodeInto(payload, length, dst, bpp)
+    if frameType == FRAME_DELTA:
+        return rleXorInto(payload, length, dst, bpp)
+    raise ValueError("unknown frame type")
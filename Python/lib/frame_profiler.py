@@ -0,0 +1,169 @@
+import sys
+
+# Define a global flag
+IS_MICROPYTHON = sys.implementation.name == 'micropython'
+
+from array import array
+
+if IS_MICROPYTHON:
+    import utime as time
+
+    def ticks_us() -> int:
+        return time.ticks_us()
+
+    def ticks_diff(a: int, b: int) -> int:
+        return time.ticks_diff(a, b)
+else:
+    import time
+
+    def ticks_us() -> int:
+        return time.perf_counter_ns() // 1000
+
+    def ticks_diff(a: int, b: int) -> int:
+        return a - b
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Description:
+# Per-phase frame timing for demo loops. Each phase (update, draw, push...)
+# keeps its last N samples, in microseconds, in a fixed-size ring buffer so
+# profiling doesn't allocate while the demo runs.
+#
+# Typical use:
+#   profiler = FrameProfiler()
+#   i75.update = profiler.wrap("push", i75.update)
+#   while True:
+#       profiler.beginFrame()
+#       update()
+#       profiler.mark("update")
+#       draw()                   # calls i75.update()
+#       profiler.mark("draw")    # excludes the time spent in "push"
+#       profiler.endFrame()
+#
+# Every reportEvery frames a min/avg/p95/max summary is printed, which on
+# the board goes out over the USB serial port. dumpCsv() writes the raw
+# samples.
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+FRAME = "frame"
+
+# ------------------------------------------------------------------------
+class RingBuffer:
+    def __init__(self, size: int):
+        self.size = size
+        self.samples = array('I', bytes(4 * size))
+        self.index = 0
+        self.count = 0
+
+    def add(self, value: int):
+        self.samples[self.index] = value
+        self.index = (self.index + 1) % self.size
+        if self.count < self.size:
+            self.count += 1
+
+    def clear(self):
+        self.index = 0
+        self.count = 0
+
+    # Samples from oldest to newest
+    def ordered(self) -> list:
+        start = (self.index - self.count) % self.size
+        return [self.samples[(start + i) % self.size] for i in range(self.count)]
+
+    # Returns (min, avg, p95, max) or None if there are no samples yet.
+    def stats(self) -> tuple:
+        if self.count == 0:
+            return None
+        values = sorted(self.samples[i] for i in range(self.count))
+        p95 = values[min(self.count - 1, (self.count * 95) // 100)]
+        return (values[0], sum(values) / self.count, p95, values[-1])
+
+# ------------------------------------------------------------------------
+class FrameProfiler:
+    def __init__(self, size: int = 120, reportEvery: int = 120, enabled: bool = True, phases=("update", "draw", "push")):
+        self.size = size
+        self.reportEvery = reportEvery
+        self.enabled = enabled
+        self.phases = {}
+        self.order = []
+        self.frameStart = 0
+        self.lapStart = 0
+        self.frameCount = 0
+        # Register the expected phases up front so reports list them in
+        # loop order.
+        for phase in phases:
+            self._buffer(phase)
+
+    def _buffer(self, phase: str) -> RingBuffer:
+        ring = self.phases.get(phase)
+        if ring is None:
+            ring = RingBuffer(self.size)
+            self.phases[phase] = ring
+            self.order.append(phase)
+        return ring
+
+    def record(self, phase: str, us: int):
+        self._buffer(phase).add(us)
+
+    def beginFrame(self):
+        if not self.enabled:
+            return
+        self.frameStart = ticks_us()
+        self.lapStart = self.frameStart
+
+    # Record the time since beginFrame() or the previous mark() as phase.
+    def mark(self, phase: str):
+        if not self.enabled:
+            return
+        now = ticks_us()
+        self.record(phase, ticks_diff(now, self.lapStart))
+        self.lapStart = now
+
+    def endFrame(self):
+        if not self.enabled:
+            return
+        self.record(FRAME, ticks_diff(ticks_us(), self.frameStart))
+        self.frameCount += 1
+        if self.reportEvery and self.frameCount % self.reportEvery == 0:
+            self.report()
+
+    # Time every call of fn as phase. The time is removed from the phase
+    # currently being lapped so mark() doesn't count it twice.
+    def wrap(self, phase: str, fn):
+        def timed(*args, **kwargs):
+            if not self.enabled:
+                return fn(*args, **kwargs)
+            start = ticks_us()
+            result = fn(*args, **kwargs)
+            elapsed = ticks_diff(ticks_us(), start)
+            self.record(phase, elapsed)
+            self.lapStart += elapsed
+            return result
+        return timed
+
+    def reset(self):
+        for ring in self.phases.values():
+            ring.clear()
+        self.frameCount = 0
+
+    def report(self):
+        print(f"---- {self.frameCount} frames (ms) ----")
+        for phase in self.order:
+            stats = self.phases[phase].stats()
+            if stats is None:
+                continue
+            (lo, avg, p95, hi) = stats
+            print(f"{phase:>8} min {lo / 1000:7.2f} avg {avg / 1000:7.2f} p95 {p95 / 1000:7.2f} max {hi / 1000:7.2f}")
+
+    # One row per frame still in the ring buffers, times in microseconds.
+    def dumpCsv(self, path: str):
+        columns = [self.phases[phase].ordered() for phase in self.order]
+        rows = max([len(c) for c in columns] + [0])
+        with open(path, "w") as f:
+            f.write("sample," + ",".join(self.order) + "\n")
+            for r in range(rows):
+                values = []
+                for c in columns:
+                    # Phases that started later have fewer samples
+                    offset = r - (rows - len(c))
+                    values.append(str(c[offset]) if offset >= 0 else "")
+                f.write(str(r) + "," + ",".join(values) + "\n")
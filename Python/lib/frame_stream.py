@@ -0,0 +1,434 @@
+import sys
+
+# Define a global flag
+IS_MICROPYTHON = sys.implementation.name == 'micropython'
+
+import gc
+
+if IS_MICROPYTHON:
+    import utime as time
+    import usocket as socket
+    import ustruct as struct
+
+    def ticks_ms() -> int:
+        return time.ticks_ms()
+
+    # What the jitter buffer may take, leaving room for the Wi-Fi stack
+    # and socket buffers
+    def defaultBudget() -> int:
+        gc.collect()
+        return max(0, gc.mem_free() - HEAP_RESERVE)
+else:
+    import time
+    import socket
+    import struct
+
+    def ticks_ms() -> int:
+        return int(time.monotonic() * 1000) & TICKS_MASK
+
+    def defaultBudget() -> int:
+        return 4 * 1024 * 1024
+
+import errno
+from array import array
+
+from frame_codec import FRAME_DELTA, encodeFrame, decodeFrame
+from frame_profiler import RingBuffer
+from framebuffer import framebufferOf, bytesPerPixel
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Description:
+# Streams prerendered frames to a panel over TCP, so the desktop can do the
+# heavy simulation and the board only decodes and pushes frames.
+#
+# Every frame is a 20 byte header followed by its payload:
+#   magic       b"I7"
+#   frameType   FRAME_FULL, FRAME_RLE or FRAME_DELTA (see frame_codec.py),
+#               or FRAME_PALETTE
+#   bpp         bytes per pixel, 1 (PEN_P8) or 4 (PEN_RGB888)
+#   sequence    frame number, uint32
+#   timestamp   sender ticks_ms() when the frame was made, mod 2^30
+#   width       uint16
+#   height      uint16
+#   length      payload bytes, uint32
+#
+# Payloads are framebuffer bytes in the board's layout, so the receiver
+# decodes them straight into memoryview(display).
+#
+# PEN_P8 is the format for the board: a 128x128 frame is 16KB of palette
+# indices instead of 64KB of RGB888, for the receiver's framebuffer and
+# for each jitter buffer slot. A FRAME_PALETTE payload is r, g, b per
+# palette entry. The sender sends it before the first frame, whenever the
+# palette changes and with every keyframe, and the receiver loads it with
+# update_pen() when it comes up in the jitter buffer.
+#
+# The panel listens (StreamReceiver) and the desktop connects (FrameSender).
+# Received frames wait in a JitterBuffer of preallocated slots and are
+# played out at the pace they were made, a fixed delay behind the sender,
+# which smooths out Wi-Fi hiccups. The slots are a frame each, so the
+# receiver takes fewer if they don't fit in its memory budget and raises
+# MemoryError, saying how much was needed, if not even depth frames fit. TCP keeps frames in order; sequence
+# numbers catch a restarted sender, after which deltas are skipped until a
+# frame that decodes on its own arrives.
+#
+# StreamStats reports bytes and latency per frame. Latency is from the
+# sender making a frame to the receiver showing it. The two clocks aren't
+# synchronised, so it is measured against the quickest transfer seen so
+# far: on localhost that is close to the real latency, over Wi-Fi it is
+# the latency added by the network and the jitter buffer.
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+MAGIC = b"I7"
+HEADER_FORMAT = "<2sBBIIHHI"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+DEFAULT_PORT = 7575
+
+# Timestamps wrap like ticks_ms() on the board, and stay small ints there
+TICKS_MASK = 0x3fffffff
+TICKS_HALF = 0x20000000
+
+FRAME_NAMES = ("full", "rle", "delta", "palette")
+
+# Not a picture: the palette for the PEN_P8 frames that follow
+FRAME_PALETTE = 3
+
+# Heap the receiver leaves free for Wi-Fi and sockets on the board
+HEAP_RESERVE = 24 * 1024
+
+def ticksDiff(a: int, b: int) -> int:
+    return ((a - b + TICKS_HALF) & TICKS_MASK) - TICKS_HALF
+
+# ------------------------------------------------------------------------
+# Sender side, normally on the desktop.
+class FrameSender:
+    # keyframeEvery: send a frame that decodes on its own at least this
+    # often, so a receiver that joins late or skipped frames recovers.
+    def __init__(self, sock, width: int, height: int, bpp: int = 4, keyframeEvery: int = 120):
+        self.sock = sock
+        self.width = width
+        self.height = height
+        self.bpp = bpp
+        self.keyframeEvery = keyframeEvery
+        self.sequence = 0
+        self.previous = None
+        self.header = bytearray(HEADER_SIZE)
+        # PEN_P8 only: r, g, b per palette entry, and whether it changed
+        self.palette = None
+        self.paletteChanged = False
+
+    @classmethod
+    def connect(cls, host: str, port: int = DEFAULT_PORT, *args, **kwargs):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.connect(socket.getaddrinfo(host, port)[0][-1])
+        return cls(sock, *args, **kwargs)
+
+    # The (r, g, b) colors of the palette the PEN_P8 frames index. Sent
+    # before the next frame.
+    def setPalette(self, colors: list):
+        palette = bytes([c for color in colors for c in color])
+        if palette != self.palette:
+            self.palette = palette
+            self.paletteChanged = True
+
+    # Encode and send one frame of width*height*bpp bytes, after the
+    # palette if it is due. Returns (frameType, bytes sent including the
+    # headers).
+    def send(self, frame) -> tuple:
+        previous = self.previous
+        if self.sequence % self.keyframeEvery == 0:
+            previous = None
+        sent = 0
+        if self.palette is not None and (self.paletteChanged or previous is None):
+            sent += self._sendPacket(FRAME_PALETTE, self.palette)
+            self.paletteChanged = False
+        (frameType, payload) = encodeFrame(frame, previous, self.bpp)
+        sent += self._sendPacket(frameType, payload)
+        self.previous = bytes(frame)
+        self.sequence += 1
+        return (frameType, sent)
+
+    # A palette goes out with the sequence number of the frame it precedes
+    def _sendPacket(self, frameType: int, payload) -> int:
+        struct.pack_into(
+            HEADER_FORMAT, self.header, 0, MAGIC, frameType, self.bpp,
+            self.sequence, ticks_ms(), self.width, self.height, len(payload))
+        self.sock.sendall(self.header)
+        self.sock.sendall(payload)
+        return HEADER_SIZE + len(payload)
+
+    def close(self):
+        self.sock.close()
+
+# ------------------------------------------------------------------------
+# Received frames waiting to be shown, oldest first, in slots allocated
+# once up front.
+class JitterBuffer:
+    # depth: frames to collect before playing. Playback runs that many
+    # frames behind the sender, which is how much jitter is absorbed.
+    # slots must be at least depth; more lets the network run ahead.
+    def __init__(self, slots: int, slotSize: int, depth: int = 3):
+        self.slots = [bytearray(slotSize) for i in range(slots)]
+        self.slotSize = slotSize
+        self.depth = min(depth, slots)
+        self.frameType = bytearray(slots)
+        self.sequence = array('I', bytes(4 * slots))
+        self.timestamp = array('I', bytes(4 * slots))
+        self.length = array('I', bytes(4 * slots))
+        self.head = 0
+        self.count = 0
+        self.playing = False
+        # Receiver ticks minus sender ticks at which frames are due
+        self.offset = 0
+
+    def isFull(self) -> bool:
+        return self.count == len(self.slots)
+
+    # The slot the next frame is received into
+    def nextSlot(self) -> int:
+        return (self.head + self.count) % len(self.slots)
+
+    def push(self, frameType: int, sequence: int, timestamp: int, length: int):
+        slot = self.nextSlot()
+        self.frameType[slot] = frameType
+        self.sequence[slot] = sequence
+        self.timestamp[slot] = timestamp
+        self.length[slot] = length
+        self.count += 1
+
+    # The slot of the oldest frame if it is time to show it, else -1.
+    def due(self, now: int) -> int:
+        if self.count == 0:
+            # Ran dry: refill to depth before playing again
+            self.playing = False
+            return -1
+        slot = self.head
+        if not self.playing:
+            if self.count < self.depth:
+                return -1
+            self.playing = True
+            self.offset = ticksDiff(now, self.timestamp[slot])
+            return slot
+        if ticksDiff(now, self.timestamp[slot]) - self.offset < 0:
+            return -1
+        return slot
+
+    def pop(self):
+        self.head = (self.head + 1) % len(self.slots)
+        self.count -= 1
+
+    def clear(self):
+        self.head = 0
+        self.count = 0
+        self.playing = False
+
+# ------------------------------------------------------------------------
+class StreamStats:
+    def __init__(self, size: int = 120, reportEvery: int = 120, verbose: bool = False):
+        self.bytes = RingBuffer(size)
+        self.latency = RingBuffer(size)
+        self.reportEvery = reportEvery
+        self.verbose = verbose
+        self.frames = 0
+        self.skipped = 0
+        self.types = [0, 0, 0]
+        # Quickest transfer seen, receiver ticks minus sender ticks
+        self.bestOffset = None
+        # Start of the current report window
+        self.windowStart = None
+        self.windowFrames = 0
+
+    def arrived(self, timestamp: int, now: int):
+        offset = ticksDiff(now, timestamp)
+        if self.bestOffset is None or offset < self.bestOffset:
+            self.bestOffset = offset
+
+    def shown(self, sequence: int, frameType: int, size: int, timestamp: int, now: int, buffered: int):
+        latency = max(0, ticksDiff(now, timestamp) - self.bestOffset)
+        self.bytes.add(size)
+        self.latency.add(latency)
+        self.types[frameType] += 1
+        if self.windowStart is None:
+            self.windowStart = now
+        self.frames += 1
+        self.windowFrames += 1
+        if self.verbose:
+            print(f"frame {sequence:6d} {FRAME_NAMES[frameType]:>5} {size:6d} bytes {latency:4d} ms, {buffered} buffered")
+        if self.reportEvery and self.frames % self.reportEvery == 0:
+            self.report(now)
+
+    def report(self, now: int):
+        b = self.bytes.stats()
+        l = self.latency.stats()
+        if b is None:
+            return
+        elapsed = ticksDiff(now, self.windowStart)
+        fps = 1000 * (self.windowFrames - 1) / elapsed if elapsed > 0 else 0
+        self.windowStart = now
+        self.windowFrames = 1
+        print(f"---- {self.frames} frames, {fps:.1f} FPS, full/rle/delta {self.types[0]}/{self.types[1]}/{self.types[2]}, skipped {self.skipped}")
+        print(f"  bytes   min {b[0]:6d} avg {b[1]:8.0f} p95 {b[2]:6d} max {b[3]:6d}, {b[1] * fps / 1024:.1f} kB/s")
+        print(f"  latency min {l[0]:6d} avg {l[1]:8.1f} p95 {l[2]:6d} max {l[3]:6d} ms")
+
+# ------------------------------------------------------------------------
+# Panel side. Listens for a sender and decodes its frames into display's
+# framebuffer.
+#
+#   receiver = StreamReceiver(display)
+#   while True:
+#       if receiver.frame():
+#           i75.update(display)
+#
+# budget is the most bytes the jitter buffer slots may take, by default
+# the free heap less HEAP_RESERVE on the board.
+class StreamReceiver:
+    def __init__(self, display, port: int = DEFAULT_PORT, slots: int = 4, depth: int = 2, stats: StreamStats = None, budget: int = None):
+        self.display = display
+        (self.width, self.height) = display.get_bounds()
+        self.framebuffer = framebufferOf(display)
+        self.bpp = bytesPerPixel(display)
+        # A frame never needs more room than this, see frame_codec.py
+        self.frameSize = self.width * self.height * self.bpp
+        self.buffer = self._allocate(slots, depth, budget if budget is not None else defaultBudget())
+        self.slotViews = [memoryview(slot) for slot in self.buffer.slots]
+        self.stats = stats if stats is not None else StreamStats()
+
+        self.header = bytearray(HEADER_SIZE)
+        self.headerView = memoryview(self.header)
+        self.received = 0
+        self.incoming = None
+        self.lastSequence = -1
+        # Until a frame that decodes on its own arrives, deltas are useless
+        self.needKeyframe = True
+
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server.bind(socket.getaddrinfo("0.0.0.0", port)[0][-1])
+        self.server.listen(1)
+        self.server.setblocking(False)
+        self.client = None
+
+    def _allocate(self, slots: int, depth: int, budget: int) -> JitterBuffer:
+        fit = min(slots, budget // self.frameSize)
+        if fit < depth:
+            hint = "lower the depth" if self.bpp == 1 else "lower the depth or stream PEN_P8 frames"
+            raise MemoryError(
+                f"Stream needs {depth} frames of {self.frameSize} bytes for its jitter buffer but only "
+                f"{budget} bytes are free; {hint}")
+        if fit < slots:
+            print(f"Room for {fit} of {slots} frames in the jitter buffer")
+        try:
+            return JitterBuffer(fit, self.frameSize, depth)
+        except MemoryError:
+            raise MemoryError(f"No room for {fit} frames of {self.frameSize} bytes for the jitter buffer")
+
+    def close(self):
+        self._disconnect()
+        self.server.close()
+
+    def _disconnect(self):
+        if self.client is not None:
+            self.client.close()
+            self.client = None
+        self.received = 0
+        self.incoming = None
+
+    def _accept(self):
+        try:
+            (client, address) = self.server.accept()
+        except OSError:
+            return
+        client.setblocking(False)
+        self.client = client
+        self.readInto = getattr(client, "recv_into", None) or client.readinto
+        print("Stream from", address)
+
+    # Read into view. Returns the bytes read, 0 if nothing is waiting and
+    # -1 if the sender hung up.
+    def _read(self, view) -> int:
+        try:
+            n = self.readInto(view)
+        except OSError as e:
+            if e.args[0] == errno.EAGAIN:
+                return 0
+            return -1
+        if n is None:
+            return 0
+        return n if n > 0 else -1
+
+    # Read whatever has arrived, without waiting.
+    def poll(self):
+        if self.client is None:
+            self._accept()
+            if self.client is None:
+                return
+        while True:
+            if self.incoming is None:
+                # Header
+                n = self._read(self.headerView[self.received:])
+                if n <= 0:
+                    break
+                self.received += n
+                if self.received < HEADER_SIZE:
+                    continue
+                (magic, frameType, bpp, sequence, timestamp, width, height, length) = struct.unpack_from(HEADER_FORMAT, self.header, 0)
+                if magic != MAGIC or bpp != self.bpp or width != self.width or height != self.height or length > self.frameSize:
+                    print("Bad stream header, dropping the connection")
+                    self._disconnect()
+                    return
+                self.incoming = (frameType, sequence, timestamp, length)
+                self.received = 0
+            else:
+                # Payload, straight into a slot
+                if self.buffer.isFull():
+                    # Leave it in the socket until a slot frees up
+                    return
+                (frameType, sequence, timestamp, length) = self.incoming
+                if self.received < length:
+                    n = self._read(self.slotViews[self.buffer.nextSlot()][self.received:length])
+                    if n <= 0:
+                        break
+                    self.received += n
+                    if self.received < length:
+                        continue
+                now = ticks_ms()
+                self.stats.arrived(timestamp, now)
+                self.buffer.push(frameType, sequence, timestamp, length)
+                self.incoming = None
+                self.received = 0
+        if n < 0:
+            print("Stream closed")
+            self._disconnect()
+
+    # Receive, and decode the next frame into the framebuffer if it is
+    # due. Returns True if the framebuffer changed.
+    def frame(self) -> bool:
+        self.poll()
+        buffer = self.buffer
+        now = ticks_ms()
+        slot = buffer.due(now)
+        if slot < 0:
+            return False
+        frameType = buffer.frameType[slot]
+        if frameType == FRAME_PALETTE:
+            self._loadPalette(self.slotViews[slot], buffer.length[slot])
+            buffer.pop()
+            return True
+        sequence = buffer.sequence[slot]
+        if sequence != self.lastSequence + 1 and frameType == FRAME_DELTA:
+            self.needKeyframe = True
+        self.lastSequence = sequence
+        if frameType == FRAME_DELTA and self.needKeyframe:
+            self.stats.skipped += 1
+            buffer.pop()
+            return False
+        self.needKeyframe = False
+        length = buffer.length[slot]
+        decodeFrame(frameType, self.slotViews[slot], length, self.framebuffer, self.bpp)
+        self.stats.shown(sequence, frameType, HEADER_SIZE + length, buffer.timestamp[slot], ticks_ms(), buffer.count - 1)
+        buffer.pop()
+        return True
+
+    def _loadPalette(self, data, length: int):
+        updatePen = self.display.update_pen
+        for i in range(0, length - 2, 3):
+            updatePen(i // 3, data[i], data[i + 1], data[i + 2])
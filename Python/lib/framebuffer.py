@@ -0,0 +1,20 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Description:
+# Direct access to a PicoGraphics framebuffer. On the board
+# memoryview(display) exposes the pixels; the desktop emulator only
+# supports that from Python 3.12 so fall back to its buffer attribute.
+#
+# The layout depends on the pen type: one byte per pixel for PEN_P8, four
+# (little-endian 0x00RRGGBB) for PEN_RGB888, row by row from the top left.
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def framebufferOf(display) -> memoryview:
+    try:
+        return memoryview(display)
+    except TypeError:
+        return memoryview(display.buffer)
+
+# Bytes per pixel, worked out from the size of the framebuffer
+def bytesPerPixel(display, layers: int = 1) -> int:
+    (width, height) = display.get_bounds()
+    return len(framebufferOf(display)) // (width * height * layers)
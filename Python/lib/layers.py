@@ -0,0 +1,101 @@
+import gc
+
+from picographics import PicoGraphics
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Description:
+# Keeps the parts of a scene that don't change (titles, backgrounds) on
+# their own PicoGraphics layers so they are drawn once instead of every
+# frame. The layers are composited when the display is pushed: pixels that
+# are 0 (pen 0) in layers above 0 let the layers below show through.
+#
+#   (graphics, count) = layeredDisplay(i75, DISPLAY_INTERSTATE75_128X128, PEN_P8, 2)
+#   layers = LayerManager(graphics, count)
+#   layers.add(drawScene)                  # layer 0, drawn every frame
+#   layers.add(drawTitle, static=True)     # layer 1, drawn once
+#   while True:
+#       layers.render()
+#       i75.update(graphics)
+#
+# Every layer has a paint(display) function. Static layers are only
+# painted again after invalidate(), dynamic ones every render(). Layers
+# above 0 are cleared to pen 0 before they are painted; layer 0 paints its
+# own background. A layer without a paint function is drawn by the demo
+# itself, e.g. blitted straight into the framebuffer.
+#
+# A layer costs a framebuffer of RAM: 16KB at 128x128 in PEN_P8, 64KB in
+# RGB888. layeredDisplay() frees the RGB888 display Interstate75 always
+# makes, so it doesn't sit next to the layered one, and falls back to a
+# single layer, saying so, if the layers don't fit. If the display has
+# fewer layers than were added every layer is painted onto layer 0 in
+# order, every frame, which looks the same but saves nothing.
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+TRANSPARENT = 0
+
+# Replace i75.display with a displayType display of penType with up to
+# layerCount layers. Returns (display, layers it has).
+def layeredDisplay(i75, displayType, penType, layerCount: int) -> tuple:
+    i75.display = None
+    gc.collect()
+    try:
+        display = PicoGraphics(display=displayType, pen_type=penType, layers=layerCount)
+        print(f"Drawing on {layerCount} layers")
+    except MemoryError:
+        gc.collect()
+        display = PicoGraphics(display=displayType, pen_type=penType)
+        layerCount = 1
+        print("No room for layers, redrawing everything every frame")
+    i75.display = display
+    return (display, layerCount)
+
+# ------------------------------------------------------------------------
+class Layer:
+    def __init__(self, paint, static: bool):
+        self.paint = paint
+        self.static = static
+        self.dirty = True
+
+# ------------------------------------------------------------------------
+class LayerManager:
+    def __init__(self, display, layerCount: int = 1):
+        self.display = display
+        self.layerCount = layerCount
+        self.layers = []
+
+    # Add a layer on top of the others. Returns its number.
+    def add(self, paint, static: bool = False) -> int:
+        self.layers.append(Layer(paint, static))
+        return len(self.layers) - 1
+
+    # Paint a static layer again on the next render()
+    def invalidate(self, layer: int):
+        self.layers[layer].dirty = True
+
+    def isStacked(self) -> bool:
+        return len(self.layers) <= self.layerCount
+
+    # Paint the layers that need it. Returns True if anything was painted.
+    def render(self) -> bool:
+        d = self.display
+        if not self.isStacked():
+            for layer in self.layers:
+                if layer.paint is not None:
+                    layer.paint(d)
+                layer.dirty = False
+            return len(self.layers) > 0
+
+        painted = False
+        for i in range(len(self.layers)):
+            layer = self.layers[i]
+            if layer.paint is None or (layer.static and not layer.dirty):
+                continue
+            d.set_layer(i)
+            if i > 0:
+                d.set_pen(TRANSPARENT)
+                d.clear()
+            layer.paint(d)
+            layer.dirty = False
+            painted = True
+        d.set_layer(0)
+        return painted
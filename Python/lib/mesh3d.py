@@ -0,0 +1,368 @@
+import sys
+
+# Define a global flag
+IS_MICROPYTHON = sys.implementation.name == 'micropython'
+
+import math
+from array import array
+
+if IS_MICROPYTHON:
+    import micropython
+    numpy = None
+    native = micropython.native
+else:
+    # NumPy is optional on desktop. Without it the renderer uses the same
+    # array layout and loop as on the board.
+    try:
+        import numpy
+    except ImportError:
+        numpy = None
+
+    def native(f):
+        return f
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Description:
+# A small wireframe mesh engine for cubes.py and friends.
+#
+# A Mesh is a list of unique vertices and edges between them by index, so
+# a corner shared by three edges is transformed once, not three times.
+# Mesh.fromSegments() builds one from loose line segments.
+#
+# A MeshRenderer has capacity instance slots. Each placed instance is a
+# mesh with its own position, field of view, distance and rotation angle,
+# all kept in flat arrays. Every frame transform():
+#   - builds one 3x3 rotation matrix per distinct angle (instances that
+#     spin at the same rate share it)
+#   - rotates and projects every vertex of every instance in one pass
+#     into the preallocated projected buffer (x, y per vertex)
+# and draw() connects the projected points.
+#
+# draw() only hands display.line() what can land on the screen:
+#   - an instance with a vertex behind the eye, or whose projected points
+#     are all off the same side of the screen, is culled whole
+#   - edges are Cohen-Sutherland clipped: dropped when both ends are off
+#     the same side, cut to the screen when they cross its edge
+# Every draw() leaves its counts of drawn, clipped and culled lines, and
+# culled meshes, in the renderer.
+#
+# The rotation is the one cubes.py always used: about X, then Y, then Z,
+# all by the same angle. Projection is perspective:
+#   factor = fov / (distance + z);  x' = x * factor + posX;  y' = -y * factor + posY
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# Vertices closer than this to the eye are projected as if they were
+# here, and the instance is culled
+NEAR = 0.01
+
+# Cohen-Sutherland outcodes
+INSIDE = 0
+LEFT = 1
+RIGHT = 2
+TOP = 4
+BOTTOM = 8
+
+def floatArray(size: int):
+    if numpy:
+        return numpy.zeros(size, dtype=numpy.float32)
+    return array('f', bytes(4 * size))
+
+def intArray(size: int):
+    if numpy:
+        return numpy.zeros(size, dtype=numpy.int32)
+    return array('i', bytes(4 * size))
+
+# ------------------------------------------------------------------------
+class Mesh:
+    def __init__(self, vertices: list, edges: list):
+        self.vertexCount = len(vertices)
+        self.vertices = array('f', [c for v in vertices for c in v])
+        self.edges = array('H', [i for e in edges for i in e])
+        self.edgeCount = len(edges)
+
+    # Build a mesh from ((x, y, z), (x, y, z)) segments, sharing endpoints
+    # that are the same point.
+    @classmethod
+    def fromSegments(cls, segments: list):
+        vertices = []
+        index = {}
+        edges = []
+        for segment in segments:
+            ends = []
+            for point in segment:
+                point = tuple(point)
+                if point not in index:
+                    index[point] = len(vertices)
+                    vertices.append(point)
+                ends.append(index[point])
+            edges.append(tuple(ends))
+        return cls(vertices, edges)
+
+CUBE = Mesh(
+    [(-1, -1, 1), (1, -1, 1), (1, -1, -1), (-1, -1, -1),
+     (-1, 1, 1), (1, 1, 1), (1, 1, -1), (-1, 1, -1)],
+    [(0, 1), (1, 2), (2, 3), (3, 0),
+     (4, 5), (5, 6), (6, 7), (7, 4),
+     (0, 4), (1, 5), (2, 6), (3, 7)])
+
+# Fill out[offset:offset + 9] with the row-major matrix of the X, Y, Z
+# rotation by angle radians.
+def rotationMatrix(angle: float, out, offset: int = 0):
+    c = math.cos(angle)
+    s = math.sin(angle)
+    for axis in range(3):
+        x = 1.0 if axis == 0 else 0.0
+        y = 1.0 if axis == 1 else 0.0
+        z = 1.0 if axis == 2 else 0.0
+        # X
+        y1 = y * c - z * s
+        z1 = y * s + z * c
+        # Y
+        x1 = x * c - z1 * s
+        z2 = x * s + z1 * c
+        # Z
+        out[offset + axis] = x1 * c - y1 * s
+        out[offset + 3 + axis] = x1 * s + y1 * c
+        out[offset + 6 + axis] = z2
+
+@native
+def outCode(x: int, y: int, xMax: int, yMax: int) -> int:
+    code = INSIDE
+    if x < 0:
+        code |= LEFT
+    elif x > xMax:
+        code |= RIGHT
+    if y < 0:
+        code |= TOP
+    elif y > yMax:
+        code |= BOTTOM
+    return code
+
+# Cohen-Sutherland: clip the line to 0..xMax, 0..yMax. Returns the clipped
+# (x0, y0, x1, y1), or None if none of it is on the screen.
+def clipLine(x0: int, y0: int, x1: int, y1: int, xMax: int, yMax: int):
+    code0 = outCode(x0, y0, xMax, yMax)
+    code1 = outCode(x1, y1, xMax, yMax)
+    while True:
+        if not (code0 | code1):
+            return (int(x0), int(y0), int(x1), int(y1))
+        if code0 & code1:
+            return None
+        code = code0 if code0 else code1
+        if code & BOTTOM:
+            x = x0 + (x1 - x0) * (yMax - y0) / (y1 - y0)
+            y = yMax
+        elif code & TOP:
+            x = x0 + (x1 - x0) * (0 - y0) / (y1 - y0)
+            y = 0
+        elif code & RIGHT:
+            y = y0 + (y1 - y0) * (xMax - x0) / (x1 - x0)
+            x = xMax
+        else:
+            y = y0 + (y1 - y0) * (0 - x0) / (x1 - x0)
+            x = 0
+        # Round towards the screen so the point can't land just outside
+        x = min(max(round(x), 0), xMax)
+        y = min(max(round(y), 0), yMax)
+        if code == code0:
+            (x0, y0) = (x, y)
+            code0 = outCode(x0, y0, xMax, yMax)
+        else:
+            (x1, y1) = (x, y)
+            code1 = outCode(x1, y1, xMax, yMax)
+
+# ------------------------------------------------------------------------
+class MeshRenderer:
+    # slotVertices: the most vertices a mesh placed in a slot may have
+    def __init__(self, capacity: int, slotVertices: int = 8):
+        self.capacity = capacity
+        self.slotVertices = slotVertices
+        self.meshes = [None] * capacity
+        self.posX = floatArray(capacity)
+        self.posY = floatArray(capacity)
+        self.fov = floatArray(capacity)
+        self.distance = floatArray(capacity)
+        self.angle = floatArray(capacity)
+        # Model space vertices of every slot, x, y, z
+        self.local = floatArray(capacity * slotVertices * 3)
+        self.vertexCount = intArray(capacity)
+        # One matrix per slot at most; matrixIndex says which one a slot uses
+        self.matrices = floatArray(capacity * 9)
+        self.matrixIndex = intArray(capacity)
+        self.matrixCount = 0
+        # Screen x, y of every vertex of every slot
+        self.projected = intArray(capacity * slotVertices * 2)
+        # 1 for slots with a vertex behind the eye
+        self.behind = bytearray(capacity)
+        # Outcodes of the vertices of the slot being drawn
+        self.codes = bytearray(slotVertices)
+        # What the last draw() did
+        self.linesDrawn = 0
+        self.linesClipped = 0
+        self.linesCulled = 0
+        self.meshesCulled = 0
+
+    def place(self, slot: int, mesh: Mesh, x: float, y: float, fov: float, distance: float, angle: float = 0.0):
+        if mesh.vertexCount > self.slotVertices:
+            raise ValueError("mesh has too many vertices")
+        self.meshes[slot] = mesh
+        self.posX[slot] = x
+        self.posY[slot] = y
+        self.fov[slot] = fov
+        self.distance[slot] = distance
+        self.angle[slot] = angle
+        base = slot * self.slotVertices * 3
+        for i in range(mesh.vertexCount * 3):
+            self.local[base + i] = mesh.vertices[i]
+        self.vertexCount[slot] = mesh.vertexCount
+
+    def remove(self, slot: int):
+        self.meshes[slot] = None
+        self.vertexCount[slot] = 0
+
+    # -------------------------------------------------------------------
+    def _buildMatrices(self):
+        seen = {}
+        matrices = self.matrices
+        matrixIndex = self.matrixIndex
+        count = 0
+        for slot in range(self.capacity):
+            if self.meshes[slot] is None:
+                continue
+            angle = float(self.angle[slot])
+            m = seen.get(angle)
+            if m is None:
+                m = count
+                seen[angle] = m
+                rotationMatrix(angle, matrices, m * 9)
+                count += 1
+            matrixIndex[slot] = m
+        self.matrixCount = count
+
+    # Rotate and project every vertex of every placed mesh
+    def transform(self):
+        self._buildMatrices()
+        if numpy:
+            self._transformVectorized()
+        else:
+            self._transformLoop()
+
+    def _transformVectorized(self):
+        n = self.capacity
+        local = self.local.reshape(n, self.slotVertices, 3)
+        m = self.matrices.reshape(n, 3, 3)[self.matrixIndex]
+        world = numpy.einsum('sij,svj->svi', m, local)
+        w = self.distance[:, None] + world[:, :, 2]
+        self.behind[:] = bytes((w < NEAR).any(axis=1).astype(numpy.uint8))
+        factor = self.fov[:, None] / numpy.maximum(w, NEAR)
+        projected = self.projected.reshape(n, self.slotVertices, 2)
+        projected[:, :, 0] = world[:, :, 0] * factor + self.posX[:, None]
+        projected[:, :, 1] = -world[:, :, 1] * factor + self.posY[:, None]
+
+    @native
+    def _transformLoop(self):
+        local = self.local
+        matrices = self.matrices
+        matrixIndex = self.matrixIndex
+        projected = self.projected
+        vertexCount = self.vertexCount
+        slotVertices = self.slotVertices
+        behind = self.behind
+        for slot in range(self.capacity):
+            count = vertexCount[slot]
+            behind[slot] = 0
+            if count == 0:
+                continue
+            m = matrixIndex[slot] * 9
+            m0 = matrices[m]
+            m1 = matrices[m + 1]
+            m2 = matrices[m + 2]
+            m3 = matrices[m + 3]
+            m4 = matrices[m + 4]
+            m5 = matrices[m + 5]
+            m6 = matrices[m + 6]
+            m7 = matrices[m + 7]
+            m8 = matrices[m + 8]
+            fov = self.fov[slot]
+            distance = self.distance[slot]
+            px = self.posX[slot]
+            py = self.posY[slot]
+            src = slot * slotVertices * 3
+            dst = slot * slotVertices * 2
+            for v in range(count):
+                x = local[src]
+                y = local[src + 1]
+                z = local[src + 2]
+                w = distance + m6 * x + m7 * y + m8 * z
+                if w < NEAR:
+                    w = NEAR
+                    behind[slot] = 1
+                factor = fov / w
+                projected[dst] = int((m0 * x + m1 * y + m2 * z) * factor + px)
+                projected[dst + 1] = int(-(m3 * x + m4 * y + m5 * z) * factor + py)
+                src += 3
+                dst += 2
+
+    # -------------------------------------------------------------------
+    # Draw the edges of every placed mesh with the current pen, culled
+    # and clipped to the display.
+    @native
+    def draw(self, display):
+        (width, height) = display.get_bounds()
+        xMax = width - 1
+        yMax = height - 1
+        line = display.line
+        projected = self.projected
+        codes = self.codes
+        slotVertices = self.slotVertices
+        drawn = 0
+        clipped = 0
+        culled = 0
+        meshesCulled = 0
+        for slot in range(self.capacity):
+            mesh = self.meshes[slot]
+            if mesh is None:
+                continue
+            base = slot * slotVertices * 2
+            if self.behind[slot]:
+                meshesCulled += 1
+                culled += mesh.edgeCount
+                continue
+
+            # Outcode every vertex once; if they all share an outside
+            # side the mesh's bounding box is off the screen.
+            allOut = 15
+            for v in range(mesh.vertexCount):
+                code = outCode(projected[base + v * 2], projected[base + v * 2 + 1], xMax, yMax)
+                codes[v] = code
+                allOut &= code
+            if allOut:
+                meshesCulled += 1
+                culled += mesh.edgeCount
+                continue
+
+            edges = mesh.edges
+            for e in range(0, mesh.edgeCount * 2, 2):
+                va = edges[e]
+                vb = edges[e + 1]
+                codeA = codes[va]
+                codeB = codes[vb]
+                if codeA & codeB:
+                    culled += 1
+                    continue
+                a = base + va * 2
+                b = base + vb * 2
+                if codeA | codeB:
+                    ends = clipLine(int(projected[a]), int(projected[a + 1]), int(projected[b]), int(projected[b + 1]), xMax, yMax)
+                    if ends is None:
+                        culled += 1
+                        continue
+                    line(ends[0], ends[1], ends[2], ends[3])
+                    clipped += 1
+                else:
+                    line(int(projected[a]), int(projected[a + 1]), int(projected[b]), int(projected[b + 1]))
+                drawn += 1
+        self.linesDrawn = drawn
+        self.linesClipped = clipped
+        self.linesCulled = culled
+        self.meshesCulled = meshesCulled
@@ -0,0 +1,41 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Description:
+# A fixed set of objects created up front and handed out from a free-list,
+# so a running demo recycles objects instead of allocating new ones (and
+# eventually pausing for the garbage collector).
+#
+#   pool = ObjectPool(makeParticle, 200)
+#   p = pool.acquire()     # None when every object is in use
+#   ...
+#   pool.release(p)
+#
+# The free-list is a list of fixed length plus a count, so acquire() and
+# release() never resize anything. Objects come back as they were left;
+# resetting them is up to the caller.
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# ------------------------------------------------------------------------
+class ObjectPool:
+    def __init__(self, factory, capacity: int):
+        self.capacity = capacity
+        self.objects = [factory() for i in range(capacity)]
+        # free[0:freeCount] are the objects that can be handed out.
+        self.free = list(self.objects)
+        self.freeCount = capacity
+
+    def acquire(self):
+        if self.freeCount == 0:
+            return None
+        self.freeCount -= 1
+        obj = self.free[self.freeCount]
+        self.free[self.freeCount] = None
+        return obj
+
+    def release(self, obj):
+        if self.freeCount == self.capacity:
+            raise ValueError("pool already full")
+        self.free[self.freeCount] = obj
+        self.freeCount += 1
+
+    def inUse(self) -> int:
+        return self.capacity - self.freeCount
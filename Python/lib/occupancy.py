@@ -0,0 +1,91 @@
+import sys
+
+# Define a global flag
+IS_MICROPYTHON = sys.implementation.name == 'micropython'
+
+import random
+
+if IS_MICROPYTHON:
+    import micropython
+    native = micropython.native
+else:
+    def native(f):
+        return f
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Description:
+# Which integer cells of a width x height area are taken, one bit per
+# cell (2KB for 128x128). Checking or claiming a cell is constant time no
+# matter how many are taken.
+#
+#   grid = OccupancyGrid(128, 128)
+#   cell = grid.claimRandom()
+#   if cell is not None:
+#       (x, y) = cell
+#
+# claimRandom() tries a few random cells and then scans forward from the
+# last one for a free cell, so it always finishes: it returns None only
+# when the grid is full.
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# Random cells to try before falling back to a scan
+RANDOM_TRIES = 8
+
+# ------------------------------------------------------------------------
+class OccupancyGrid:
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.size = width * height
+        self.bits = bytearray((self.size + 7) >> 3)
+        self.count = 0
+
+    def clear(self):
+        bits = self.bits
+        for i in range(len(bits)):
+            bits[i] = 0
+        self.count = 0
+
+    def isTaken(self, x: int, y: int) -> bool:
+        i = y * self.width + x
+        return (self.bits[i >> 3] >> (i & 7)) & 1 == 1
+
+    # Take cell x,y. Returns False if it was already taken.
+    def claim(self, x: int, y: int) -> bool:
+        return self._claimIndex(y * self.width + x)
+
+    def release(self, x: int, y: int):
+        i = y * self.width + x
+        bit = 1 << (i & 7)
+        if self.bits[i >> 3] & bit:
+            self.bits[i >> 3] &= ~bit
+            self.count -= 1
+
+    @native
+    def _claimIndex(self, i: int) -> bool:
+        bit = 1 << (i & 7)
+        if self.bits[i >> 3] & bit:
+            return False
+        self.bits[i >> 3] |= bit
+        self.count += 1
+        return True
+
+    # Claim a random free cell. Returns (x, y) or None if the grid is full.
+    @native
+    def claimRandom(self):
+        if self.count >= self.size:
+            return None
+        size = self.size
+        i = 0
+        for attempt in range(RANDOM_TRIES):
+            i = random.randrange(size)
+            if self._claimIndex(i):
+                return (i % self.width, i // self.width)
+        # Mostly full: walk forward (wrapping) to the next free cell.
+        for step in range(size):
+            i += 1
+            if i == size:
+                i = 0
+            if self._claimIndex(i):
+                return (i % self.width, i // self.width)
+        return None
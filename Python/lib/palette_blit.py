@@ -0,0 +1,114 @@
+import sys
+
+# Define a global flag
+IS_MICROPYTHON = sys.implementation.name == 'micropython'
+
+from framebuffer import framebufferOf, bytesPerPixel
+
+if IS_MICROPYTHON:
+    import micropython
+    native = micropython.native
+else:
+    def native(f):
+        return f
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Description:
+# Draws a grid of palette indices (one byte per cell) scaled up by an
+# integer factor, without a set_pen() and rectangle() call per cell.
+#
+#   blitter = PaletteBlitter(display, [(0, 0, 0), (255, 0, 0)], 32, 32, 4)
+#   blitter.blit(cells)    # bytearray(32 * 32) of indices into the palette
+#
+# How it draws depends on the framebuffer:
+#   1 byte per pixel   the display is taken to be PEN_P8. The palette is
+#                      loaded into the first palette slots, so create any
+#                      other pens after the blitter.
+#   4 bytes per pixel  PEN_RGB888, cells are written as 0x00RRGGBB.
+#   anything else      runs of equal cells in a row become one rectangle.
+#
+# In the first two cases one row of the scaled image is assembled from
+# precomputed cell bytes and then copied scale times into the framebuffer.
+# If the display was created with layers, pass their number: the cells go
+# to layer 0, the start of the framebuffer.
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# ------------------------------------------------------------------------
+class PaletteBlitter:
+    def __init__(self, display, palette: list, width: int, height: int, scale: int = 1, offsetX: int = 0, offsetY: int = 0, layers: int = 1):
+        self.display = display
+        self.scale = scale
+        self.offsetX = offsetX
+        self.offsetY = offsetY
+        (self.screenWidth, screenHeight) = display.get_bounds()
+        # Cells that don't fit on the screen are skipped.
+        self.width = min(width, (self.screenWidth - offsetX) // scale)
+        self.height = min(height, (screenHeight - offsetY) // scale)
+        self.stride = width
+
+        try:
+            self.bpp = bytesPerPixel(display, layers)
+        except (TypeError, AttributeError):
+            self.bpp = 0
+
+        if self.bpp == 1:
+            display.set_palette(palette)
+            cells = [bytes([i]) * scale for i in range(len(palette))]
+        elif self.bpp == 4:
+            cells = [((r << 16) | (g << 8) | b).to_bytes(4, 'little') * scale for (r, g, b) in palette]
+        else:
+            self.bpp = 0
+            cells = None
+            self.pens = [display.create_pen(r, g, b) for (r, g, b) in palette]
+
+        if self.bpp:
+            self.cells = cells
+            self.cellSize = scale * self.bpp
+            self.row = bytearray(self.width * self.cellSize)
+            self.framebuffer = framebufferOf(display)
+
+    # values holds one palette index per cell, row by row, width per row
+    def blit(self, values):
+        if self.bpp:
+            self._blitFramebuffer(values)
+        else:
+            self._blitRectangles(values)
+
+    @native
+    def _blitFramebuffer(self, values):
+        cells = self.cells
+        row = self.row
+        fb = self.framebuffer
+        size = self.cellSize
+        rowBytes = len(row)
+        lineBytes = self.screenWidth * self.bpp
+        scale = self.scale
+        start = self.offsetY * lineBytes + self.offsetX * self.bpp
+        for y in range(self.height):
+            src = y * self.stride
+            i = 0
+            for x in range(self.width):
+                row[i:i + size] = cells[values[src + x]]
+                i += size
+            for k in range(scale):
+                fb[start:start + rowBytes] = row
+                start += lineBytes
+
+    @native
+    def _blitRectangles(self, values):
+        d = self.display
+        pens = self.pens
+        scale = self.scale
+        w = self.width
+        for y in range(self.height):
+            src = y * self.stride
+            py = y * scale + self.offsetY
+            x = 0
+            while x < w:
+                v = values[src + x]
+                end = x + 1
+                while end < w and values[src + end] == v:
+                    end += 1
+                d.set_pen(pens[v])
+                d.rectangle(x * scale + self.offsetX, py, (end - x) * scale, scale)
+                x = end
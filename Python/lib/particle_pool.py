@@ -0,0 +1,200 @@
+import sys
+
+# Define a global flag
+IS_MICROPYTHON = sys.implementation.name == 'micropython'
+
+import random
+import math
+from array import array
+
+from trig_table import trig
+
+if IS_MICROPYTHON:
+    import micropython
+    numpy = None
+    native = micropython.native
+else:
+    # NumPy is optional on desktop. Without it the pool falls back to the
+    # same array('f') layout used on the board.
+    try:
+        import numpy
+    except ImportError:
+        numpy = None
+
+    def native(f):
+        return f
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Description:
+# A structure-of-arrays particle pool. Instead of each particle owning a
+# Point, Velocity and Vector object, every attribute lives in its own flat
+# typed array and a whole pool is updated in a single pass.
+#
+# Slot i of every array belongs to particle i:
+#   posX/posY       current position
+#   dirX/dirY       unit direction (relative to the +X axis)
+#   magnitude       speed in pixels per update
+#   elapsed         ms since the particle was activated
+#   lifespan        ms the particle lives for
+#   color           pen used to draw the particle
+#   alive           1 while the particle is active
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def floatArray(size: int):
+    if numpy:
+        return numpy.zeros(size, dtype=numpy.float32)
+    return array('f', bytes(4 * size))
+
+def penArray(size: int):
+    if numpy:
+        return numpy.zeros(size, dtype=numpy.uint32)
+    return array('I', bytes(4 * size))
+
+def flagArray(size: int):
+    if numpy:
+        return numpy.zeros(size, dtype=numpy.bool_)
+    return bytearray(size)
+
+# ------------------------------------------------------------------------
+class ParticlePool:
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.posX = floatArray(capacity)
+        self.posY = floatArray(capacity)
+        self.dirX = floatArray(capacity)
+        self.dirY = floatArray(capacity)
+        self.magnitude = floatArray(capacity)
+        self.elapsed = floatArray(capacity)
+        self.lifespan = floatArray(capacity)
+        self.color = penArray(capacity)
+        self.alive = flagArray(capacity)
+        # This counts how many particles are active
+        self.activeCount = 0
+
+    def reset(self):
+        alive = self.alive
+        for i in range(self.capacity):
+            alive[i] = 0
+        self.activeCount = 0
+
+    # Activate a single slot. Equivalent to Emitter360.activate() for one
+    # Particle.
+    def emit(self, i: int, x: float, y: float, angleRadians: float, speed: float, lifespan: float, color=0):
+        self.emitIndex(i, x, y, trig.index(angleRadians), speed, lifespan, color)
+
+    # Same as emit() with the direction as a trig table index
+    def emitIndex(self, i: int, x: float, y: float, index: int, speed: float, lifespan: float, color=0):
+        self.posX[i] = x
+        self.posY[i] = y
+        self.dirX[i] = trig.cosIndex(index)
+        self.dirY[i] = trig.sinIndex(index)
+        self.magnitude[i] = speed
+        self.elapsed[i] = 0.0
+        self.lifespan[i] = lifespan
+        self.color[i] = color
+        if not self.alive[i]:
+            self.alive[i] = 1
+            self.activeCount += 1
+
+    # Explode every slot out from (x, y) in random directions.
+    # maxLifespan is in seconds like MAX_PARTICLE_LIFETIME.
+    def trigger360(self, x: float, y: float, maxSpeed: float, maxLifespan: float, colors=None):
+        uniform = random.uniform
+        randomIndex = trig.randomIndex
+        nColors = len(colors) - 1 if colors else -1
+        for i in range(self.capacity):
+            self.emitIndex(
+                i, x, y,
+                randomIndex(),
+                0.05 + uniform(0.0, maxSpeed),
+                uniform(0.1, maxLifespan) * 1000.0,
+                colors[random.randint(0, nColors)] if nColors >= 0 else 0)
+
+    # Updates of dt ms until the longest lived active particle dies
+    def lifeSteps(self, dt: float) -> int:
+        steps = 0
+        for i in range(self.capacity):
+            if self.alive[i]:
+                steps = max(steps, math.ceil((self.lifespan[i] - self.elapsed[i]) / dt))
+        return steps
+
+    # Box (x0, y0, x1, y1) the active particles stay inside until they die,
+    # updating every dt ms.
+    def bounds(self, dt: float) -> tuple:
+        x0 = y0 = 1e9
+        x1 = y1 = -1e9
+        for i in range(self.capacity):
+            if not self.alive[i]:
+                continue
+            reach = self.magnitude[i] * math.ceil((self.lifespan[i] - self.elapsed[i]) / dt)
+            for x in (self.posX[i], self.posX[i] + self.dirX[i] * reach):
+                x0 = min(x0, x)
+                x1 = max(x1, x)
+            for y in (self.posY[i], self.posY[i] + self.dirY[i] * reach):
+                y0 = min(y0, y)
+                y1 = max(y1, y)
+        if x0 > x1:
+            return (0, 0, -1, -1)
+        # A pixel either side for rounding
+        return (math.floor(x0) - 1, math.floor(y0) - 1, math.ceil(x1) + 1, math.ceil(y1) + 1)
+
+    # Advance every active particle by dt ms. Returns the number of
+    # particles still active.
+    def update(self, dt: float) -> int:
+        if numpy:
+            return self._updateVectorized(dt)
+        return self._updateLoop(dt)
+
+    def _updateVectorized(self, dt: float) -> int:
+        alive = self.alive
+        elapsed = self.elapsed
+        elapsed[alive] += dt
+        alive &= elapsed < self.lifespan
+        step = self.magnitude * alive
+        self.posX += self.dirX * step
+        self.posY += self.dirY * step
+        self.activeCount = int(numpy.count_nonzero(alive))
+        return self.activeCount
+
+    @native
+    def _updateLoop(self, dt: float) -> int:
+        # Local bindings avoid an attribute lookup per particle.
+        posX = self.posX
+        posY = self.posY
+        dirX = self.dirX
+        dirY = self.dirY
+        magnitude = self.magnitude
+        elapsed = self.elapsed
+        lifespan = self.lifespan
+        alive = self.alive
+        count = 0
+        for i in range(self.capacity):
+            if alive[i]:
+                e = elapsed[i] + dt
+                elapsed[i] = e
+                if e < lifespan[i]:
+                    m = magnitude[i]
+                    posX[i] += dirX[i] * m
+                    posY[i] += dirY[i] * m
+                    count += 1
+                else:
+                    alive[i] = 0
+        self.activeCount = count
+        return count
+
+    # Draw every active particle. If pen is None each particle's own color
+    # is used.
+    def draw(self, display, pen=None):
+        posX = self.posX
+        posY = self.posY
+        alive = self.alive
+        color = self.color
+        pixel = display.pixel
+        setPen = display.set_pen
+        if pen is not None:
+            setPen(pen)
+        for i in range(self.capacity):
+            if alive[i]:
+                if pen is None:
+                    setPen(int(color[i]))
+                pixel(int(posX[i]), int(posY[i]))
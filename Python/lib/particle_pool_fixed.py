@@ -0,0 +1,176 @@
+import sys
+
+# Define a global flag
+IS_MICROPYTHON = sys.implementation.name == 'micropython'
+
+import random
+from array import array
+
+from trig_table import trig
+
+if IS_MICROPYTHON:
+    import micropython
+    native = micropython.native
+    viper = micropython.viper
+else:
+    def native(f):
+        return f
+
+    def viper(f):
+        return f
+
+    # In viper code ptr32()/ptr8() give raw access to a buffer. Indexing the
+    # array itself behaves the same in CPython.
+    def ptr32(buf):
+        return buf
+
+    def ptr8(buf):
+        return buf
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Description:
+# ParticlePool with integer math. The RP2040 has no FPU, so every float
+# operation is a software routine and every float result is an object on
+# the heap. Here positions, velocities and times are Q16.16 fixed point
+# (65536 == 1.0) in array('i') buffers and update() is a viper function,
+# so the per-frame loop neither touches floats nor allocates.
+#
+#   posX/posY       position, pixels
+#   velX/velY       velocity, pixels per update (direction times speed)
+#   elapsed         ms since the particle was activated
+#   lifespan        ms the particle lives for
+#   color           pen used to draw the particle
+#   alive           1 while the particle is active
+#
+# The API matches ParticlePool: emit(), trigger360(), update(dt), draw().
+# Angles go through the shared trig table, so directions are rounded to a
+# table step; otherwise the particles move like the float version.
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+FIXED_SHIFT = 16
+FIXED_ONE = 1 << FIXED_SHIFT
+
+def toFixed(value: float) -> int:
+    return int(value * FIXED_ONE)
+
+def fixedArray(size: int):
+    return array('i', bytes(4 * size))
+
+# ------------------------------------------------------------------------
+# Move every live particle one step and retire the ones that ran out of
+# time. Returns the number still alive.
+@viper
+def _stepFixed(posX, posY, velX, velY, elapsed, lifespan, alive, n: int, dt: int) -> int:
+    px = ptr32(posX)
+    py = ptr32(posY)
+    vx = ptr32(velX)
+    vy = ptr32(velY)
+    el = ptr32(elapsed)
+    life = ptr32(lifespan)
+    live = ptr8(alive)
+    count = 0
+    i = 0
+    while i < n:
+        if live[i]:
+            e = el[i] + dt
+            el[i] = e
+            if e < life[i]:
+                px[i] = px[i] + vx[i]
+                py[i] = py[i] + vy[i]
+                count += 1
+            else:
+                live[i] = 0
+        i += 1
+    return count
+
+# ------------------------------------------------------------------------
+class FixedParticlePool:
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.posX = fixedArray(capacity)
+        self.posY = fixedArray(capacity)
+        self.velX = fixedArray(capacity)
+        self.velY = fixedArray(capacity)
+        self.elapsed = fixedArray(capacity)
+        self.lifespan = fixedArray(capacity)
+        self.color = array('I', bytes(4 * capacity))
+        self.alive = bytearray(capacity)
+        # This counts how many particles are active
+        self.activeCount = 0
+
+    def reset(self):
+        alive = self.alive
+        for i in range(self.capacity):
+            alive[i] = 0
+        self.activeCount = 0
+
+    # Activate a single slot. index is a step of the shared trig table and
+    # x, y, speed and lifespan are already Q16.16.
+    def emitFixed(self, i: int, x: int, y: int, index: int, speed: int, lifespan: int, color=0):
+        self.posX[i] = x
+        self.posY[i] = y
+        # Q14 * Q14 >> 12 is Q16. Dropping two bits of speed first keeps
+        # the product a small int on the board.
+        speed >>= 2
+        self.velX[i] = (trig.cosFixed(index) * speed) >> 12
+        self.velY[i] = (trig.sinFixed(index) * speed) >> 12
+        self.elapsed[i] = 0
+        self.lifespan[i] = lifespan
+        self.color[i] = color
+        if not self.alive[i]:
+            self.alive[i] = 1
+            self.activeCount += 1
+
+    # Same arguments as ParticlePool.emit()
+    def emit(self, i: int, x: float, y: float, angleRadians: float, speed: float, lifespan: float, color=0):
+        self.emitFixed(
+            i, toFixed(x), toFixed(y), trig.index(angleRadians),
+            toFixed(speed), toFixed(lifespan), color)
+
+    # Explode every slot out from (x, y) in random directions.
+    # maxLifespan is in seconds like MAX_PARTICLE_LIFETIME.
+    def trigger360(self, x: float, y: float, maxSpeed: float, maxLifespan: float, colors=None):
+        getrandbits = random.getrandbits
+        fx = toFixed(x)
+        fy = toFixed(y)
+        # Same ranges as ParticlePool: speed 0.05 + [0, maxSpeed) and
+        # lifespan [0.1, maxLifespan) seconds, drawn as 8 bit fractions so
+        # the products stay small ints.
+        minSpeed = toFixed(0.05)
+        speedRange = toFixed(maxSpeed) >> 8
+        minLife = toFixed(100.0)
+        lifeRange = toFixed((maxLifespan - 0.1) * 1000.0) >> 8
+        nColors = len(colors) - 1 if colors else -1
+        for i in range(self.capacity):
+            self.emitFixed(
+                i, fx, fy, trig.randomIndex(),
+                minSpeed + getrandbits(8) * speedRange,
+                minLife + getrandbits(8) * lifeRange,
+                colors[random.randint(0, nColors)] if nColors >= 0 else 0)
+
+    # Advance every active particle by dt ms. Returns the number of
+    # particles still active.
+    def update(self, dt: float) -> int:
+        self.activeCount = _stepFixed(
+            self.posX, self.posY, self.velX, self.velY,
+            self.elapsed, self.lifespan, self.alive,
+            self.capacity, toFixed(dt))
+        return self.activeCount
+
+    # Draw every active particle. If pen is None each particle's own color
+    # is used.
+    @native
+    def draw(self, display, pen=None):
+        posX = self.posX
+        posY = self.posY
+        alive = self.alive
+        color = self.color
+        pixel = display.pixel
+        setPen = display.set_pen
+        if pen is not None:
+            setPen(pen)
+        for i in range(self.capacity):
+            if alive[i]:
+                if pen is None:
+                    setPen(color[i])
+                pixel(posX[i] >> FIXED_SHIFT, posY[i] >> FIXED_SHIFT)
@@ -0,0 +1,112 @@
+try:
+    import _thread
+except ImportError:
+    _thread = None
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Description:
+# A two stage simulate/render pipeline. A second thread (core 1 on the
+# RP2040, a normal thread on desktop) simulates frame N+1 while the main
+# thread draws and pushes frame N.
+#
+#   def step():                 # worker thread: advance the simulation
+#       fire.update()
+#   def publish(buffer):        # worker thread: copy what draw() needs
+#       buffer[:] = ...
+#   pipeline = Pipeline(step, publish, (bytearray(n), bytearray(n)))
+#   pipeline.start()
+#   while True:
+#       buffer = pipeline.frame()   # waits for the next published frame
+#       draw(buffer)                # main thread, worker is already busy
+#
+# The two buffers are double buffered: the worker publishes into one while
+# the main thread draws the other, and frame() swaps them. The handoff is
+# two locks used as signals ("a frame is ready", "a buffer is free"), so
+# nothing is allocated per frame.
+#
+# Without _thread, or with threaded=False, frame() just runs step() and
+# publish() itself.
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# ------------------------------------------------------------------------
+# A binary semaphore. Unlike a plain lock use, set() may be called from a
+# different thread than wait().
+class Signal:
+    def __init__(self, isSet: bool = False):
+        self.lock = _thread.allocate_lock()
+        if not isSet:
+            self.lock.acquire()
+
+    def set(self):
+        # Setting twice is the same as setting once.
+        if self.lock.locked():
+            self.lock.release()
+
+    def wait(self):
+        self.lock.acquire()
+
+# ------------------------------------------------------------------------
+class Pipeline:
+    def __init__(self, step, publish, buffers, threaded: bool = None):
+        self.step = step
+        self.publish = publish
+        self.buffers = buffers
+        # The worker publishes into back; the main thread draws front.
+        self.front = 0
+        self.back = 1
+        if threaded is None:
+            threaded = _thread is not None
+        self.threaded = threaded
+        self.running = False
+        self.error = None
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        if not self.threaded:
+            return
+        self.ready = Signal(False)
+        self.free = Signal(True)
+        self.stopped = Signal(False)
+        _thread.start_new_thread(self._worker, ())
+
+    def _worker(self):
+        try:
+            while self.running:
+                self.step()
+                # Wait for the main thread to hand back a buffer.
+                self.free.wait()
+                if not self.running:
+                    break
+                self.publish(self.buffers[self.back])
+                self.ready.set()
+        except Exception as e:
+            self.error = e
+            self.ready.set()
+        self.stopped.set()
+
+    # The next simulated frame, to draw on this thread. The buffer stays
+    # untouched until the following call.
+    def frame(self):
+        if not self.threaded:
+            self.step()
+            self.publish(self.buffers[self.front])
+            return self.buffers[self.front]
+
+        self.ready.wait()
+        if self.error is not None:
+            raise self.error
+        self.front, self.back = self.back, self.front
+        # The worker may now fill the buffer that was drawn last frame.
+        self.free.set()
+        return self.buffers[self.front]
+
+    # Stop the worker and wait for it to finish its current step.
+    def stop(self):
+        if not self.running:
+            return
+        self.running = False
+        if self.threaded:
+            self.free.set()
+            self.stopped.wait()
@@ -0,0 +1,351 @@
+import sys
+
+# Define a global flag
+IS_MICROPYTHON = sys.implementation.name == 'micropython'
+
+import gc
+from array import array
+
+from framebuffer import framebufferOf, bytesPerPixel
+from dirty_rects import TEXT_LINE_HEIGHT
+
+if IS_MICROPYTHON:
+    import micropython
+    native = micropython.native
+
+    # Leave most of the heap to the demo
+    def defaultBudget() -> int:
+        gc.collect()
+        return gc.mem_free() // 4
+else:
+    def native(f):
+        return f
+
+    def defaultBudget() -> int:
+        return 64 * 1024
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Description:
+# Caches rasterized text as masks so a caption that doesn't change is
+# drawn by copying pixels instead of rasterizing the font every frame.
+#
+#   cache = TextCache(display)
+#   cache.text("Score", 2, 2, WHITE, scale=1)      # bitmap font
+#
+#   vector = CachedVectorText(PicoVector(display), cache)
+#   vector.set_font("/basic/cherry-hq.af", 55)
+#   vector.text("Hello!", 10, 75, PINK)            # PicoVector font
+#
+# A mask is made the first time a key (text, font, size, spacing,
+# transform...) is seen: the rows the text covers are put aside, the text
+# drawn there in white on black, clipped to those rows, the result read
+# back and the rows restored. Fully
+# covered pixels become horizontal runs that are filled with the pen;
+# antialiased edge pixels keep their coverage and are blended with what is
+# underneath (RGB888 only, on PEN_P8 displays masks are just the runs).
+#
+# Masks are position independent, so moving text stays cached, as long as
+# all of it was on the screen when it was rasterized. Text that ran off
+# the screen, or whose size isn't known, is only reused at the same
+# position. Text whose size isn't known is rasterized in a band of
+# UNBOUNDED_ROWS rows around y and clipped to it. Masks are evicted least
+# recently used first once they add up to more than budget bytes, by
+# default a quarter of the free heap on the board. The rows put aside are
+# copied out on each rasterization, only as many as the text needs, and
+# dropped again. On PEN_P8 displays the white and black used for
+# rasterizing take two palette slots.
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# Rough bookkeeping cost of an entry, on top of its arrays
+ENTRY_OVERHEAD = 96
+
+# Rows rasterized around y for text that can't be measured
+UNBOUNDED_ROWS = 48
+
+# ------------------------------------------------------------------------
+class TextMask:
+    def __init__(self, runs, edges, coverage, x: int, y: int):
+        # dy, dx, length per run of fully covered pixels
+        self.runs = runs
+        # dy, dx per partly covered pixel, and its coverage 1..254
+        self.edges = edges
+        self.coverage = coverage
+        # Where it was rasterized, for masks that were clipped
+        self.x = x
+        self.y = y
+        self.clipped = True
+        self.lastUsed = 0
+        self.size = ENTRY_OVERHEAD + 2 * (len(runs) + len(edges)) + len(coverage)
+
+# ------------------------------------------------------------------------
+class TextCache:
+    def __init__(self, display, budget: int = None):
+        self.display = display
+        (self.width, self.height) = display.get_bounds()
+        self.framebuffer = framebufferOf(display)
+        self.bpp = bytesPerPixel(display)
+        self.stride = self.width * self.bpp
+        self.maskPen = display.create_pen(255, 255, 255)
+        self.clearPen = display.create_pen(0, 0, 0)
+        self.budget = budget if budget is not None else defaultBudget()
+        self.entries = {}
+        self.used = 0
+        self.clock = 0
+        self.hits = 0
+        self.misses = 0
+        # A row of pixels in the last pen blitted with
+        self.penRow = bytearray()
+        self.penRowPen = None
+
+    def clear(self):
+        self.entries = {}
+        self.used = 0
+
+    # -------------------------------------------------------------------
+    # Draw with paint(display, x, y), which must draw the same pixels
+    # every time it is called with the same key. bounds, if known, is the
+    # box (x0, y0, x1, y1) paint() stays inside, relative to x, y.
+    def draw(self, key, x: int, y: int, pen, paint, bounds: tuple = None):
+        x = int(x)
+        y = int(y)
+        self.clock += 1
+        mask = self.entries.get(key)
+        if mask is not None and mask.clipped and (mask.x != x or mask.y != y):
+            self._forget(key)
+            mask = None
+        if mask is None:
+            self.misses += 1
+            mask = self._rasterize(x, y, paint, bounds)
+            mask.clipped = bounds is None or not self._onScreen(x, y, bounds)
+            self.entries[key] = mask
+            self.used += mask.size
+            self._evict(key)
+        else:
+            self.hits += 1
+        mask.lastUsed = self.clock
+        self._blit(mask, x, y, pen)
+        self.display.set_pen(pen)
+
+    # Bitmap font text, arguments as display.text()
+    def text(self, text: str, x: int, y: int, pen, wordwrap: int = None, scale: int = 2, angle: int = 0, spacing: int = 1, font: str = None):
+        if wordwrap is None:
+            wordwrap = self.width
+
+        def paint(display, px, py):
+            if font is not None:
+                display.set_font(font)
+            display.text(text, px, py, wordwrap, scale, angle, spacing)
+
+        bounds = None
+        if angle == 0:
+            if font is not None:
+                self.display.set_font(font)
+            # Bound the text like DirtyRectDisplay.text() does.
+            lines = text.count("\n") + 1
+            width = self.display.measure_text(text, scale, spacing)
+            if width > wordwrap:
+                lines += width // wordwrap + 1
+                width = wordwrap
+            bounds = (0, 0, width, lines * TEXT_LINE_HEIGHT * int(scale))
+        self.draw(("text", text, font, scale, spacing, angle, wordwrap), x, y, pen, paint, bounds)
+
+    # -------------------------------------------------------------------
+    def _onScreen(self, x: int, y: int, bounds: tuple) -> bool:
+        (x0, y0, x1, y1) = bounds
+        return x + x0 >= 0 and y + y0 >= 0 and x + x1 <= self.width and y + y1 <= self.height
+
+    def _forget(self, key):
+        self.used -= self.entries.pop(key).size
+
+    # Drop the least recently used masks, except keep, until within budget
+    def _evict(self, keep):
+        while self.used > self.budget and len(self.entries) > 1:
+            oldest = None
+            for (key, mask) in self.entries.items():
+                if key != keep and (oldest is None or mask.lastUsed < self.entries[oldest].lastUsed):
+                    oldest = key
+            self._forget(oldest)
+
+    # Rows top..bottom (exclusive) of the screen the text can touch
+    def _rows(self, y: int, bounds: tuple) -> tuple:
+        if bounds is None:
+            top = y - UNBOUNDED_ROWS // 2
+            bottom = top + UNBOUNDED_ROWS
+        else:
+            top = y + bounds[1]
+            bottom = y + bounds[3]
+        return (max(0, top), min(self.height, bottom))
+
+    def _rasterize(self, x: int, y: int, paint, bounds: tuple) -> TextMask:
+        (top, bottom) = self._rows(y, bounds)
+        if bottom <= top:
+            # Entirely above or below the screen
+            return TextMask(array('h'), array('h'), bytearray(), x, y)
+        d = self.display
+        fb = self.framebuffer
+        start = top * self.stride
+        end = bottom * self.stride
+        saved = bytes(fb[start:end])
+        d.set_clip(0, top, self.width, bottom - top)
+        d.set_pen(self.clearPen)
+        d.rectangle(0, top, self.width, bottom - top)
+        d.set_pen(self.maskPen)
+        paint(d, x, y)
+        d.remove_clip()
+        mask = self._scan(x, y, top, bottom)
+        fb[start:end] = saved
+        return mask
+
+    # Read the white on black text back out of rows top..bottom
+    def _scan(self, x: int, y: int, top: int, bottom: int) -> TextMask:
+        fb = self.framebuffer
+        bpp = self.bpp
+        stride = self.stride
+        # Pen values as they appear in the first byte of a pixel
+        empty = self.clearPen & 0xff
+        full = self.maskPen & 0xff
+        blank = bytes((empty,)) * stride if bpp == 1 else bytes(stride)
+        runs = array('h')
+        edges = array('h')
+        coverage = bytearray()
+        for row in range(top, bottom):
+            start = row * stride
+            if fb[start:start + stride] == blank:
+                continue
+            column = 0
+            while column < self.width:
+                value = fb[start + column * bpp]
+                if value == empty:
+                    column += 1
+                    continue
+                if value == full:
+                    end = column + 1
+                    while end < self.width and fb[start + end * bpp] == full:
+                        end += 1
+                    runs.append(row - y)
+                    runs.append(column - x)
+                    runs.append(end - column)
+                    column = end
+                else:
+                    if bpp == 4:
+                        edges.append(row - y)
+                        edges.append(column - x)
+                        coverage.append(value)
+                    column += 1
+        return TextMask(runs, edges, coverage, x, y)
+
+    @native
+    def _blit(self, mask: TextMask, x: int, y: int, pen):
+        fb = self.framebuffer
+        bpp = self.bpp
+        stride = self.stride
+        width = self.width
+        height = self.height
+
+        if pen != self.penRowPen:
+            self.penRow = bytearray(int(pen).to_bytes(bpp, 'little') * width)
+            self.penRowPen = pen
+        penRow = memoryview(self.penRow)
+        runs = mask.runs
+
+        for i in range(0, len(runs), 3):
+            py = y + runs[i]
+            if py < 0 or py >= height:
+                continue
+            x0 = x + runs[i + 1]
+            x1 = x0 + runs[i + 2]
+            if x0 < 0:
+                x0 = 0
+            if x1 > width:
+                x1 = width
+            if x1 <= x0:
+                continue
+            start = py * stride + x0 * bpp
+            n = (x1 - x0) * bpp
+            fb[start:start + n] = penRow[0:n]
+
+        edges = mask.edges
+        coverage = mask.coverage
+        r = (pen >> 16) & 0xff
+        g = (pen >> 8) & 0xff
+        b = pen & 0xff
+        for i in range(len(coverage)):
+            py = y + edges[2 * i]
+            px = x + edges[2 * i + 1]
+            if py < 0 or py >= height or px < 0 or px >= width:
+                continue
+            a = coverage[i]
+            o = py * stride + px * 4
+            fb[o] += ((b - fb[o]) * a) // 255
+            fb[o + 1] += ((g - fb[o + 1]) * a) // 255
+            fb[o + 2] += ((r - fb[o + 2]) * a) // 255
+
+# ------------------------------------------------------------------------
+# Stands in for a PicoVector when drawing text. The font settings are
+# passed on and remembered, because they are part of the cache key.
+class CachedVectorText:
+    def __init__(self, vector, cache: TextCache):
+        self.vector = vector
+        self.cache = cache
+        self.font = None
+        self.size = None
+        self.letterSpacing = 100
+        self.wordSpacing = 100
+        self.antialiasing = 0
+        self.transformKey = None
+
+    # Anything else goes straight to the PicoVector
+    def __getattr__(self, name):
+        return getattr(self.vector, name)
+
+    def set_font(self, font: str, size: int = None):
+        self.font = font
+        if size is not None:
+            self.size = size
+            self.vector.set_font(font, size)
+        else:
+            self.vector.set_font(font)
+
+    def set_font_size(self, size: int):
+        self.size = size
+        self.vector.set_font_size(size)
+
+    def set_font_letter_spacing(self, spacing: int):
+        self.letterSpacing = spacing
+        self.vector.set_font_letter_spacing(spacing)
+
+    def set_font_word_spacing(self, spacing: int):
+        self.wordSpacing = spacing
+        self.vector.set_font_word_spacing(spacing)
+
+    def set_antialiasing(self, aa: int):
+        self.antialiasing = aa
+        self.vector.set_antialiasing(aa)
+
+    # A Transform can't be read back, so key describes it for the cache,
+    # e.g. ("rotate", 30). Change the key whenever the transform changes.
+    def set_transform(self, transform, key=None):
+        self.transformKey = key
+        self.vector.set_transform(transform)
+
+    def text(self, text: str, x: int, y: int, pen, angle: float = None, max_width: int = 0, max_height: int = 0):
+        vector = self.vector
+
+        def paint(display, px, py):
+            vector.text(text, px, py, angle, max_width, max_height)
+        key = (
+            "vector", text, self.font, self.size, self.letterSpacing,
+            self.wordSpacing, self.antialiasing, self.transformKey,
+            angle, max_width, max_height)
+        self.cache.draw(key, x, y, pen, paint, self._bounds(text, angle))
+
+    # Box around the text relative to where it is drawn, with a pixel
+    # to spare for antialiasing, or None if PicoVector can't measure it.
+    def _bounds(self, text: str, angle: float) -> tuple:
+        if self.transformKey is not None:
+            return None
+        try:
+            (x, y, w, h) = self.vector.measure_text(text, 0, 0, angle)
+        except (AttributeError, TypeError, ValueError):
+            return None
+        return (int(x) - 1, int(y) - 1, int(x + w) + 2, int(y + h) + 2)
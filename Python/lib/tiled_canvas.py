@@ -0,0 +1,229 @@
+from dirty_rects import TEXT_LINE_HEIGHT
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Description:
+# One drawing surface spanning a wall of columns x rows panels. It has the
+# PicoGraphics drawing calls, in wall coordinates, so a demo can draw to it
+# like it draws to a display:
+#
+#   canvas = TiledCanvas(2, 1, 128, 128, [leftDisplay, rightDisplay])
+#   WIDTH, HEIGHT = canvas.get_bounds()       # 256, 128
+#   canvas.set_pen(ORANGE)
+#   canvas.pixel(130, 5)                      # pixel 2,5 of the right panel
+#   canvas.update(push)                       # push(display) per changed display
+#
+# Every call is sent only to the tiles its bounding box touches, moved into
+# that tile's coordinates and clipped to it, so shapes that straddle a seam
+# are split between the panels. Tiles remember whether they were drawn to
+# and update() only pushes the displays of those tiles. clear() leaves
+# tiles alone that nothing was drawn on since they were cleared to the
+# same pen, so clearing every frame doesn't make every tile dirty.
+#
+# A tile can also be a region of a bigger display (offsetX/offsetY), e.g.
+# chained panels driven as one DISPLAY_INTERSTATE75_256X64. A tile without
+# a display (None) belongs to another board and is skipped, so a board
+# that only drives its own panel can run a wall-sized scene and only pay
+# for drawing what lands on its panel.
+#
+# Pens are shared by every tile, so the displays need to be RGB888.
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# ------------------------------------------------------------------------
+class Tile:
+    def __init__(self, display, x: int, y: int, width: int, height: int, offsetX: int = 0, offsetY: int = 0):
+        self.display = display
+        # Where the tile is on the wall
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        # Where the tile is on its display
+        self.offsetX = offsetX
+        self.offsetY = offsetY
+        self.dirty = True
+        # The pen the tile was cleared to, or None once drawn on
+        self.clearedTo = None
+
+# ------------------------------------------------------------------------
+class TiledCanvas:
+    # displays holds one display (or None) per tile, row by row, or one
+    # (display, offsetX, offsetY) tuple per tile for regions of a display.
+    def __init__(self, columns: int, rows: int, tileWidth: int, tileHeight: int, displays: list):
+        self.columns = columns
+        self.rows = rows
+        self.tileWidth = tileWidth
+        self.tileHeight = tileHeight
+        self.width = columns * tileWidth
+        self.height = rows * tileHeight
+        self.tiles = []
+        for row in range(rows):
+            for column in range(columns):
+                entry = displays[row * columns + column]
+                if isinstance(entry, tuple):
+                    (display, offsetX, offsetY) = entry
+                else:
+                    (display, offsetX, offsetY) = (entry, 0, 0)
+                self.tiles.append(Tile(
+                    display, column * tileWidth, row * tileHeight,
+                    tileWidth, tileHeight, offsetX, offsetY))
+        self.pen = 0
+        self.thickness = 1
+
+    def get_bounds(self) -> tuple:
+        return (self.width, self.height)
+
+    # The tile under wall pixel x,y, or None when off the wall
+    def tileAt(self, x: int, y: int) -> Tile:
+        if x < 0 or y < 0 or x >= self.width or y >= self.height:
+            return None
+        return self.tiles[(y // self.tileHeight) * self.columns + x // self.tileWidth]
+
+    # Tiles with a display touching the box x0,y0 - x1,y1 (inclusive)
+    def _tilesIn(self, x0: int, y0: int, x1: int, y1: int):
+        c0 = max(0, x0 // self.tileWidth)
+        c1 = min(self.columns - 1, x1 // self.tileWidth)
+        r0 = max(0, y0 // self.tileHeight)
+        r1 = min(self.rows - 1, y1 // self.tileHeight)
+        for row in range(r0, r1 + 1):
+            for column in range(c0, c1 + 1):
+                tile = self.tiles[row * self.columns + column]
+                if tile.display is not None:
+                    yield tile
+
+    # Set up tile's display to draw the tile and return the offset from
+    # wall to display coordinates.
+    def _begin(self, tile: Tile) -> tuple:
+        d = tile.display
+        d.set_pen(self.pen)
+        d.set_clip(tile.offsetX, tile.offsetY, tile.width, tile.height)
+        tile.dirty = True
+        tile.clearedTo = None
+        return (tile.offsetX - tile.x, tile.offsetY - tile.y)
+
+    # True if the box x0,y0 - x1,y1 (inclusive) touches a tile with a
+    # display, i.e. anything drawn inside it would be seen here.
+    def touches(self, x0: int, y0: int, x1: int, y1: int) -> bool:
+        for tile in self._tilesIn(int(x0), int(y0), int(x1), int(y1)):
+            return True
+        return False
+
+    # -------------------------------------------------------------------
+    # Anything not drawn goes to the first display (create_pen etc).
+    def __getattr__(self, name):
+        for tile in self.tiles:
+            if tile.display is not None:
+                return getattr(tile.display, name)
+        raise AttributeError(name)
+
+    def set_pen(self, pen):
+        self.pen = pen
+
+    def set_thickness(self, thickness: int):
+        self.thickness = thickness
+        for tile in self.tiles:
+            if tile.display is not None:
+                tile.display.set_thickness(thickness)
+
+    def clear(self):
+        pen = self.pen
+        for tile in self.tiles:
+            d = tile.display
+            if d is None or tile.clearedTo == pen:
+                continue
+            d.set_pen(pen)
+            d.rectangle(tile.offsetX, tile.offsetY, tile.width, tile.height)
+            tile.dirty = True
+            tile.clearedTo = pen
+
+    def pixel(self, x: int, y: int):
+        x = int(x)
+        y = int(y)
+        tile = self.tileAt(x, y)
+        if tile is None or tile.display is None:
+            return
+        # Inside the tile, so no clip needed.
+        d = tile.display
+        d.set_pen(self.pen)
+        d.pixel(x - tile.x + tile.offsetX, y - tile.y + tile.offsetY)
+        tile.dirty = True
+        tile.clearedTo = None
+
+    def pixel_span(self, x: int, y: int, length: int):
+        self.rectangle(x, y, length, 1)
+
+    def rectangle(self, x: int, y: int, w: int, h: int):
+        x = int(x)
+        y = int(y)
+        w = int(w)
+        h = int(h)
+        if w <= 0 or h <= 0:
+            return
+        for tile in self._tilesIn(x, y, x + w - 1, y + h - 1):
+            (dx, dy) = self._begin(tile)
+            tile.display.rectangle(x + dx, y + dy, w, h)
+            tile.display.remove_clip()
+
+    def circle(self, x: int, y: int, r: int):
+        x = int(x)
+        y = int(y)
+        r = int(r)
+        for tile in self._tilesIn(x - r, y - r, x + r, y + r):
+            (dx, dy) = self._begin(tile)
+            tile.display.circle(x + dx, y + dy, r)
+            tile.display.remove_clip()
+
+    def line(self, x1: int, y1: int, x2: int, y2: int, thickness: int = None):
+        if thickness is None:
+            thickness = self.thickness
+        x1 = int(x1)
+        y1 = int(y1)
+        x2 = int(x2)
+        y2 = int(y2)
+        pad = int(thickness) // 2 + 1
+        for tile in self._tilesIn(min(x1, x2) - pad, min(y1, y2) - pad, max(x1, x2) + pad, max(y1, y2) + pad):
+            (dx, dy) = self._begin(tile)
+            tile.display.line(x1 + dx, y1 + dy, x2 + dx, y2 + dy, thickness)
+            tile.display.remove_clip()
+
+    def triangle(self, x1: int, y1: int, x2: int, y2: int, x3: int, y3: int):
+        x1 = int(x1)
+        y1 = int(y1)
+        x2 = int(x2)
+        y2 = int(y2)
+        x3 = int(x3)
+        y3 = int(y3)
+        for tile in self._tilesIn(min(x1, x2, x3), min(y1, y2, y3), max(x1, x2, x3), max(y1, y2, y3)):
+            (dx, dy) = self._begin(tile)
+            tile.display.triangle(x1 + dx, y1 + dy, x2 + dx, y2 + dy, x3 + dx, y3 + dy)
+            tile.display.remove_clip()
+
+    def text(self, text: str, x: int, y: int, wordwrap: int = None, scale: int = 2, *args, **kwargs):
+        x = int(x)
+        y = int(y)
+        if wordwrap is None:
+            wordwrap = self.width
+        # Bound the text like DirtyRectDisplay.text() does.
+        lines = text.count("\n") + 1
+        width = self.measure_text(text, scale)
+        if width > wordwrap:
+            lines += width // wordwrap + 1
+            width = wordwrap
+        height = lines * TEXT_LINE_HEIGHT * int(scale)
+        for tile in self._tilesIn(x, y, x + width, y + height):
+            (dx, dy) = self._begin(tile)
+            tile.display.text(text, x + dx, y + dy, wordwrap, scale, *args, **kwargs)
+            tile.display.remove_clip()
+
+    # -------------------------------------------------------------------
+    # Call push(display) once for every display with a tile drawn to since
+    # the last update(). Returns the number of displays pushed.
+    def update(self, push) -> int:
+        pushed = []
+        for tile in self.tiles:
+            if tile.dirty and tile.display is not None:
+                tile.dirty = False
+                if tile.display not in pushed:
+                    pushed.append(tile.display)
+        for display in pushed:
+            push(display)
+        return len(pushed)
@@ -0,0 +1,97 @@
+import sys
+
+# Define a global flag
+IS_MICROPYTHON = sys.implementation.name == 'micropython'
+
+if IS_MICROPYTHON:
+    import utime as time
+else:
+    import time
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Description:
+# Clocks and a fixed-timestep scheduler shared by the demos.
+#
+# MonotonicClock is ticks_ms() on the board and time.monotonic() on
+# desktop. SimulatedClock advances a fixed amount every time it is read,
+# which makes desktop runs and benchmarks reproducible.
+#
+# FixedTimestep turns variable frame times into a whole number of
+# simulation steps:
+#   steps = stepper.advance(dt)
+#   for i in range(steps):
+#       simulate(STEP_MS)
+#   draw(stepper.alpha)   # 0..1 between the last two steps
+#
+# A frame that took too long produces at most maxSubsteps steps; the rest
+# of the backlog is dropped instead of stalling the next frames.
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+FRAME_MS_60HZ = 1000.0 / 60.0
+
+# ------------------------------------------------------------------------
+class MonotonicClock:
+    if IS_MICROPYTHON:
+        def ticksMs(self) -> int:
+            return time.ticks_ms()
+
+        def diff(self, current: int, previous: int) -> int:
+            # ticks_ms() wraps around, ticks_diff() accounts for it.
+            return time.ticks_diff(current, previous)
+    else:
+        def ticksMs(self) -> float:
+            return time.monotonic() * 1000.0
+
+        def diff(self, current: float, previous: float) -> float:
+            return current - previous
+
+# ------------------------------------------------------------------------
+class SimulatedClock:
+    def __init__(self, stepMs: float = FRAME_MS_60HZ, startMs: float = 0.0):
+        self.stepMs = stepMs
+        self.now = startMs
+
+    # Every read advances the clock by one step.
+    def ticksMs(self) -> float:
+        now = self.now
+        self.now += self.stepMs
+        return now
+
+    def diff(self, current: float, previous: float) -> float:
+        return current - previous
+
+# Real time on the board; on desktop a deterministic clock unless
+# simulated is False.
+def createClock(simulated: bool = None):
+    if simulated is None:
+        simulated = not IS_MICROPYTHON
+    if simulated:
+        return SimulatedClock()
+    return MonotonicClock()
+
+# ------------------------------------------------------------------------
+class FixedTimestep:
+    def __init__(self, stepMs: float = FRAME_MS_60HZ, maxSubsteps: int = 4):
+        self.stepMs = stepMs
+        self.maxSubsteps = maxSubsteps
+        self.accumulator = 0.0
+        # How far the accumulator is between two steps, for interpolation.
+        self.alpha = 0.0
+        # Total time thrown away by clamping.
+        self.droppedMs = 0.0
+
+    def reset(self):
+        self.accumulator = 0.0
+        self.alpha = 0.0
+
+    # Add elapsedMs of real time. Returns the number of steps to simulate.
+    def advance(self, elapsedMs: float) -> int:
+        self.accumulator += elapsedMs
+        steps = int(self.accumulator // self.stepMs)
+        if steps > self.maxSubsteps:
+            self.droppedMs += (steps - self.maxSubsteps) * self.stepMs
+            self.accumulator -= (steps - self.maxSubsteps) * self.stepMs
+            steps = self.maxSubsteps
+        self.accumulator -= steps * self.stepMs
+        self.alpha = self.accumulator / self.stepMs
+        return steps
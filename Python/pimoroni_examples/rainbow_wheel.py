@@ -1,6 +1,6 @@
 # A spinny rainbow wheel. Change up some of the constants below to see what happens.
 
-import math
+from trig_table import trig
 from interstate75 import Interstate75, DISPLAY_INTERSTATE75_128X128
 
 # Constants for drawing
@@ -28,10 +28,12 @@ while True:
     for i in range(0, 360, 360 // NUMBER_OF_LINES):
         graphics.set_pen(graphics.create_pen_hsv((i / 360) + t, 1.0, 1.0))
         # Draw some lines, offset by the rotation variable
-        graphics.line(int(WIDTH / 2 + math.cos(math.radians(i + r)) * INNER_RADIUS),
-                      int(HEIGHT / 2 + math.sin(math.radians(i + r)) * INNER_RADIUS),
-                      int(WIDTH / 2 + math.cos(math.radians(i + 90 + r)) * OUTER_RADIUS),
-                      int(HEIGHT / 2 + math.sin(math.radians(i + 90 + r)) * OUTER_RADIUS),
+        inner = trig.indexDegrees(i + r)
+        outer = trig.indexDegrees(i + 90 + r)
+        graphics.line(int(WIDTH / 2 + trig.cosIndex(inner) * INNER_RADIUS),
+                      int(HEIGHT / 2 + trig.sinIndex(inner) * INNER_RADIUS),
+                      int(WIDTH / 2 + trig.cosIndex(outer) * OUTER_RADIUS),
+                      int(HEIGHT / 2 + trig.sinIndex(outer) * OUTER_RADIUS),
                       LINE_THICKNESS)
     i75.update()
     r += ROTATION_SPEED
@@ -1,6 +1,7 @@
 from interstate75 import Interstate75, DISPLAY_INTERSTATE75_128X128
 import math
 import time
+from trig_table import trig
 
 i75 = Interstate75(display=DISPLAY_INTERSTATE75_128X128)
 display = i75.display
@@ -25,8 +26,9 @@ while True:
     a = n * 140
     r = c * math.sqrt(n)
 
-    x = int(r * math.cos(a) + WIDTH // 2)
-    y = int(r * math.sin(a) + HEIGHT // 2)
+    i = trig.index(a)
+    x = int(r * trig.cosIndex(i) + WIDTH // 2)
+    y = int(r * trig.sinIndex(i) + HEIGHT // 2)
 
     display.circle(x, y, 1)
 
@@ -5,10 +5,14 @@ You will need to copy the .af font file to your I75.
 (this script assumes it is in the /basic directory).
 
 Find out how to convert your own fonts to .af here: https://github.com/lowfatcode/alright-fonts
+
+The text is rasterized once and cached (see lib/text_cache.py), so after the
+first frame drawing it is a copy rather than a slow vector render.
 """
 
 from interstate75 import Interstate75, DISPLAY_INTERSTATE75_128X128
 from picovector import ANTIALIAS_BEST, PicoVector, Transform
+from text_cache import TextCache, CachedVectorText
 
 i75 = Interstate75(display=DISPLAY_INTERSTATE75_128X128)
 display = i75.display
@@ -20,8 +24,8 @@ HEIGHT = i75.height
 PINK = display.create_pen(250, 125, 180)
 BLACK = display.create_pen(0, 0, 0)
 
-# Pico Vector
-vector = PicoVector(display)
+# Pico Vector, through the text cache
+vector = CachedVectorText(PicoVector(display), TextCache(display))
 vector.set_antialiasing(ANTIALIAS_BEST)
 
 t = Transform()
@@ -39,11 +43,8 @@ while True:
     display.set_pen(BLACK)
     display.clear()
 
-    # Set the pen colour for our text
-    display.set_pen(PINK)
-
-    # Draw our text!
-    vector.text("Hello!", 10, 75)
+    # Draw our text in pink!
+    vector.text("Hello!", 10, 75, PINK)
 
     # Update the display
     i75.update()